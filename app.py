@@ -9,6 +9,12 @@ from backend.utils.logger import app_logger
 from backend.utils.error_handler import register_error_handlers
 from backend.utils.security import init_security
 from backend.config.migrations import run_migrations
+from backend.config.db_pool import init_request_scope
+from backend.utils.query_profiler import init_query_profiler
+from backend.utils.compression import init_compression
+from backend.utils.json_provider import init_json_provider
+from backend.config.cache_bus import init_cache_bus
+from backend.utils.reference_cache import warm_reference_cache
 
 from backend.api.auth import auth_bp
 from backend.api.departments import departments_bp
@@ -36,6 +42,7 @@ from backend.api.health import health_bp
 from backend.api.whatsapp import whatsapp_bp
 from backend.api.twilio_api import twilio_bp
 from backend.api.order_import import order_import_bp
+from backend.api.batch import batch_bp
 from backend.utils.scheduler import scheduler
 
 app = Flask(__name__, 
@@ -45,6 +52,7 @@ app = Flask(__name__,
 app.config['SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
 app.config['JSON_SORT_KEYS'] = False
 app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_SIZE_MB', 50)) * 1024 * 1024
+init_json_provider(app)
 
 CORS(app, resources={
     r"/api/*": {
@@ -56,9 +64,14 @@ CORS(app, resources={
 
 register_error_handlers(app)
 init_security(app)
+init_request_scope(app)
+init_query_profiler(app)
+init_compression(app)
+init_cache_bus()
 
 scheduler.start()
 run_migrations()  # Run database migrations on startup
+warm_reference_cache()
 app_logger.info("Application initialized successfully")
 
 app.register_blueprint(auth_bp)
@@ -87,6 +100,7 @@ app.register_blueprint(health_bp)
 app.register_blueprint(whatsapp_bp)
 app.register_blueprint(twilio_bp)
 app.register_blueprint(order_import_bp)
+app.register_blueprint(batch_bp)
 
 @app.route('/')
 def index():
@@ -0,0 +1,140 @@
+import os
+from urllib.parse import urlsplit
+from flask import Blueprint, request, current_app, g
+from werkzeug.test import EnvironBuilder
+from backend.config.db_pool import shared_request_connection
+from backend.utils.auth import token_required, BATCH_USER_ENVIRON_KEY
+from backend.utils.response import success_response, error_response
+from backend.utils.logger import app_logger
+
+batch_bp = Blueprint('batch', __name__, url_prefix='/api/batch')
+
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', 10))
+BATCH_MAX_RESPONSE_BYTES = int(os.getenv('BATCH_MAX_RESPONSE_BYTES', 1048576))
+
+# Sub-requests share the batch's app context, so g. These entries stay
+# shared (one connection, one identity lookup, one query profile); anything
+# else a sub-request leaves on g is dropped before the next one runs.
+SHARED_G_KEYS = ('_db_connection', '_db_connection_shared', '_identity', '_query_profile')
+
+FORWARDED_HEADERS = ('Authorization', 'Accept-Language', 'User-Agent', 'X-Forwarded-For', 'X-Real-IP')
+
+
+def _error(request_id, status, message):
+    return {'id': request_id, 'status': status, 'body': {'success': False, 'error': message}}
+
+
+def _read_body(response):
+    """Body bytes, or None once it passes BATCH_MAX_RESPONSE_BYTES"""
+    if (response.content_length or 0) > BATCH_MAX_RESPONSE_BYTES:
+        return None
+    chunks = []
+    size = 0
+    for chunk in response.iter_encoded():
+        size += len(chunk)
+        if size > BATCH_MAX_RESPONSE_BYTES:
+            return None
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def _restore_g(saved):
+    for key in list(g):
+        if key not in saved and key not in SHARED_G_KEYS:
+            g.pop(key)
+    for key, value in saved.items():
+        if key not in SHARED_G_KEYS:
+            setattr(g, key, value)
+
+
+def _dispatch(request_id, path, query_string):
+    """
+    Run one GET through the app's before_request hooks (so the rate limiter
+    charges it like a direct call), routing and error handlers. after_request
+    hooks such as compression apply to the batch response as a whole.
+    """
+    app = current_app._get_current_object()
+    builder = EnvironBuilder(
+        path=path, query_string=query_string, method='GET', base_url=request.url_root,
+        headers={name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers},
+        environ_base={'REMOTE_ADDR': request.remote_addr, BATCH_USER_ENVIRON_KEY: request.current_user}
+    )
+    saved = {key: g.get(key) for key in g}
+    ctx = app.request_context(builder.get_environ())
+    ctx.push()
+    try:
+        try:
+            rv = app.preprocess_request()
+            if rv is None:
+                rv = app.dispatch_request()
+        except Exception as e:
+            try:
+                rv = app.handle_user_exception(e)
+            except Exception:
+                app_logger.error(f"Batch sub-request {path} failed", exc_info=True)
+                return _error(request_id, 500, 'An unexpected error occurred')
+        response = app.make_response(rv)
+        try:
+            body = _read_body(response)
+        finally:
+            # Releases a streamed response's cursor, read to the end or not
+            response.close()
+    finally:
+        ctx.pop()
+        _restore_g(saved)
+        builder.close()
+
+    if body is None:
+        return _error(request_id, 413, f'Response exceeds {BATCH_MAX_RESPONSE_BYTES} bytes; request it separately')
+    result = {'id': request_id, 'status': response.status_code, 'body': None}
+    if body and response.is_json:
+        try:
+            result['body'] = app.json.loads(body)
+        except ValueError:
+            return _error(request_id, 500, 'Response interrupted')
+    elif body:
+        result['body'] = body.decode('utf-8', 'replace')
+    return result
+
+
+@batch_bp.route('', methods=['POST'])
+@token_required
+def run_batch():
+    """
+    Run several GET requests in one round trip:
+
+        {"requests": [{"id": "machines", "path": "/api/machines?status=active"},
+                      "/api/departments"]}
+
+    Sub-requests run in order, in-process, on one database connection and
+    with the batch's verified user; each counts against the rate limit like
+    a direct call. Each result carries its own status and the body the
+    endpoint would have returned. Bodies over BATCH_MAX_RESPONSE_BYTES are
+    replaced by a 413 result.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return error_response('requests must be a non-empty list')
+    if len(items) > BATCH_MAX_REQUESTS:
+        return error_response(f'A batch may hold at most {BATCH_MAX_REQUESTS} requests')
+
+    results = []
+    with shared_request_connection():
+        for index, item in enumerate(items):
+            if isinstance(item, str):
+                item = {'path': item}
+            if not isinstance(item, dict):
+                results.append(_error(index, 400, 'Each request must be a path or an object with a path'))
+                continue
+            request_id = item.get('id', index)
+            if str(item.get('method', 'GET')).upper() != 'GET':
+                results.append(_error(request_id, 405, 'Only GET requests can be batched'))
+                continue
+            path = item.get('path')
+            parts = urlsplit(path) if isinstance(path, str) else None
+            if parts is None or parts.scheme or parts.netloc or not parts.path.startswith('/api/'):
+                results.append(_error(request_id, 400, 'path must be an /api/ path'))
+                continue
+            results.append(_dispatch(request_id, parts.path, parts.query))
+    return success_response(results)
@@ -3,12 +3,17 @@ from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
 from backend.utils.response import success_response, error_response
 from backend.utils.audit import log_audit
+from backend.utils.reference_cache import invalidate_reference
+from backend.config.query_governor import query_class
+from backend.utils.result_cache import cached_result
 from datetime import datetime, timedelta
 
 capacity_planning_bp = Blueprint('capacity_planning', __name__, url_prefix='/api/capacity-planning')
 
 @capacity_planning_bp.route('/departments', methods=['GET'])
 @token_required
+@query_class('analytics')
+@cached_result('job_schedules', 'employees', 'machines', 'departments')
 def get_department_capacity():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
@@ -18,21 +23,37 @@ def get_department_capacity():
     if not end_date:
         end_date = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
     
+    # Each side is aggregated on its own: joining employees, machines and
+    # schedules directly multiplies the rows (and the SUMs) per department
     query = """
         SELECT 
             d.id, d.name, d.capacity_target,
-            COUNT(DISTINCT e.id) as employee_count,
-            COUNT(DISTINCT m.id) as machine_count,
-            COUNT(DISTINCT CASE WHEN js.status IN ('scheduled', 'in_progress') THEN js.id END) as scheduled_jobs,
-            SUM(CASE WHEN js.status IN ('scheduled', 'in_progress') THEN js.scheduled_quantity ELSE 0 END) as scheduled_quantity,
-            SUM(CASE WHEN js.status = 'completed' THEN js.actual_quantity ELSE 0 END) as completed_quantity
+            COALESCE(e.employee_count, 0) as employee_count,
+            COALESCE(m.machine_count, 0) as machine_count,
+            COALESCE(js.scheduled_jobs, 0) as scheduled_jobs,
+            COALESCE(js.scheduled_quantity, 0) as scheduled_quantity,
+            COALESCE(js.completed_quantity, 0) as completed_quantity
         FROM departments d
-        LEFT JOIN employees e ON d.id = e.department_id AND e.is_active = TRUE
-        LEFT JOIN machines m ON d.id = m.department_id AND m.is_active = TRUE
-        LEFT JOIN job_schedules js ON d.id = js.department_id 
-            AND js.scheduled_date BETWEEN %s AND %s
+        LEFT JOIN (
+            SELECT department_id, COUNT(*) as employee_count
+            FROM employees WHERE is_active = TRUE
+            GROUP BY department_id
+        ) e ON e.department_id = d.id
+        LEFT JOIN (
+            SELECT department_id, COUNT(*) as machine_count
+            FROM machines WHERE is_active = TRUE
+            GROUP BY department_id
+        ) m ON m.department_id = d.id
+        LEFT JOIN (
+            SELECT department_id,
+                   COUNT(CASE WHEN status IN ('scheduled', 'in_progress') THEN 1 END) as scheduled_jobs,
+                   SUM(CASE WHEN status IN ('scheduled', 'in_progress') THEN scheduled_quantity ELSE 0 END) as scheduled_quantity,
+                   SUM(CASE WHEN status = 'completed' THEN actual_quantity ELSE 0 END) as completed_quantity
+            FROM job_schedules
+            WHERE scheduled_date BETWEEN %s AND %s
+            GROUP BY department_id
+        ) js ON js.department_id = d.id
         WHERE d.is_active = TRUE
-        GROUP BY d.id, d.name, d.capacity_target
         ORDER BY d.name
     """
     
@@ -177,6 +198,7 @@ def update_capacity_target(id):
         (target, id),
         commit=True
     )
+    invalidate_reference('departments')
     
     log_audit(user_id, 'UPDATE_CAPACITY_TARGET', 'department', id, old_data, data)
     
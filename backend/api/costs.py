@@ -3,6 +3,8 @@ from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
 from backend.utils.response import success_response, error_response
 from backend.utils.audit import log_audit
+from backend.config.query_governor import query_class
+from backend.utils.result_cache import cached_result, invalidate_table
 from datetime import datetime
 import json
 
@@ -10,6 +12,8 @@ costs_bp = Blueprint('costs', __name__, url_prefix='/api/costs')
 
 @costs_bp.route('/job-profitability', methods=['GET'])
 @token_required
+@query_class('analytics')
+@cached_result(('job_schedules', 'department_id'), 'orders', 'products', 'departments')
 def get_job_profitability():
     """Get job profitability analysis from view"""
     department_id = request.args.get('department_id')
@@ -36,11 +40,12 @@ def get_job_profitability():
     
     query += " ORDER BY scheduled_date DESC LIMIT 100"
     
-    jobs = execute_query(query, tuple(params) if params else None, fetch_all=True)
+    jobs = execute_query(query, tuple(params) if params else None, fetch_all=True, route='replica')
     return success_response(jobs)
 
 @costs_bp.route('/department-analysis', methods=['GET'])
 @token_required
+@cached_result(('job_schedules', 'department_id'), 'departments')
 def get_department_cost_analysis():
     """Get department cost analysis from view"""
     department_id = request.args.get('department_id')
@@ -305,6 +310,7 @@ def calculate_job_cost(job_id):
             (job_id,),
             commit=True
         )
+        invalidate_table('job_schedules', job['department_id'])
         
         # Get updated job with calculated costs
         updated_job = execute_query(
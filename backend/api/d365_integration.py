@@ -1,8 +1,10 @@
 from flask import Blueprint, request
-from backend.config.database import execute_query
+from backend.config.database import execute_query, execute_stream, bulk_upsert
 from backend.utils.auth import token_required, permission_required
-from backend.utils.response import success_response, error_response
+from backend.utils.response import success_response, error_response, streamed_response
 from backend.utils.audit import log_audit
+from backend.utils.reference_cache import invalidate_reference
+from backend.utils.result_cache import invalidate_table
 from datetime import datetime, timedelta
 import json
 import requests
@@ -248,8 +250,8 @@ def get_sync_logs():
     
     query += " ORDER BY sl.sync_started_at DESC LIMIT 100"
     
-    logs = execute_query(query, tuple(params) if params else None, fetch_all=True)
-    return success_response(logs)
+    logs = execute_stream(query, tuple(params) if params else None)
+    return streamed_response(logs)
 
 @d365_bp.route('/test-connection/<int:config_id>', methods=['POST'])
 @token_required
@@ -292,9 +294,9 @@ def perform_sync(config, entity_types, sync_direction):
                 success += len(records)
             elif sync_direction == 'export':
                 records = fetch_from_pms(entity_type)
-                export_to_d365(config['endpoint_url'], entity_type, records, headers, field_mappings.get(entity_type, {}))
-                processed += len(records)
-                success += len(records)
+                exported = export_to_d365(config['endpoint_url'], entity_type, records, headers, field_mappings.get(entity_type, {}))
+                processed += exported
+                success += exported
         except Exception as e:
             failed += 1
     
@@ -386,45 +388,43 @@ def import_records(entity_type, records, field_mapping):
     elif entity_type == 'customers':
         import_customers(records, field_mapping)
 
+SALES_ORDER_COLUMNS = ['order_number', 'customer_name', 'quantity', 'order_value',
+                       'start_date', 'status', 'd365_sync_id', 'last_d365_sync']
+# status is only set for new orders; existing orders keep their PMS status
+SALES_ORDER_UPDATE_COLUMNS = ['customer_name', 'quantity', 'order_value',
+                              'start_date', 'd365_sync_id', 'last_d365_sync']
+
 def import_sales_orders(orders, field_mapping):
+    synced_at = datetime.now()
+    rows = []
     for d365_order in orders:
         try:
-            order_number = map_field(d365_order, field_mapping, 'order_number', 'SalesOrderNumber')
-            customer_name = map_field(d365_order, field_mapping, 'customer_name', 'CustomerName')
-            quantity = map_field(d365_order, field_mapping, 'quantity', 'Quantity', default=0)
-            order_value = map_field(d365_order, field_mapping, 'order_value', 'TotalAmount', default=0)
-            start_date = map_field(d365_order, field_mapping, 'start_date', 'RequestedDeliveryDate')
-            
-            existing = execute_query(
-                "SELECT id FROM orders WHERE order_number = %s",
-                (order_number,),
-                fetch_one=True
-            )
-            
-            if existing:
-                execute_query(
-                    """UPDATE orders SET
-                       customer_name = %s, quantity = %s, order_value = %s,
-                       start_date = %s, d365_sync_id = %s, last_d365_sync = NOW()
-                       WHERE order_number = %s""",
-                    (customer_name, quantity, order_value, start_date, 
-                     d365_order.get('Id') or d365_order.get('SalesOrderId'), order_number),
-                    commit=True
-                )
-            else:
-                execute_query(
-                    """INSERT INTO orders
-                       (order_number, customer_name, quantity, order_value,
-                        start_date, status, d365_sync_id, last_d365_sync)
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())""",
-                    (order_number, customer_name, quantity, order_value,
-                     start_date, 'unscheduled', d365_order.get('Id') or d365_order.get('SalesOrderId')),
-                    commit=True
-                )
-                
+            rows.append((
+                map_field(d365_order, field_mapping, 'order_number', 'SalesOrderNumber'),
+                map_field(d365_order, field_mapping, 'customer_name', 'CustomerName'),
+                map_field(d365_order, field_mapping, 'quantity', 'Quantity', default=0),
+                map_field(d365_order, field_mapping, 'order_value', 'TotalAmount', default=0),
+                map_field(d365_order, field_mapping, 'start_date', 'RequestedDeliveryDate'),
+                'unscheduled',
+                d365_order.get('Id') or d365_order.get('SalesOrderId'),
+                synced_at
+            ))
         except Exception as e:
             print(f"Failed to import order {d365_order.get('SalesOrderNumber', 'unknown')}: {str(e)}")
-            continue
+    
+    try:
+        bulk_upsert('orders', SALES_ORDER_COLUMNS, rows, SALES_ORDER_UPDATE_COLUMNS)
+    except Exception:
+        # Upserts are idempotent, so retry row by row to skip only the bad ones
+        for row in rows:
+            try:
+                bulk_upsert('orders', SALES_ORDER_COLUMNS, [row], SALES_ORDER_UPDATE_COLUMNS)
+            except Exception as e:
+                print(f"Failed to import order {row[0] or 'unknown'}: {str(e)}")
+    
+    if rows:
+        # Existing orders may have new quantities and values
+        invalidate_table('orders')
 
 def import_products(products, field_mapping):
     for d365_product in products:
@@ -459,6 +459,7 @@ def import_products(products, field_mapping):
         except Exception as e:
             print(f"Failed to import product {d365_product.get('ProductNumber', 'unknown')}: {str(e)}")
             continue
+    invalidate_reference('products')
 
 def import_customers(customers, field_mapping):
     pass
@@ -474,13 +475,32 @@ def fetch_from_pms(entity_type):
             fetch_all=True
         ) or []
     elif entity_type == 'products':
-        return execute_query(
-            "SELECT * FROM products WHERE is_active = TRUE",
-            fetch_all=True
-        ) or []
+        return iter_active_products()
     else:
         return []
 
+def iter_active_products(batch_size=500):
+    """
+    Yield active products in id order, batch_size rows per query. Export
+    makes an HTTP call per record, far too slow to hold a server-side
+    cursor open (MySQL drops unread streams after net_write_timeout), so
+    the table is paged by primary key instead of loaded in one go.
+    """
+    last_id = 0
+    while True:
+        batch = execute_query(
+            """SELECT * FROM products
+               WHERE is_active = TRUE AND id > %s
+               ORDER BY id
+               LIMIT %s""",
+            (last_id, batch_size),
+            fetch_all=True
+        )
+        if not batch:
+            return
+        yield from batch
+        last_id = batch[-1]['id']
+
 def export_to_d365(endpoint_url, entity_type, records, headers, field_mapping):
     entity_endpoints = {
         'sales_orders': '/salesorders',
@@ -490,7 +510,9 @@ def export_to_d365(endpoint_url, entity_type, records, headers, field_mapping):
     entity_path = entity_endpoints.get(entity_type, f'/{entity_type}')
     full_url = f"{endpoint_url.rstrip('/')}{entity_path}"
     
+    exported = 0
     for record in records:
+        exported += 1
         try:
             d365_payload = map_pms_to_d365(entity_type, record, field_mapping)
             
@@ -519,6 +541,8 @@ def export_to_d365(endpoint_url, entity_type, records, headers, field_mapping):
         except Exception as e:
             print(f"Failed to export {entity_type} record {record.get('id')}: {str(e)}")
             continue
+    
+    return exported
 
 def map_field(source_record, field_mapping, pms_field, default_d365_field, default=None):
     d365_field = field_mapping.get(pms_field, default_d365_field)
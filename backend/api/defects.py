@@ -1,8 +1,12 @@
 from flask import Blueprint, request
-from backend.config.database import execute_query
+from backend.config.database import execute_query, execute_stream
 from backend.utils.auth import token_required, permission_required
-from backend.utils.response import success_response, error_response
+from backend.utils.response import success_response, error_response, paginated_response, streamed_response
+from backend.utils.pagination import get_keyset_page
+from backend.utils.fieldsets import get_fieldset
 from backend.utils.audit import log_audit
+from backend.utils.reference_cache import attach_names
+from backend.utils.result_cache import invalidate_table
 from backend.utils.notifications import create_notification
 from backend.utils.email_sender import send_email
 from datetime import datetime, timedelta
@@ -10,23 +14,42 @@ import os
 
 defects_bp = Blueprint('defects', __name__, url_prefix='/api/defects')
 
+TICKET_NAMES = [
+    ('products', 'product_id', 'product_name'),
+    ('departments', 'department_id', 'department_name'),
+    ('users', 'created_by_id', 'created_by_name'),
+    ('users', 'approved_by_id', 'approved_by_name')
+]
+
+# ?fields= whitelist for the ticket listing; the orders join is only made
+# when order_number or customer_name is asked for
+TICKET_FIELDS = {
+    column: f'rt.{column}' for column in (
+        'id', 'ticket_number', 'order_id', 'order_item_id', 'product_id', 'quantity_rejected',
+        'department_id', 'stage_id', 'rejection_reason', 'rejection_type', 'status',
+        'cost_impact', 'material_cost', 'labor_cost', 'total_cost', 'created_by_id',
+        'approved_by_id', 'approved_at', 'notes', 'config', 'created_at', 'updated_at'
+    )
+}
+TICKET_FIELDS.update({'order_number': 'o.order_number', 'customer_name': 'o.customer_name'})
+TICKET_JOINS = {'o': 'LEFT JOIN orders o ON rt.order_id = o.id'}
+
 @defects_bp.route('/replacement-tickets', methods=['GET'])
 @token_required
 def get_replacement_tickets():
     status = request.args.get('status')
     department_id = request.args.get('department_id')
+    fields = get_fieldset(
+        TICKET_FIELDS, 'rt.*, o.order_number, o.customer_name', TICKET_JOINS, TICKET_NAMES
+    )
+    page = get_keyset_page({'created_at': 'rt.created_at'})
+    if page is not None:
+        fields.require(*page.keys, 'id')
     
-    query = """
-        SELECT rt.*, o.order_number, o.customer_name,
-               p.product_name, d.name as department_name,
-               CONCAT(created.first_name, ' ', created.last_name) as created_by_name,
-               CONCAT(approved.first_name, ' ', approved.last_name) as approved_by_name
+    query = f"""
+        SELECT {fields.select()}
         FROM replacement_tickets rt
-        LEFT JOIN orders o ON rt.order_id = o.id
-        LEFT JOIN products p ON rt.product_id = p.id
-        LEFT JOIN departments d ON rt.department_id = d.id
-        LEFT JOIN users created ON rt.created_by_id = created.id
-        LEFT JOIN users approved ON rt.approved_by_id = approved.id
+        {fields.joins()}
         WHERE 1=1
     """
     
@@ -39,10 +62,15 @@ def get_replacement_tickets():
         query += " AND rt.department_id = %s"
         params.append(department_id)
     
+    if page is not None:
+        query, params = page.apply(query, params, 'rt.id')
+        tickets = page.finish(execute_query(query, params, fetch_all=True))
+        return paginated_response(fields.apply(tickets), page)
+    
     query += " ORDER BY rt.created_at DESC"
     
-    tickets = execute_query(query, tuple(params) if params else None, fetch_all=True)
-    return success_response(tickets)
+    tickets = execute_stream(query, tuple(params) if params else None)
+    return streamed_response(tickets, fields.prepare())
 
 @defects_bp.route('/replacement-tickets', methods=['POST'])
 @token_required
@@ -106,6 +134,7 @@ def create_replacement_ticket():
                 WHERE id = %s
             """
             execute_query(update_query, (material_cost, material_cost, ticket_id), commit=True)
+        invalidate_table('replacement_tickets', data['department_id'])
         
         dept_manager_query = "SELECT manager_id FROM departments WHERE id = %s"
         dept = execute_query(dept_manager_query, (data['department_id'],), fetch_one=True)
@@ -168,6 +197,7 @@ def approve_replacement_ticket(id):
     """
     
     execute_query(query, (user_id, id), commit=True)
+    invalidate_table('replacement_tickets')
     log_audit(user_id, 'APPROVE', 'replacement_ticket', id)
     
     return success_response(message='Replacement ticket approved')
@@ -188,6 +218,7 @@ def update_replacement_ticket_status(id):
         (status, id),
         commit=True
     )
+    invalidate_table('replacement_tickets')
     
     if status == 'no_stock':
         ticket = execute_query(
@@ -207,6 +238,7 @@ def update_replacement_ticket_status(id):
                 (ticket['order_id'],),
                 commit=True
             )
+            invalidate_table('orders')
             
             dept_managers = execute_query(
                 """SELECT d.manager_id, u.email as manager_email, u.first_name, u.last_name,
@@ -315,12 +347,9 @@ def get_customer_returns():
     end_date = request.args.get('end_date')
     
     query = """
-        SELECT cr.*, o.order_number, o.customer_name, p.product_name,
-               CONCAT(u.first_name, ' ', u.last_name) as recorded_by_name
+        SELECT cr.*, o.order_number, o.customer_name
         FROM customer_returns cr
         LEFT JOIN orders o ON cr.order_id = o.id
-        LEFT JOIN products p ON cr.product_id = p.id
-        LEFT JOIN users u ON cr.recorded_by_id = u.id
         WHERE 1=1
     """
     
@@ -340,7 +369,10 @@ def get_customer_returns():
     query += " ORDER BY cr.return_date DESC"
     
     returns = execute_query(query, tuple(params) if params else None, fetch_all=True)
-    return success_response(returns)
+    return success_response(attach_names(returns, [
+        ('products', 'product_id', 'product_name'),
+        ('users', 'recorded_by_id', 'recorded_by_name')
+    ]))
 
 @defects_bp.route('/customer-returns', methods=['POST'])
 @token_required
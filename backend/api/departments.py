@@ -3,44 +3,31 @@ from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
 from backend.utils.response import success_response, error_response
 from backend.utils.audit import log_audit
+from backend.utils.request_context import invalidate_identity
+from backend.utils.reference_cache import reference, attach_names, invalidate_reference
 
 departments_bp = Blueprint('departments', __name__, url_prefix='/api/departments')
 
 @departments_bp.route('', methods=['GET'])
 @token_required
 def get_departments():
-    query = """
-        SELECT d.*, 
-               CONCAT(u.first_name, ' ', u.last_name) as manager_name
-        FROM departments d
-        LEFT JOIN users u ON d.manager_id = u.id
-        WHERE d.is_active = TRUE
-        ORDER BY d.name
-    """
-    departments = execute_query(query, fetch_all=True)
+    departments = [d for d in reference('departments').all() if d['is_active']]
+    departments.sort(key=lambda d: (d['name'] or '').lower())
     return success_response(departments)
 
 @departments_bp.route('/<int:id>', methods=['GET'])
 @token_required
 def get_department(id):
-    query = """
-        SELECT d.*, 
-               CONCAT(u.first_name, ' ', u.last_name) as manager_name
-        FROM departments d
-        LEFT JOIN users u ON d.manager_id = u.id
-        WHERE d.id = %s
-    """
-    department = execute_query(query, (id,), fetch_one=True)
+    department = reference('departments').get(id)
     
     if not department:
         return error_response('Department not found', 404)
     
-    stages_query = """
-        SELECT * FROM production_stages 
-        WHERE department_id = %s AND is_active = TRUE
-        ORDER BY stage_order
-    """
-    stages = execute_query(stages_query, (id,), fetch_all=True)
+    stages = [
+        stage for stage in reference('production_stages').all()
+        if stage['department_id'] == id and stage['is_active']
+    ]
+    stages.sort(key=lambda stage: stage['stage_order'])
     department['stages'] = stages
     
     return success_response(department)
@@ -81,6 +68,8 @@ def create_department():
             commit=True
         )
         
+        invalidate_identity()
+        invalidate_reference('departments')
         log_audit(user_id, 'CREATE', 'department', dept_id, None, data)
         
         return success_response({'id': dept_id}, 'Department created successfully', 201)
@@ -124,6 +113,8 @@ def update_department(id):
             commit=True
         )
         
+        invalidate_identity()
+        invalidate_reference('departments')
         log_audit(user_id, 'UPDATE', 'department', id, old_data, data)
         
         return success_response(message='Department updated successfully')
@@ -137,6 +128,8 @@ def delete_department(id):
     user_id = request.current_user['user_id']
     
     execute_query("UPDATE departments SET is_active = FALSE WHERE id = %s", (id,), commit=True)
+    invalidate_identity()
+    invalidate_reference('departments')
     log_audit(user_id, 'DELETE', 'department', id)
     
     return success_response(message='Department deleted successfully')
@@ -144,14 +137,14 @@ def delete_department(id):
 @departments_bp.route('/stages', methods=['GET'])
 @token_required
 def get_all_stages():
-    query = """
-        SELECT ps.*, d.name as department_name, d.code as department_code
-        FROM production_stages ps
-        LEFT JOIN departments d ON ps.department_id = d.id
-        WHERE ps.is_active = TRUE
-        ORDER BY d.name, ps.stage_order
-    """
-    stages = execute_query(query, fetch_all=True)
+    stages = attach_names(
+        [stage for stage in reference('production_stages').all() if stage['is_active']],
+        [
+            ('departments', 'department_id', 'department_name'),
+            ('departments', 'department_id', 'department_code', 'code')
+        ]
+    )
+    stages.sort(key=lambda stage: ((stage['department_name'] or '').lower(), stage['stage_order']))
     return success_response(stages)
 
 @departments_bp.route('/<int:id>/stages', methods=['POST'])
@@ -181,6 +174,7 @@ def add_production_stage(id):
             commit=True
         )
         
+        invalidate_reference('production_stages')
         log_audit(user_id, 'CREATE', 'production_stage', stage_id, None, data)
         
         return success_response({'id': stage_id}, 'Production stage added successfully', 201)
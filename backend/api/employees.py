@@ -3,6 +3,8 @@ from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required, hash_password
 from backend.utils.response import success_response, error_response
 from backend.utils.audit import log_audit
+from backend.utils.request_context import invalidate_identity
+from backend.utils.reference_cache import invalidate_reference
 
 employees_bp = Blueprint('employees', __name__, url_prefix='/api/employees')
 
@@ -107,6 +109,9 @@ def create_employee():
             commit=True
         )
         
+        invalidate_reference('employees')
+        if user_account_id:
+            invalidate_reference('users')
         log_audit(user_id, 'CREATE', 'employee', emp_id, None, data)
         
         return success_response({'id': emp_id}, 'Employee created successfully', 201)
@@ -149,6 +154,9 @@ def update_employee(id):
             commit=True
         )
         
+        if old_data['user_id']:
+            invalidate_identity(old_data['user_id'])
+        invalidate_reference('employees')
         log_audit(user_id, 'UPDATE', 'employee', id, old_data, data)
         
         return success_response(message='Employee updated successfully')
@@ -160,8 +168,12 @@ def update_employee(id):
 @permission_required('admin', 'delete')
 def delete_employee(id):
     user_id = request.current_user['user_id']
+    employee = execute_query("SELECT user_id FROM employees WHERE id = %s", (id,), fetch_one=True)
     
     execute_query("UPDATE employees SET is_active = FALSE WHERE id = %s", (id,), commit=True)
+    if employee and employee['user_id']:
+        invalidate_identity(employee['user_id'])
+    invalidate_reference('employees')
     log_audit(user_id, 'DELETE', 'employee', id)
     
     return success_response(message='Employee deleted successfully')
@@ -1,5 +1,5 @@
 from flask import Blueprint, request
-from backend.config.database import execute_query
+from backend.config.database import execute_query, execute_many, transaction
 from backend.utils.auth import token_required, permission_required
 from backend.utils.response import success_response, error_response
 from backend.utils.audit import log_audit
@@ -82,43 +82,46 @@ def create_bom():
         VALUES (%s, %s, %s, %s, %s)
     """
     
+    item_query = """
+        INSERT INTO bom_items
+        (bom_id, item_code, item_description, quantity_per_unit,
+         unit_of_measure, unit_cost, material_type, supplier, notes)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    
     try:
-        bom_id = execute_query(
-            query,
-            (
-                data['product_id'],
-                data['version'],
-                data['effective_date'],
-                data.get('notes'),
-                user_id
-            ),
-            commit=True
-        )
-        
-        for item in data['items']:
-            item_query = """
-                INSERT INTO bom_items
-                (bom_id, item_code, item_description, quantity_per_unit,
-                 unit_of_measure, unit_cost, material_type, supplier, notes)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            execute_query(
-                item_query,
+        with transaction():
+            bom_id = execute_query(
+                query,
                 (
-                    bom_id,
-                    item['item_code'],
-                    item['item_description'],
-                    item['quantity_per_unit'],
-                    item['unit_of_measure'],
-                    item['unit_cost'],
-                    item.get('material_type'),
-                    item.get('supplier'),
-                    item.get('notes')
+                    data['product_id'],
+                    data['version'],
+                    data['effective_date'],
+                    data.get('notes'),
+                    user_id
                 ),
                 commit=True
             )
-        
-        log_audit(user_id, 'CREATE', 'bom', bom_id, None, data)
+            
+            execute_many(
+                item_query,
+                [
+                    (
+                        bom_id,
+                        item['item_code'],
+                        item['item_description'],
+                        item['quantity_per_unit'],
+                        item['unit_of_measure'],
+                        item['unit_cost'],
+                        item.get('material_type'),
+                        item.get('supplier'),
+                        item.get('notes')
+                    )
+                    for item in data['items']
+                ]
+            )
+            
+            log_audit(user_id, 'CREATE', 'bom', bom_id, None, data)
         
         return success_response({'id': bom_id}, 'BOM created successfully', 201)
     except Exception as e:
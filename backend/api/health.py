@@ -1,7 +1,11 @@
-from flask import Blueprint, jsonify
-from backend.config.db_pool import db_pool
+from flask import Blueprint, jsonify, Response
+from backend.config.db_pool import db_pool, get_replica_stats
+from backend.config.pool_metrics import render_prometheus
+from backend.config import query_governor
+from backend.utils import result_cache, compression
 from backend.config.redis_config import redis_client
 from backend.utils.response import success_response, error_response
+from backend.utils.auth import token_required, permission_required
 from backend.utils.logger import app_logger
 from datetime import datetime
 import os
@@ -33,11 +37,27 @@ def detailed_health_check():
         with db_pool.get_cursor() as cursor:
             cursor.execute("SELECT 1")
             cursor.fetchone()
+        pool_stats = db_pool.stats() or {}
         health_status['services']['database'] = {
             'status': 'healthy',
             'pool_size': db_pool._connection_count,
-            'max_pool_size': db_pool.max_connections
+            'max_pool_size': db_pool.max_connections,
+            'in_use': pool_stats.get('in_use', 0),
+            'idle': pool_stats.get('idle', 0),
+            'exhausted': pool_stats.get('exhausted', 0),
+            'dead_replaced': pool_stats.get('dead_replaced', 0),
+            'wait_avg_ms': pool_stats.get('wait_avg_ms', 0.0),
+            'wait_max_ms': pool_stats.get('wait_max_ms', 0.0),
+            'top_blueprints': pool_stats.get('blueprint_ranking', [])[:5]
         }
+        replica_stats = get_replica_stats()
+        if replica_stats is not None:
+            health_status['services']['database']['replica'] = {
+                'pool_size': replica_stats['size'],
+                'in_use': replica_stats['in_use'],
+                'idle': replica_stats['idle'],
+                'exhausted': replica_stats['exhausted']
+            }
     except Exception as e:
         all_healthy = False
         health_status['services']['database'] = {
@@ -75,6 +95,41 @@ def detailed_health_check():
     status_code = 200 if all_healthy else 503
     return jsonify(health_status), status_code
 
+@health_bp.route('/pool', methods=['GET'])
+def pool_stats():
+    stats = db_pool.stats()
+    if stats is None:
+        return error_response('Database pool not available', 503)
+    stats['replica'] = get_replica_stats()
+    stats['query_budgets'] = query_governor.governor_stats()
+    stats['result_cache'] = result_cache.result_cache_stats()
+    stats['compression'] = compression.compression_stats()
+    return success_response(stats)
+
+@health_bp.route('/pool/leases', methods=['GET'])
+@token_required
+@permission_required('admin', 'read')
+def pool_leases():
+    leases = db_pool.leases()
+    return success_response({
+        'count': len(leases),
+        'leases': leases
+    })
+
+@health_bp.route('/metrics', methods=['GET'])
+def pool_metrics():
+    stats = db_pool.stats()
+    if stats is None:
+        return Response('', status=503, mimetype='text/plain')
+    body = render_prometheus(stats)
+    replica_stats = get_replica_stats()
+    if replica_stats is not None:
+        body += render_prometheus(replica_stats, prefix='pms_db_replica_pool')
+    body += query_governor.render_prometheus(query_governor.governor_stats())
+    body += result_cache.render_prometheus(result_cache.result_cache_stats())
+    body += compression.render_prometheus(compression.compression_stats())
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
 @health_bp.route('/ready', methods=['GET'])
 def readiness_check():
     try:
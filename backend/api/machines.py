@@ -1,8 +1,9 @@
 from flask import Blueprint, request
 from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
-from backend.utils.response import success_response, error_response
+from backend.utils.response import success_response, error_response, cacheable_response
 from backend.utils.audit import log_audit
+from backend.utils.reference_cache import reference, attach_names, invalidate_reference
 
 machines_bp = Blueprint('machines', __name__, url_prefix='/api/machines')
 
@@ -12,41 +13,26 @@ def get_machines():
     department_id = request.args.get('department_id')
     status = request.args.get('status')
     
-    query = """
-        SELECT m.*, d.name as department_name
-        FROM machines m
-        LEFT JOIN departments d ON m.department_id = d.id
-        WHERE m.is_active = TRUE
-    """
-    
-    params = []
+    machines = [m for m in reference('machines').all() if m['is_active']]
     if department_id:
-        query += " AND m.department_id = %s"
-        params.append(department_id)
+        machines = [m for m in machines if str(m['department_id']) == department_id]
     
     if status:
-        query += " AND m.status = %s"
-        params.append(status)
-    
-    query += " ORDER BY m.machine_name"
+        machines = [m for m in machines if m['status'] == status]
     
-    machines = execute_query(query, tuple(params) if params else None, fetch_all=True)
+    attach_names(machines, [('departments', 'department_id', 'department_name')])
+    machines.sort(key=lambda m: (m['machine_name'] or '').lower())
     return success_response(machines)
 
 @machines_bp.route('/<int:id>', methods=['GET'])
 @token_required
 def get_machine(id):
-    query = """
-        SELECT m.*, d.name as department_name
-        FROM machines m
-        LEFT JOIN departments d ON m.department_id = d.id
-        WHERE m.id = %s
-    """
-    machine = execute_query(query, (id,), fetch_one=True)
+    machine = reference('machines').get(id)
     
     if not machine:
         return error_response('Machine not found', 404)
     
+    attach_names([machine], [('departments', 'department_id', 'department_name')])
     return success_response(machine)
 
 @machines_bp.route('', methods=['POST'])
@@ -86,6 +72,7 @@ def create_machine():
             commit=True
         )
         
+        invalidate_reference('machines')
         log_audit(user_id, 'CREATE', 'machine', machine_id, None, data)
         
         return success_response({'id': machine_id}, 'Machine created successfully', 201)
@@ -130,6 +117,7 @@ def update_machine(id):
             commit=True
         )
         
+        invalidate_reference('machines')
         log_audit(user_id, 'UPDATE', 'machine', id, old_data, data)
         
         return success_response(message='Machine updated successfully')
@@ -152,6 +140,7 @@ def update_machine_status(id):
         commit=True
     )
     
+    invalidate_reference('machines')
     log_audit(user_id, 'UPDATE_STATUS', 'machine', id, None, {'status': status})
     
     return success_response(message='Machine status updated successfully')
@@ -334,7 +323,7 @@ def get_machine_calendar():
             'ticket_number': mt['ticket_number']
         })
     
-    return success_response({
+    return cacheable_response({
         'machines': machines,
         'events': calendar_events,
         'preventive_maintenance': pm_schedules,
@@ -1,8 +1,12 @@
 from flask import Blueprint, request
 from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
-from backend.utils.response import success_response, error_response
+from backend.utils.response import success_response, error_response, paginated_response
+from backend.utils.pagination import get_keyset_page
 from backend.utils.audit import log_audit
+from backend.utils.reference_cache import invalidate_reference
+from backend.config.query_governor import query_class
+from backend.utils.result_cache import cached_result, invalidate_table
 from backend.utils.notifications import create_notification
 from datetime import datetime, timedelta
 
@@ -40,6 +44,16 @@ def get_maintenance_tickets():
         query += " AND mt.department_id = %s"
         params.append(department_id)
     
+    # Paged like the full listing: highest priority first, then newest
+    page = get_keyset_page(
+        {'priority': ('mt.priority_order', 'mt.created_at'), 'created_at': 'mt.created_at'},
+        default_sort='priority'
+    )
+    if page is not None:
+        query, params = page.apply(query, params, 'mt.id')
+        tickets = page.finish(execute_query(query, params, fetch_all=True))
+        return paginated_response(tickets, page)
+    
     query += " ORDER BY mt.priority_order DESC, mt.created_at DESC"
     
     tickets = execute_query(query, tuple(params) if params else None, fetch_all=True)
@@ -101,12 +115,14 @@ def create_maintenance_ticket():
             ),
             commit=True
         )
+        invalidate_table('maintenance_tickets', data['department_id'])
         
         execute_query(
             "UPDATE machines SET status = 'maintenance' WHERE id = %s",
             (data['machine_id'],),
             commit=True
         )
+        invalidate_reference('machines')
         
         log_audit(user_id, 'CREATE', 'maintenance_ticket', ticket_id, None, data)
         
@@ -135,6 +151,7 @@ def assign_maintenance_ticket(id):
          data.get('expected_completion_time'), id),
         commit=True
     )
+    invalidate_table('maintenance_tickets')
     
     create_notification(
         assigned_to,
@@ -182,6 +199,7 @@ def update_maintenance_status(id):
                 (ticket['machine_id'],),
                 commit=True
             )
+            invalidate_reference('machines')
     
     set_clause = ', '.join([f"{k} = %s" for k in update_data.keys()])
     values = list(update_data.values()) + [id]
@@ -191,6 +209,7 @@ def update_maintenance_status(id):
         tuple(values),
         commit=True
     )
+    invalidate_table('maintenance_tickets')
     
     log_audit(user_id, 'UPDATE_STATUS', 'maintenance_ticket', id, None, update_data)
     
@@ -215,6 +234,8 @@ def get_machine_history(machine_id):
 
 @maintenance_bp.route('/analytics', methods=['GET'])
 @token_required
+@query_class('analytics')
+@cached_result(('maintenance_tickets', 'department_id'), 'machines')
 def get_maintenance_analytics():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
@@ -251,7 +272,7 @@ def get_maintenance_analytics():
         {where_clause}
     """
     
-    stats = execute_query(ticket_stats_query, tuple(params), fetch_one=True)
+    stats = execute_query(ticket_stats_query, tuple(params), fetch_one=True, route='replica')
     
     machine_breakdown_query = f"""
         SELECT 
@@ -268,7 +289,7 @@ def get_maintenance_analytics():
         LIMIT 10
     """
     
-    machine_breakdown = execute_query(machine_breakdown_query, tuple(params), fetch_all=True)
+    machine_breakdown = execute_query(machine_breakdown_query, tuple(params), fetch_all=True, route='replica')
     
     severity_breakdown_query = f"""
         SELECT 
@@ -281,7 +302,7 @@ def get_maintenance_analytics():
         ORDER BY count DESC
     """
     
-    severity_breakdown = execute_query(severity_breakdown_query, tuple(params), fetch_all=True)
+    severity_breakdown = execute_query(severity_breakdown_query, tuple(params), fetch_all=True, route='replica')
     
     monthly_trends_query = f"""
         SELECT 
@@ -296,7 +317,7 @@ def get_maintenance_analytics():
         ORDER BY month ASC
     """
     
-    monthly_trends = execute_query(monthly_trends_query, tuple(params), fetch_all=True)
+    monthly_trends = execute_query(monthly_trends_query, tuple(params), fetch_all=True, route='replica')
     
     for machine in machine_breakdown:
         machine['mtbf'] = 0
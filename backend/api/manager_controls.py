@@ -1,6 +1,8 @@
 from flask import Blueprint, request
 from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
+from backend.utils.request_context import current_context
+from backend.utils.result_cache import invalidate_table
 from backend.utils.response import success_response, error_response
 from backend.utils.audit import log_audit
 from datetime import datetime
@@ -54,13 +56,7 @@ def get_my_department():
 @manager_controls_bp.route('/employee-machine-allocations', methods=['GET'])
 @token_required
 def get_employee_machine_allocations():
-    user_id = request.current_user['user_id']
-    
-    department = execute_query(
-        "SELECT id FROM departments WHERE manager_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    department = current_context.managed_department
     
     if not department:
         return error_response('No department found for this manager', 404)
@@ -95,7 +91,7 @@ def allocate_employee_to_machine():
             return error_response(f'{field} is required', 400)
     
     employee = execute_query("SELECT department_id FROM employees WHERE id = %s", (data['employee_id'],), fetch_one=True)
-    department = execute_query("SELECT id FROM departments WHERE manager_id = %s", (user_id,), fetch_one=True)
+    department = current_context.managed_department
     
     if not employee or not department or employee['department_id'] != department['id']:
         return error_response('Unauthorized or invalid employee', 403)
@@ -184,13 +180,7 @@ def deactivate_allocation(id):
 @manager_controls_bp.route('/job-assignments', methods=['GET'])
 @token_required
 def get_job_assignments():
-    user_id = request.current_user['user_id']
-    
-    department = execute_query(
-        "SELECT id FROM departments WHERE manager_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    department = current_context.managed_department
     
     if not department:
         return error_response('No department found for this manager', 404)
@@ -219,11 +209,7 @@ def assign_job_to_employee(job_id):
     data = request.get_json()
     user_id = request.current_user['user_id']
     
-    department = execute_query(
-        "SELECT id FROM departments WHERE manager_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    department = current_context.managed_department
     
     if not department:
         return error_response('Unauthorized', 403)
@@ -242,6 +228,7 @@ def assign_job_to_employee(job_id):
         (data.get('employee_id'), data.get('machine_id'), job_id),
         commit=True
     )
+    invalidate_table('job_schedules', department['id'])
     
     log_audit(user_id, 'ASSIGN_JOB', 'job_schedule', job_id)
     
@@ -254,11 +241,7 @@ def reschedule_job(job_id):
     data = request.get_json()
     user_id = request.current_user['user_id']
     
-    department = execute_query(
-        "SELECT id FROM departments WHERE manager_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    department = current_context.managed_department
     
     if not department:
         return error_response('Unauthorized', 403)
@@ -277,6 +260,7 @@ def reschedule_job(job_id):
         (data.get('scheduled_date'), job_id),
         commit=True
     )
+    invalidate_table('job_schedules', department['id'])
     
     log_audit(user_id, 'RESCHEDULE_JOB', 'job_schedule', job_id)
     
@@ -342,13 +326,7 @@ def get_manager_dashboard():
 @manager_controls_bp.route('/department-stats', methods=['GET'])
 @token_required
 def get_department_stats():
-    user_id = request.current_user['user_id']
-    
-    department = execute_query(
-        "SELECT id FROM departments WHERE manager_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    department = current_context.managed_department
     
     if not department:
         return error_response('No department found for this manager', 404)
@@ -373,13 +351,7 @@ def get_department_stats():
 @manager_controls_bp.route('/department-jobs', methods=['GET'])
 @token_required
 def get_department_jobs():
-    user_id = request.current_user['user_id']
-    
-    department = execute_query(
-        "SELECT id FROM departments WHERE manager_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    department = current_context.managed_department
     
     if not department:
         return error_response('No department found for this manager', 404)
@@ -409,11 +381,7 @@ def assign_job(job_id):
     data = request.get_json()
     user_id = request.current_user['user_id']
     
-    department = execute_query(
-        "SELECT id FROM departments WHERE manager_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    department = current_context.managed_department
     
     if not department:
         return error_response('Unauthorized', 403)
@@ -432,6 +400,7 @@ def assign_job(job_id):
         (data.get('assigned_employee_id'), data.get('machine_id'), data.get('scheduled_date'), job_id),
         commit=True
     )
+    invalidate_table('job_schedules', department['id'])
     
     log_audit(user_id, 'ASSIGN_JOB', 'job_schedule', job_id, None, data)
     
@@ -1,7 +1,7 @@
 from flask import Blueprint, request
 from backend.config.database import execute_query
 from backend.utils.auth import token_required
-from backend.utils.response import success_response, error_response
+from backend.utils.response import success_response, error_response, cacheable_response, not_modified
 from backend.utils.notifications import get_user_notifications, mark_notification_read
 
 notifications_bp = Blueprint('notifications', __name__, url_prefix='/api/notifications')
@@ -13,8 +13,21 @@ def get_notifications():
     unread_only = request.args.get('unread_only', 'false').lower() == 'true'
     limit = int(request.args.get('limit', 50))
     
+    # Notifications are only inserted, marked read or deleted, so this
+    # index-only aggregate changes whenever the list does
+    version = execute_query(
+        """SELECT COUNT(*) as total, MAX(id) as latest_id, SUM(is_read) as read_count
+           FROM notifications WHERE recipient_id = %s""",
+        (user_id,),
+        fetch_one=True
+    )
+    version = (version['total'], version['latest_id'], version['read_count'])
+    unchanged = not_modified(version)
+    if unchanged:
+        return unchanged
+    
     notifications = get_user_notifications(user_id, unread_only, limit)
-    return success_response(notifications)
+    return cacheable_response(notifications, version=version)
 
 @notifications_bp.route('/<int:id>/read', methods=['POST'])
 @token_required
@@ -1,7 +1,10 @@
 from flask import Blueprint, request
-from backend.config.database import execute_query
+from backend.config.database import execute_query, transaction
 from backend.utils.auth import token_required, hash_password, verify_password, generate_token
-from backend.utils.response import success_response, error_response
+from backend.utils.request_context import current_context
+from backend.utils.reference_cache import invalidate_reference
+from backend.utils.result_cache import invalidate_table
+from backend.utils.response import success_response, error_response, cacheable_response
 from backend.utils.audit import log_audit
 from datetime import datetime
 
@@ -60,13 +63,7 @@ def operator_login():
 @operator_bp.route('/my-jobs', methods=['GET'])
 @token_required
 def get_my_jobs():
-    user_id = request.current_user['user_id']
-    
-    employee = execute_query(
-        "SELECT id, department_id, employee_type FROM employees WHERE user_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    employee = current_context.employee
     
     if not employee:
         return error_response('Employee not found', 404)
@@ -94,7 +91,7 @@ def get_my_jobs():
     query += " AND js.status IN ('scheduled', 'in_progress') ORDER BY js.scheduled_date, js.created_at"
     
     jobs = execute_query(query, params, fetch_all=True)
-    return success_response(jobs)
+    return cacheable_response(jobs)
 
 @operator_bp.route('/job/<int:job_id>/start', methods=['POST'])
 @token_required
@@ -102,42 +99,45 @@ def start_job(job_id):
     data = request.get_json()
     user_id = request.current_user['user_id']
     
-    employee = execute_query(
-        "SELECT id FROM employees WHERE user_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    employee = current_context.employee
     
     if not employee:
         return error_response('Employee not found', 404)
     
     machine_id = data.get('machine_id')
     
-    execute_query(
-        """UPDATE job_schedules 
-           SET status = 'in_progress', started_at = %s, 
-               assigned_employee_id = %s, machine_id = %s
-           WHERE id = %s""",
-        (datetime.now(), employee['id'], machine_id, job_id),
-        commit=True
-    )
-    
-    if machine_id:
+    with transaction():
         execute_query(
-            "UPDATE machines SET status = 'in_use' WHERE id = %s",
-            (machine_id,),
+            """UPDATE job_schedules 
+               SET status = 'in_progress', started_at = %s, 
+                   assigned_employee_id = %s, machine_id = %s
+               WHERE id = %s""",
+            (datetime.now(), employee['id'], machine_id, job_id),
             commit=True
         )
-    
-    job = execute_query("SELECT order_id FROM job_schedules WHERE id = %s", (job_id,), fetch_one=True)
-    if job:
+        
+        if machine_id:
+            execute_query(
+                "UPDATE machines SET status = 'in_use' WHERE id = %s",
+                (machine_id,),
+                commit=True
+            )
+        
         execute_query(
-            "UPDATE orders SET status = 'in_progress' WHERE id = %s",
-            (job['order_id'],),
+            """UPDATE orders o
+               JOIN job_schedules js ON js.order_id = o.id
+               SET o.status = 'in_progress'
+               WHERE js.id = %s""",
+            (job_id,),
             commit=True
         )
+        
+        log_audit(user_id, 'START_JOB', 'job_schedule', job_id, None, data)
     
-    log_audit(user_id, 'START_JOB', 'job_schedule', job_id, None, data)
+    invalidate_table('job_schedules')
+    invalidate_table('orders')
+    if machine_id:
+        invalidate_reference('machines')
     
     return success_response(message='Job started successfully')
 
@@ -170,51 +170,56 @@ def complete_job(job_id):
     warning = None
     severity = 'info'
     
-    if actual_quantity > scheduled_qty:
-        if variance_percentage > 10:
-            warning = f'Over-production: {variance} units ({variance_percentage}% excess)'
-            severity = 'warning'
-        else:
-            warning = f'Actual quantity exceeds scheduled by {variance} units'
-            severity = 'info'
+    with transaction():
+        if actual_quantity > scheduled_qty:
+            if variance_percentage > 10:
+                warning = f'Over-production: {variance} units ({variance_percentage}% excess)'
+                severity = 'warning'
+            else:
+                warning = f'Actual quantity exceeds scheduled by {variance} units'
+                severity = 'info'
         
-        execute_query(
-            """INSERT INTO audit_log (user_id, action, entity_type, entity_id, new_data)
-               VALUES (%s, 'OVER_PRODUCTION', 'job_schedule', %s, %s)""",
-            (user_id, job_id, f'{{"variance": {variance}, "percentage": {variance_percentage}}}'),
-            commit=True
-        )
-    elif actual_quantity < scheduled_qty:
-        if variance_percentage < -10:
-            warning = f'Under-production: {abs(variance)} units short ({abs(variance_percentage)}% deficit)'
-            severity = 'error'
-        else:
-            warning = f'Job incomplete - {abs(variance)} units short'
-            severity = 'warning'
+            execute_query(
+                """INSERT INTO audit_log (user_id, action, entity_type, entity_id, new_data)
+                   VALUES (%s, 'OVER_PRODUCTION', 'job_schedule', %s, %s)""",
+                (user_id, job_id, f'{{"variance": {variance}, "percentage": {variance_percentage}}}'),
+                commit=True
+            )
+        elif actual_quantity < scheduled_qty:
+            if variance_percentage < -10:
+                warning = f'Under-production: {abs(variance)} units short ({abs(variance_percentage)}% deficit)'
+                severity = 'error'
+            else:
+                warning = f'Job incomplete - {abs(variance)} units short'
+                severity = 'warning'
+        
+            execute_query(
+                """INSERT INTO audit_log (user_id, action, entity_type, entity_id, new_data)
+                   VALUES (%s, 'UNDER_PRODUCTION', 'job_schedule', %s, %s)""",
+                (user_id, job_id, f'{{"variance": {variance}, "percentage": {variance_percentage}}}'),
+                commit=True
+            )
         
         execute_query(
-            """INSERT INTO audit_log (user_id, action, entity_type, entity_id, new_data)
-               VALUES (%s, 'UNDER_PRODUCTION', 'job_schedule', %s, %s)""",
-            (user_id, job_id, f'{{"variance": {variance}, "percentage": {variance_percentage}}}'),
+            """UPDATE job_schedules 
+               SET status = 'completed', completed_at = %s, actual_quantity = %s, notes = %s
+               WHERE id = %s""",
+            (datetime.now(), actual_quantity, data.get('notes'), job_id),
             commit=True
         )
+        
+        if job['machine_id']:
+            execute_query(
+                "UPDATE machines SET status = 'available' WHERE id = %s",
+                (job['machine_id'],),
+                commit=True
+            )
+        
+        log_audit(user_id, 'COMPLETE_JOB', 'job_schedule', job_id, None, data)
     
-    execute_query(
-        """UPDATE job_schedules 
-           SET status = 'completed', completed_at = %s, actual_quantity = %s, notes = %s
-           WHERE id = %s""",
-        (datetime.now(), actual_quantity, data.get('notes'), job_id),
-        commit=True
-    )
-    
+    invalidate_table('job_schedules', job['department_id'])
     if job['machine_id']:
-        execute_query(
-            "UPDATE machines SET status = 'available' WHERE id = %s",
-            (job['machine_id'],),
-            commit=True
-        )
-    
-    log_audit(user_id, 'COMPLETE_JOB', 'job_schedule', job_id, None, data)
+        invalidate_reference('machines')
     
     response_data = {
         'message': 'Job completed successfully',
@@ -239,11 +244,7 @@ def add_manual_job():
     if not order_number:
         return error_response('Order number is required', 400)
     
-    employee = execute_query(
-        "SELECT id, department_id FROM employees WHERE user_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    employee = current_context.employee
     
     if not employee:
         return error_response('Employee not found', 404)
@@ -271,6 +272,7 @@ def add_manual_job():
              order['quantity'], employee['id']),
             commit=True
         )
+        invalidate_table('job_schedules', employee['department_id'])
         
         log_audit(user_id, 'ADD_MANUAL_JOB', 'job_schedule', job_id, None, data)
         
@@ -11,7 +11,9 @@ from io import BytesIO
 from backend.utils.auth import auth_required, require_permission
 from backend.utils.logger import logger
 from backend.utils.response import success_response, error_response
-from backend.config.database import get_db_connection
+from backend.config.db_pool import get_db_connection, return_db_connection
+from backend.utils.reference_cache import invalidate_reference
+from backend.utils.result_cache import invalidate_table
 
 order_import_bp = Blueprint('order_import', __name__, url_prefix='/api/orders/import')
 
@@ -101,13 +103,13 @@ def import_orders():
             return error_response('No data rows found in file', 400)
         
         data_rows = rows[1:]
-        db = get_db_connection()
-        cursor = db.cursor()
-        
         imported_count = 0
         error_details = []
         
+        db = get_db_connection()
+        cursor = None
         try:
+            cursor = db.cursor()
             for idx, row in enumerate(data_rows, start=2):
                 try:
                     order_data = map_excel_row_to_order(row, headers)
@@ -128,6 +130,10 @@ def import_orders():
                     })
             
             db.commit()
+            if imported_count:
+                invalidate_table('orders')
+            # New orders may have created products
+            invalidate_reference('products')
             
             return success_response({
                 'imported_count': imported_count,
@@ -141,8 +147,9 @@ def import_orders():
             raise e
         
         finally:
-            cursor.close()
-            db.close()
+            if cursor is not None:
+                cursor.close()
+            return_db_connection(db)
     
     except Exception as e:
         logger.error(f"Error importing orders: {str(e)}")
@@ -1,23 +1,44 @@
 from flask import Blueprint, request
-from backend.config.database import execute_query
+from backend.config.database import execute_query, execute_many, execute_stream, bulk_insert, transaction
 from backend.utils.auth import token_required, permission_required
-from backend.utils.response import success_response, error_response
+from backend.utils.response import (
+    success_response, error_response, paginated_response, cacheable_response, not_modified, streamed_response
+)
+from backend.utils.pagination import get_keyset_page
+from backend.utils.fieldsets import get_fieldset
 from backend.utils.audit import log_audit
+from backend.utils.reference_cache import attach_names, reference_version
+from backend.utils.result_cache import invalidate_table
 import pandas as pd
 from datetime import datetime
 
 orders_bp = Blueprint('orders', __name__, url_prefix='/api/orders')
 
+ORDER_NAMES = [('products', 'product_id', 'product_name')]
+
+# ?fields= whitelist for the order listing
+ORDER_FIELDS = {
+    column: f'o.{column}' for column in (
+        'id', 'order_number', 'sales_order_number', 'customer_name', 'product_id',
+        'quantity', 'order_value', 'start_date', 'end_date', 'priority', 'status',
+        'hold_reason', 'notes', 'config', 'created_at', 'updated_at'
+    )
+}
+
 @orders_bp.route('', methods=['GET'])
 @token_required
 def get_orders():
     status = request.args.get('status')
     customer = request.args.get('customer')
-    
-    query = """
-        SELECT o.*, p.product_name
+    fields = get_fieldset(ORDER_FIELDS, 'o.*', names=ORDER_NAMES)
+    page = get_keyset_page({'created_at': 'o.created_at'})
+    if page is not None:
+        # The next cursor is built from the sort key and id of the last row
+        fields.require(*page.keys, 'id')
+    
+    query = f"""
+        SELECT {fields.select()}
         FROM orders o
-        LEFT JOIN products p ON o.product_id = p.id
         WHERE 1=1
     """
     
@@ -30,40 +51,62 @@ def get_orders():
         query += " AND o.customer_name LIKE %s"
         params.append(f'%{customer}%')
     
+    if page is not None:
+        query, params = page.apply(query, params, 'o.id')
+        orders = page.finish(execute_query(query, params, fetch_all=True))
+        return paginated_response(fields.apply(orders), page)
+    
     query += " ORDER BY o.created_at DESC"
     
-    orders = execute_query(query, tuple(params) if params else None, fetch_all=True)
-    return success_response(orders)
+    # The unpaginated listing can run to megabytes: stream it
+    orders = execute_stream(query, tuple(params) if params else None)
+    return streamed_response(orders, fields.prepare())
 
 @orders_bp.route('/<int:id>', methods=['GET'])
 @token_required
 def get_order(id):
-    query = """
-        SELECT o.*, p.product_name
-        FROM orders o
-        LEFT JOIN products p ON o.product_id = p.id
-        WHERE o.id = %s
-    """
-    order = execute_query(query, (id,), fetch_one=True)
+    # Polled by planning screens: answer 304 from the order and schedule
+    # timestamps before loading either
+    version = execute_query(
+        """SELECT o.updated_at,
+                  (SELECT COUNT(*) FROM job_schedules WHERE order_id = o.id) as schedule_count,
+                  (SELECT MAX(updated_at) FROM job_schedules WHERE order_id = o.id) as schedules_updated_at
+           FROM orders o WHERE o.id = %s""",
+        (id,),
+        fetch_one=True
+    )
+    if not version:
+        return error_response('Order not found', 404)
+    version = (
+        version['updated_at'], version['schedule_count'], version['schedules_updated_at'],
+        reference_version('products', 'departments', 'production_stages', 'machines', 'employees')
+    )
+    unchanged = not_modified(version)
+    if unchanged:
+        return unchanged
+    
+    order = execute_query("SELECT o.* FROM orders o WHERE o.id = %s", (id,), fetch_one=True)
     
     if not order:
         return error_response('Order not found', 404)
+    attach_names([order], ORDER_NAMES)
     
     schedules_query = """
-        SELECT js.*, d.name as department_name, ps.stage_name,
-               m.machine_name, CONCAT(e.first_name, ' ', e.last_name) as employee_name
+        SELECT js.*
         FROM job_schedules js
-        LEFT JOIN departments d ON js.department_id = d.id
-        LEFT JOIN production_stages ps ON js.stage_id = ps.id
-        LEFT JOIN machines m ON js.machine_id = m.id
-        LEFT JOIN employees e ON js.assigned_employee_id = e.id
         WHERE js.order_id = %s
-        ORDER BY js.scheduled_date, d.name
+        ORDER BY js.scheduled_date
     """
-    schedules = execute_query(schedules_query, (id,), fetch_all=True)
+    schedules = attach_names(execute_query(schedules_query, (id,), fetch_all=True), [
+        ('departments', 'department_id', 'department_name'),
+        ('production_stages', 'stage_id', 'stage_name'),
+        ('machines', 'machine_id', 'machine_name'),
+        ('employees', 'assigned_employee_id', 'employee_name')
+    ])
+    schedules.sort(key=lambda s: (s['scheduled_date'], (s['department_name'] or '').lower()))
     order['schedules'] = schedules
     
-    return success_response(order)
+    return cacheable_response(order, version=version)
 
 @orders_bp.route('', methods=['POST'])
 @token_required
@@ -104,6 +147,7 @@ def create_order():
             commit=True
         )
         
+        invalidate_table('orders')
         log_audit(user_id, 'CREATE', 'order', order_id, None, data)
         
         return success_response({'id': order_id}, 'Order created successfully', 201)
@@ -152,6 +196,7 @@ def update_order(id):
             commit=True
         )
         
+        invalidate_table('orders')
         log_audit(user_id, 'UPDATE', 'order', id, old_data, data)
         
         return success_response(message='Order updated successfully')
@@ -214,39 +259,50 @@ def import_orders():
         imported_count = 0
         failed_rows = []
         
+        columns = ['order_number', 'sales_order_number', 'customer_name', 'product_id',
+                   'quantity', 'order_value', 'start_date', 'end_date', 'priority', 'status']
+        rows = []
         for idx, row in df.iterrows():
-            try:
-                order_data = {}
-                for db_field, excel_col in mapping.items():
-                    if excel_col and excel_col in df.columns:
-                        order_data[db_field] = row.get(excel_col)
-                
-                query = """
-                    INSERT INTO orders
-                    (order_number, sales_order_number, customer_name, product_id,
-                     quantity, order_value, start_date, end_date, priority, status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'unscheduled')
-                """
-                
-                execute_query(
-                    query,
-                    (
-                        order_data.get('order_number'),
-                        order_data.get('sales_order_number'),
-                        order_data.get('customer_name'),
-                        order_data.get('product_id'),
-                        order_data.get('quantity'),
-                        order_data.get('order_value'),
-                        order_data.get('start_date'),
-                        order_data.get('end_date'),
-                        order_data.get('priority', 'normal')
-                    ),
-                    commit=True
-                )
-                imported_count += 1
-            except Exception as row_error:
-                failed_rows.append({'row': idx + 1, 'error': str(row_error)})
-        
+            order_data = {}
+            for db_field, excel_col in mapping.items():
+                if excel_col and excel_col in df.columns:
+                    order_data[db_field] = row.get(excel_col)
+            
+            rows.append((idx, (
+                order_data.get('order_number'),
+                order_data.get('sales_order_number'),
+                order_data.get('customer_name'),
+                order_data.get('product_id'),
+                order_data.get('quantity'),
+                order_data.get('order_value'),
+                order_data.get('start_date'),
+                order_data.get('end_date'),
+                order_data.get('priority', 'normal'),
+                'unscheduled'
+            )))
+        
+        try:
+            # All-or-nothing fast path: multi-row INSERTs in one transaction
+            with transaction():
+                result = bulk_insert('orders', columns, [values for _, values in rows])
+            imported_count = result['rows']
+        except Exception:
+            # Some row is bad; insert one at a time to report which
+            query = """
+                INSERT INTO orders
+                (order_number, sales_order_number, customer_name, product_id,
+                 quantity, order_value, start_date, end_date, priority, status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            for idx, values in rows:
+                try:
+                    execute_query(query, values, commit=True)
+                    imported_count += 1
+                except Exception as row_error:
+                    failed_rows.append({'row': idx + 1, 'error': str(row_error)})
+        
+        if imported_count:
+            invalidate_table('orders')
         log_audit(user_id, 'IMPORT', 'orders', None, None, {
             'count': imported_count,
             'failed': len(failed_rows)
@@ -324,28 +380,31 @@ def schedule_order(id):
     """
     
     try:
-        schedule_id = execute_query(
-            query,
-            (
-                id,
-                data['department_id'],
-                data.get('stage_id'),
-                data['scheduled_date'],
-                data['scheduled_quantity'],
-                data.get('machine_id'),
-                data.get('assigned_employee_id')
-            ),
-            commit=True
-        )
-        
-        execute_query(
-            "UPDATE orders SET status = 'scheduled' WHERE id = %s",
-            (id,),
-            commit=True
-        )
-        
-        log_audit(user_id, 'SCHEDULE', 'order', id, None, data)
+        with transaction():
+            schedule_id = execute_query(
+                query,
+                (
+                    id,
+                    data['department_id'],
+                    data.get('stage_id'),
+                    data['scheduled_date'],
+                    data['scheduled_quantity'],
+                    data.get('machine_id'),
+                    data.get('assigned_employee_id')
+                ),
+                commit=True
+            )
+            
+            execute_query(
+                "UPDATE orders SET status = 'scheduled' WHERE id = %s",
+                (id,),
+                commit=True
+            )
+            
+            log_audit(user_id, 'SCHEDULE', 'order', id, None, data)
         
+        invalidate_table('job_schedules', data['department_id'])
+        invalidate_table('orders')
         return success_response({'id': schedule_id}, 'Order scheduled successfully', 201)
     except Exception as e:
         return error_response(str(e), 500)
@@ -367,6 +426,7 @@ def hold_order(id):
         commit=True
     )
     
+    invalidate_table('orders')
     log_audit(user_id, 'HOLD', 'order', id, None, {'hold_reason': hold_reason})
     
     return success_response(message='Order placed on hold')
@@ -407,21 +467,26 @@ def suggest_alternative_orders():
     
     suggestions = execute_query(query, tuple(params) if params else None, fetch_all=True)
     
+    # Capacity depends only on the requested department and date, so look it up once
+    dept_query = """
+        SELECT d.id, d.name, d.capacity_target,
+               COALESCE(SUM(CASE WHEN js.status IN ('scheduled', 'in_progress') 
+               THEN js.scheduled_quantity ELSE 0 END), 0) as current_load
+        FROM departments d
+        LEFT JOIN job_schedules js ON d.id = js.department_id 
+            AND js.scheduled_date = %s
+        WHERE d.id = %s
+        GROUP BY d.id
+    """
+    dept_info = execute_query(dept_query, (scheduled_date, department_id), fetch_one=True)
+    
+    if dept_info:
+        available_capacity = (dept_info.get('capacity_target') or 1000) - dept_info['current_load']
+    else:
+        available_capacity = None
+    
     for suggestion in suggestions:
-        dept_query = """
-            SELECT d.id, d.name, d.capacity_target,
-                   COALESCE(SUM(CASE WHEN js.status IN ('scheduled', 'in_progress') 
-                   THEN js.scheduled_quantity ELSE 0 END), 0) as current_load
-            FROM departments d
-            LEFT JOIN job_schedules js ON d.id = js.department_id 
-                AND js.scheduled_date = %s
-            WHERE d.id = %s
-            GROUP BY d.id
-        """
-        dept_info = execute_query(dept_query, (scheduled_date, department_id), fetch_one=True)
-        
-        if dept_info:
-            available_capacity = (dept_info.get('capacity_target') or 1000) - dept_info['current_load']
+        if available_capacity is not None:
             suggestion['fits_capacity'] = suggestion['quantity'] <= available_capacity
             suggestion['available_capacity'] = available_capacity
         else:
@@ -437,14 +502,16 @@ def suggest_alternative_orders():
 @token_required
 def get_order_items(id):
     query = """
-        SELECT oi.*, p.product_name, p.product_code
+        SELECT oi.*
         FROM order_items oi
-        LEFT JOIN products p ON oi.product_id = p.id
         WHERE oi.order_id = %s
         ORDER BY oi.item_sequence
     """
     items = execute_query(query, (id,), fetch_all=True)
-    return success_response(items)
+    return success_response(attach_names(items, [
+        ('products', 'product_id', 'product_name'),
+        ('products', 'product_id', 'product_code', 'product_code')
+    ]))
 
 @orders_bp.route('/<int:id>/items', methods=['POST'])
 @token_required
@@ -484,6 +551,7 @@ def add_order_item(id):
             commit=True
         )
         
+        invalidate_table('orders')
         log_audit(user_id, 'CREATE', 'order_item', item_id, None, data)
         
         return success_response({'id': item_id}, 'Order item added successfully', 201)
@@ -525,6 +593,7 @@ def update_order_item(order_id, item_id):
             commit=True
         )
         
+        invalidate_table('orders')
         log_audit(user_id, 'UPDATE', 'order_item', item_id, old_data, data)
         
         return success_response(message='Order item updated successfully')
@@ -548,6 +617,7 @@ def delete_order_item(order_id, item_id):
     
     try:
         execute_query("DELETE FROM order_items WHERE id = %s", (item_id,), commit=True)
+        invalidate_table('orders')
         log_audit(user_id, 'DELETE', 'order_item', item_id, old_data, None)
         
         return success_response(message='Order item deleted successfully')
@@ -632,18 +702,18 @@ def get_order_suggestions(id):
 @token_required
 def get_order_production_path(id):
     query = """
-        SELECT opp.*, d.name as department_name, ps.stage_name,
-               CONCAT(u.first_name, ' ', u.last_name) as created_by_name
+        SELECT opp.*
         FROM order_production_paths opp
-        LEFT JOIN departments d ON opp.department_id = d.id
-        LEFT JOIN production_stages ps ON opp.stage_id = ps.id
-        LEFT JOIN users u ON opp.created_by_id = u.id
         WHERE opp.order_id = %s
         ORDER BY opp.path_sequence
     """
     
     paths = execute_query(query, (id,), fetch_all=True)
-    return success_response(paths)
+    return success_response(attach_names(paths, [
+        ('departments', 'department_id', 'department_name'),
+        ('production_stages', 'stage_id', 'stage_name'),
+        ('users', 'created_by_id', 'created_by_name')
+    ]))
 
 @orders_bp.route('/<int:id>/production-path', methods=['POST'])
 @token_required
@@ -656,36 +726,39 @@ def set_order_production_path(id):
     if not paths:
         return error_response('At least one production path is required', 400)
     
+    for idx, path in enumerate(paths):
+        if not path.get('department_id'):
+            return error_response(f'department_id is required for path {idx + 1}', 400)
+    
+    query = """
+        INSERT INTO order_production_paths
+        (order_id, path_sequence, department_id, stage_id, 
+         estimated_duration_minutes, is_required, notes, created_by_id)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    
     try:
-        execute_query("DELETE FROM order_production_paths WHERE order_id = %s", (id,), commit=True)
-        
-        for idx, path in enumerate(paths):
-            if not path.get('department_id'):
-                return error_response(f'department_id is required for path {idx + 1}', 400)
-            
-            query = """
-                INSERT INTO order_production_paths
-                (order_id, path_sequence, department_id, stage_id, 
-                 estimated_duration_minutes, is_required, notes, created_by_id)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """
+        with transaction():
+            execute_query("DELETE FROM order_production_paths WHERE order_id = %s", (id,), commit=True)
             
-            execute_query(
+            execute_many(
                 query,
-                (
-                    id,
-                    idx + 1,
-                    path['department_id'],
-                    path.get('stage_id'),
-                    path.get('estimated_duration_minutes'),
-                    path.get('is_required', True),
-                    path.get('notes'),
-                    user_id
-                ),
-                commit=True
+                [
+                    (
+                        id,
+                        idx + 1,
+                        path['department_id'],
+                        path.get('stage_id'),
+                        path.get('estimated_duration_minutes'),
+                        path.get('is_required', True),
+                        path.get('notes'),
+                        user_id
+                    )
+                    for idx, path in enumerate(paths)
+                ]
             )
-        
-        log_audit(user_id, 'SET_PRODUCTION_PATH', 'order', id, None, {'paths_count': len(paths)})
+            
+            log_audit(user_id, 'SET_PRODUCTION_PATH', 'order', id, None, {'paths_count': len(paths)})
         
         return success_response(message=f'Production path set with {len(paths)} stages')
     except Exception as e:
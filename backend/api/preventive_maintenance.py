@@ -1,6 +1,8 @@
 from flask import Blueprint, request
 from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
+from backend.utils.request_context import current_context
+from backend.utils.reference_cache import invalidate_reference
 from backend.utils.response import success_response, error_response
 from backend.utils.audit import log_audit
 from backend.utils.notifications import create_notification
@@ -226,11 +228,7 @@ def log_preventive_maintenance(schedule_id):
     data = request.get_json()
     user_id = request.current_user['user_id']
     
-    employee = execute_query(
-        "SELECT id FROM employees WHERE user_id = %s",
-        (user_id,),
-        fetch_one=True
-    )
+    employee = current_context.employee
     
     if not employee:
         return error_response('Employee not found', 404)
@@ -288,6 +286,7 @@ def log_preventive_maintenance(schedule_id):
                     (schedule['machine_id'],),
                     commit=True
                 )
+                invalidate_reference('machines')
         
         log_audit(user_id, 'LOG_PM', 'preventive_schedule', schedule_id, None, data)
         
@@ -332,6 +331,7 @@ def start_preventive_maintenance(schedule_id):
             (schedule['machine_id'],),
             commit=True
         )
+        invalidate_reference('machines')
         
         log_audit(user_id, 'START_PM', 'preventive_schedule', schedule_id, None, {'machine_id': schedule['machine_id']})
         
@@ -3,6 +3,7 @@ from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
 from backend.utils.response import success_response, error_response
 from backend.utils.audit import log_audit
+from backend.utils.reference_cache import invalidate_reference
 
 products_bp = Blueprint('products', __name__, url_prefix='/api/products')
 
@@ -69,6 +70,7 @@ def create_product():
             commit=True
         )
         
+        invalidate_reference('products')
         log_audit(user_id, 'CREATE', 'product', product_id, None, data)
         
         return success_response({'id': product_id}, 'Product created successfully', 201)
@@ -107,6 +109,7 @@ def update_product(id):
             commit=True
         )
         
+        invalidate_reference('products')
         log_audit(user_id, 'UPDATE', 'product', id, old_data, data)
         
         return success_response(message='Product updated successfully')
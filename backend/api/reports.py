@@ -3,6 +3,8 @@ from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
 from backend.utils.response import success_response, error_response
 from backend.utils.audit import log_audit
+from backend.config.query_governor import query_class
+from backend.utils.result_cache import cached_result
 from backend.utils.report_generator import execute_scheduled_report
 from backend.utils.email_sender import send_email
 from datetime import datetime, timedelta
@@ -305,6 +307,7 @@ def get_report_templates():
 
 @reports_bp.route('/defects/summary', methods=['GET'])
 @token_required
+@cached_result(('replacement_tickets', 'department_id'), 'departments')
 def defects_summary():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
@@ -341,6 +344,7 @@ def defects_summary():
 
 @reports_bp.route('/production/summary', methods=['GET'])
 @token_required
+@cached_result(('job_schedules', 'department_id'), 'departments')
 def production_summary():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
@@ -379,6 +383,8 @@ def production_summary():
 
 @reports_bp.route('/maintenance/summary', methods=['GET'])
 @token_required
+@query_class('analytics')
+@cached_result('maintenance_tickets', 'machines', 'departments')
 def maintenance_summary():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
@@ -414,6 +420,7 @@ def maintenance_summary():
 
 @reports_bp.route('/sop/summary', methods=['GET'])
 @token_required
+@cached_result('sop_failure_tickets', 'departments')
 def sop_summary():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
@@ -1,13 +1,23 @@
 from flask import Blueprint, request
 from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
-from backend.utils.response import success_response, error_response
+from backend.utils.response import success_response, error_response, paginated_response
+from backend.utils.pagination import get_keyset_page
 from backend.utils.audit import log_audit
+from backend.utils.reference_cache import attach_names
+from backend.utils.result_cache import invalidate_table
 from backend.utils.notifications import create_notification
 from datetime import datetime
 
 sop_bp = Blueprint('sop', __name__, url_prefix='/api/sop')
 
+SOP_TICKET_NAMES = [
+    ('departments', 'charging_department_id', 'charging_department_name'),
+    ('departments', 'charged_department_id', 'charged_department_name'),
+    ('users', 'created_by_id', 'created_by_name')
+]
+SOP_TICKET_LIST_NAMES = SOP_TICKET_NAMES + [('users', 'assigned_to_id', 'assigned_to_name')]
+
 @sop_bp.route('/tickets', methods=['GET'])
 @token_required
 def get_sop_tickets():
@@ -15,16 +25,8 @@ def get_sop_tickets():
     department_id = request.args.get('department_id')
     
     query = """
-        SELECT st.*,
-               charging_dept.name as charging_department_name,
-               charged_dept.name as charged_department_name,
-               CONCAT(created.first_name, ' ', created.last_name) as created_by_name,
-               CONCAT(assigned.first_name, ' ', assigned.last_name) as assigned_to_name
+        SELECT st.*
         FROM sop_failure_tickets st
-        LEFT JOIN departments charging_dept ON st.charging_department_id = charging_dept.id
-        LEFT JOIN departments charged_dept ON st.charged_department_id = charged_dept.id
-        LEFT JOIN users created ON st.created_by_id = created.id
-        LEFT JOIN users assigned ON st.assigned_to_id = assigned.id
         WHERE 1=1
     """
     
@@ -37,40 +39,32 @@ def get_sop_tickets():
         query += " AND (st.charging_department_id = %s OR st.charged_department_id = %s)"
         params.extend([department_id, department_id])
     
+    page = get_keyset_page({'created_at': 'st.created_at'})
+    if page is not None:
+        query, params = page.apply(query, params, 'st.id')
+        tickets = page.finish(execute_query(query, params, fetch_all=True))
+        return paginated_response(attach_names(tickets, SOP_TICKET_LIST_NAMES), page)
+    
     query += " ORDER BY st.created_at DESC"
     
     tickets = execute_query(query, tuple(params) if params else None, fetch_all=True)
-    return success_response(tickets)
+    return success_response(attach_names(tickets, SOP_TICKET_LIST_NAMES))
 
 @sop_bp.route('/tickets/<int:id>', methods=['GET'])
 @token_required
 def get_sop_ticket(id):
-    query = """
-        SELECT st.*,
-               charging_dept.name as charging_department_name,
-               charged_dept.name as charged_department_name,
-               CONCAT(created.first_name, ' ', created.last_name) as created_by_name
-        FROM sop_failure_tickets st
-        LEFT JOIN departments charging_dept ON st.charging_department_id = charging_dept.id
-        LEFT JOIN departments charged_dept ON st.charged_department_id = charged_dept.id
-        LEFT JOIN users created ON st.created_by_id = created.id
-        WHERE st.id = %s
-    """
-    ticket = execute_query(query, (id,), fetch_one=True)
+    ticket = execute_query("SELECT st.* FROM sop_failure_tickets st WHERE st.id = %s", (id,), fetch_one=True)
     
     if not ticket:
         return error_response('SOP ticket not found', 404)
-    
-    ncr_query = """
-        SELECT ncr.*,
-               CONCAT(responsible.first_name, ' ', responsible.last_name) as responsible_person_name,
-               CONCAT(completed.first_name, ' ', completed.last_name) as completed_by_name
-        FROM ncr_reports ncr
-        LEFT JOIN users responsible ON ncr.responsible_person_id = responsible.id
-        LEFT JOIN users completed ON ncr.completed_by_id = completed.id
-        WHERE ncr.sop_ticket_id = %s
-    """
-    ncr = execute_query(ncr_query, (id,), fetch_one=True)
+    attach_names([ticket], SOP_TICKET_NAMES)
+    
+    ncr = execute_query("SELECT ncr.* FROM ncr_reports ncr WHERE ncr.sop_ticket_id = %s", (id,), fetch_one=True)
+    if ncr:
+        attach_names([ncr], [
+            ('users', 'responsible_person_id', 'responsible_person_name'),
+            ('users', 'completed_by_id', 'completed_by_name')
+        ])
     ticket['ncr'] = ncr
     
     return success_response(ticket)
@@ -132,6 +126,7 @@ def create_sop_ticket():
                 'high'
             )
         
+        invalidate_table('sop_failure_tickets', data['charged_department_id'])
         log_audit(user_id, 'CREATE', 'sop_ticket', ticket_id, None, data)
         
         return success_response({'id': ticket_id, 'ticket_number': ticket_number},
@@ -185,6 +180,7 @@ def reassign_sop_ticket(id):
             priority='high'
         )
     
+    invalidate_table('sop_failure_tickets')
     log_audit(user_id, 'REASSIGN', 'sop_ticket', id, None, {'new_department_id': new_dept_id, 'reason': reason})
     
     return success_response(message='SOP ticket reassigned successfully')
@@ -207,6 +203,7 @@ def reject_sop_ticket(id):
         commit=True
     )
     
+    invalidate_table('sop_failure_tickets')
     log_audit(user_id, 'REJECT', 'sop_ticket', id, None, {'reason': reason})
     
     return success_response(message='SOP ticket rejected and escalated to HOD')
@@ -252,6 +249,7 @@ def create_ncr(id):
             commit=True
         )
         
+        invalidate_table('sop_failure_tickets')
         log_audit(user_id, 'CREATE_NCR', 'sop_ticket', id, None, data)
         
         return success_response({'id': ncr_id}, 'NCR completed and ticket closed', 201)
@@ -363,6 +361,7 @@ def hod_decision(id):
             
             message = 'HOD closed ticket'
         
+        invalidate_table('sop_failure_tickets')
         log_audit(user_id, 'HOD_DECISION', 'sop_ticket', id, ticket, {
             'decision': decision,
             'final_department_id': final_department_id,
@@ -381,37 +380,25 @@ def hod_decision(id):
 def get_escalated_tickets():
     """Get all tickets escalated to HOD for decision"""
     query = """
-        SELECT st.*,
-               charging_dept.name as charging_department_name,
-               charged_dept.name as charged_department_name,
-               original_dept.name as original_charged_department_name,
-               CONCAT(created.first_name, ' ', created.last_name) as created_by_name
+        SELECT st.*
         FROM sop_failure_tickets st
-        LEFT JOIN departments charging_dept ON st.charging_department_id = charging_dept.id
-        LEFT JOIN departments charged_dept ON st.charged_department_id = charged_dept.id
-        LEFT JOIN departments original_dept ON st.original_charged_department_id = original_dept.id
-        LEFT JOIN users created ON st.created_by_id = created.id
         WHERE st.escalated_to_hod = TRUE
         AND st.status IN ('rejected', 'escalated')
         ORDER BY st.created_at DESC
     """
     
     tickets = execute_query(query, fetch_all=True)
-    return success_response(tickets)
+    return success_response(attach_names(tickets, SOP_TICKET_NAMES + [
+        ('departments', 'original_charged_department_id', 'original_charged_department_name')
+    ]))
 
 @sop_bp.route('/sla-dashboard', methods=['GET'])
 @token_required
 def get_sla_dashboard():
     at_risk_tickets = execute_query(
         """SELECT st.*, 
-                  TIMESTAMPDIFF(HOUR, st.created_at, NOW()) as hours_open,
-                  charging_dept.name as charging_department_name,
-                  charged_dept.name as charged_department_name,
-                  CONCAT(created.first_name, ' ', created.last_name) as created_by_name
+                  TIMESTAMPDIFF(HOUR, st.created_at, NOW()) as hours_open
            FROM sop_failure_tickets st
-           LEFT JOIN departments charging_dept ON st.charging_department_id = charging_dept.id
-           LEFT JOIN departments charged_dept ON st.charged_department_id = charged_dept.id
-           LEFT JOIN users created ON st.created_by_id = created.id
            WHERE st.status IN ('open', 'ncr_in_progress')
            AND st.escalated_to_hod = FALSE
            AND TIMESTAMPDIFF(HOUR, st.created_at, NOW()) >= 36
@@ -421,14 +408,8 @@ def get_sla_dashboard():
     
     escalated_tickets = execute_query(
         """SELECT st.*, 
-                  TIMESTAMPDIFF(HOUR, st.created_at, NOW()) as hours_open,
-                  charging_dept.name as charging_department_name,
-                  charged_dept.name as charged_department_name,
-                  CONCAT(created.first_name, ' ', created.last_name) as created_by_name
+                  TIMESTAMPDIFF(HOUR, st.created_at, NOW()) as hours_open
            FROM sop_failure_tickets st
-           LEFT JOIN departments charging_dept ON st.charging_department_id = charging_dept.id
-           LEFT JOIN departments charged_dept ON st.charged_department_id = charged_dept.id
-           LEFT JOIN users created ON st.created_by_id = created.id
            WHERE st.escalated_to_hod = TRUE
            AND st.status IN ('escalated', 'rejected')
            ORDER BY st.created_at DESC
@@ -436,6 +417,9 @@ def get_sla_dashboard():
         fetch_all=True
     )
     
+    attach_names(at_risk_tickets, SOP_TICKET_NAMES)
+    attach_names(escalated_tickets, SOP_TICKET_NAMES)
+    
     summary = {
         'at_risk_count': len(at_risk_tickets),
         'escalated_count': len(escalated_tickets),
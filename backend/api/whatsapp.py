@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from backend.utils.logger import app_logger
 from backend.utils.whatsapp_service import whatsapp_service
 from backend.utils.whatsapp_flow_handler import flow_handler
+from backend.utils.response import streamed_response
+from backend.config.database import execute_stream
 import json
 from threading import Thread
 
@@ -267,31 +269,38 @@ def test_send_menu():
 @whatsapp_bp.route('/sessions', methods=['GET'])
 def get_sessions():
     try:
-        from backend.config.db_pool import get_db_connection
+        from backend.config.database import execute_query
+        from backend.utils.pagination import get_keyset_page
+        from backend.utils.response import paginated_response
+        from backend.utils.error_handler import ValidationError
         
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
+        query = """
             SELECT ws.*, e.first_name, e.last_name, e.employee_number
             FROM whatsapp_sessions ws
             LEFT JOIN employees e ON ws.employee_id = e.id
-            WHERE ws.expires_at > NOW() OR ws.expires_at IS NULL
-            ORDER BY ws.last_message_at DESC
-            LIMIT 50
-        """)
+            WHERE (ws.expires_at > NOW() OR ws.expires_at IS NULL)
+        """
         
-        sessions = cursor.fetchall()
+        page = get_keyset_page(
+            {'last_message_at': 'ws.last_message_at', 'created_at': 'ws.created_at'},
+            default_sort='last_message_at'
+        )
+        if page is not None:
+            query, params = page.apply(query, [], 'ws.id')
+            sessions = page.finish(execute_query(query, params, fetch_all=True))
+        else:
+            sessions = execute_query(query + " ORDER BY ws.last_message_at DESC LIMIT 50", fetch_all=True)
         
         for session in sessions:
             if session.get('context_data'):
                 session['context_data'] = json.loads(session['context_data']) if isinstance(session['context_data'], str) else session['context_data']
         
-        cursor.close()
-        conn.close()
-        
+        if page is not None:
+            return paginated_response(sessions, page)
         return jsonify(sessions), 200
         
+    except ValidationError:
+        raise
     except Exception as e:
         app_logger.error(f"Error fetching sessions: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -299,10 +308,7 @@ def get_sessions():
 @whatsapp_bp.route('/interactions', methods=['GET'])
 def get_interactions():
     try:
-        from backend.config.db_pool import get_db_connection
-        
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+        from backend.config.db_pool import get_db_cursor
         
         limit = request.args.get('limit', 50, type=int)
         interaction_type = request.args.get('type')
@@ -321,9 +327,9 @@ def get_interactions():
         query += " ORDER BY wi.created_at DESC LIMIT %s"
         params.append(limit)
         
-        cursor.execute(query, params)
-        
-        interactions = cursor.fetchall()
+        with get_db_cursor() as cursor:
+            cursor.execute(query, params)
+            interactions = cursor.fetchall()
         
         for interaction in interactions:
             if interaction.get('request_data'):
@@ -331,42 +337,30 @@ def get_interactions():
             if interaction.get('response_data'):
                 interaction['response_data'] = json.loads(interaction['response_data']) if isinstance(interaction['response_data'], str) else interaction['response_data']
         
-        cursor.close()
-        conn.close()
-        
         return jsonify(interactions), 200
         
     except Exception as e:
         app_logger.error(f"Error fetching interactions: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def _decode_payload(message):
+    if message.get('payload') and isinstance(message['payload'], str):
+        message['payload'] = json.loads(message['payload'])
+    return message
+
 @whatsapp_bp.route('/messages/<phone>', methods=['GET'])
 def get_messages_by_phone(phone: str):
     try:
-        from backend.config.db_pool import get_db_connection
-        
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
         limit = request.args.get('limit', 50, type=int)
         
-        cursor.execute("""
+        messages = execute_stream("""
             SELECT * FROM whatsapp_messages
             WHERE phone_number = %s
             ORDER BY created_at DESC
             LIMIT %s
         """, (phone, limit))
         
-        messages = cursor.fetchall()
-        
-        for message in messages:
-            if message.get('payload'):
-                message['payload'] = json.loads(message['payload']) if isinstance(message['payload'], str) else message['payload']
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify(messages), 200
+        return streamed_response(messages, _decode_payload, envelope=False)
         
     except Exception as e:
         app_logger.error(f"Error fetching messages: {str(e)}")
@@ -1,7 +1,8 @@
 from flask import Blueprint, request
 from backend.config.database import execute_query
 from backend.utils.auth import token_required, permission_required
-from backend.utils.response import success_response, error_response
+from backend.utils.response import success_response, error_response, paginated_response
+from backend.utils.pagination import get_keyset_page
 from backend.utils.audit import log_audit
 import json
 
@@ -184,6 +185,12 @@ def get_workflow_instances():
         query += " AND wt.status = %s"
         params.append(status)
     
+    page = get_keyset_page({'started_at': 'wt.started_at'}, default_sort='started_at')
+    if page is not None:
+        query, params = page.apply(query, params, 'wt.id')
+        instances = page.finish(execute_query(query, params, fetch_all=True))
+        return paginated_response(instances, page)
+    
     query += " ORDER BY wt.started_at DESC"
     
     instances = execute_query(query, tuple(params) if params else None, fetch_all=True)
@@ -0,0 +1,112 @@
+"""
+Cross-worker cache invalidation over Redis pub/sub.
+
+In-process caches register a handler per topic with subscribe(). publish()
+runs the local handlers at once and broadcasts the message on one Redis
+channel; a background listener in every other worker runs their handlers
+when it arrives. Without Redis, publish() only reaches the current worker
+and the caches' TTLs bound staleness elsewhere.
+
+A message can be missed while the listener is reconnecting, so on every
+resubscribe each handler is called with None, meaning "drop everything".
+"""
+import os
+import json
+import time
+import socket
+from threading import Lock
+from backend.config.redis_config import get_redis
+from backend.config.gevent_mode import spawn_background
+from backend.utils.logger import app_logger
+
+CHANNEL = os.getenv('CACHE_INVALIDATION_CHANNEL', 'pms:cache-invalidate')
+RECONNECT_SECONDS = 5
+
+_handlers = {}
+_lock = Lock()
+_listener = None
+
+
+def subscribe(topic, handler):
+    """Call handler(data) whenever topic is published; data is None for a full flush"""
+    with _lock:
+        _handlers.setdefault(topic, []).append(handler)
+
+
+def _origin():
+    # Evaluated per call: workers forked from a preloaded app share import-time state
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _dispatch(topic, data):
+    with _lock:
+        handlers = list(_handlers.get(topic, ()))
+    for handler in handlers:
+        try:
+            handler(data)
+        except Exception as e:
+            app_logger.error(f"Cache invalidation handler for '{topic}' failed: {e}", exc_info=True)
+
+
+def _flush_all():
+    with _lock:
+        topics = list(_handlers)
+    for topic in topics:
+        _dispatch(topic, None)
+
+
+def publish(topic, data=None):
+    """Invalidate topic in this worker, then broadcast it to the others"""
+    _dispatch(topic, data)
+    if not os.getenv('REDIS_URL'):
+        return
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.publish(CHANNEL, json.dumps({'topic': topic, 'data': data, 'origin': _origin()}, default=str))
+    except Exception as e:
+        app_logger.warning(f"Cache invalidation broadcast for '{topic}' failed: {e}")
+
+
+def _listen():
+    first = True
+    while True:
+        client = get_redis()
+        if client is None:
+            return
+        pubsub = None
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANNEL)
+            if not first:
+                _flush_all()
+            first = False
+            for message in pubsub.listen():
+                if message.get('type') != 'message':
+                    continue
+                try:
+                    payload = json.loads(message['data'])
+                except (TypeError, ValueError):
+                    continue
+                if payload.get('origin') == _origin():
+                    continue
+                _dispatch(payload.get('topic'), payload.get('data'))
+        except Exception as e:
+            app_logger.warning(f"Cache invalidation listener disconnected: {e}; retrying in {RECONNECT_SECONDS}s")
+            first = False
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+        time.sleep(RECONNECT_SECONDS)
+
+
+def init_cache_bus():
+    """Start this worker's invalidation listener (no-op without REDIS_URL)"""
+    global _listener
+    if _listener is not None or not os.getenv('REDIS_URL'):
+        return
+    _listener = spawn_background(_listen, 'cache-invalidation-listener')
@@ -1,4 +1,6 @@
-from backend.config.db_pool import execute_query, execute_many, get_db_cursor
+from backend.config.db_pool import (
+    execute_query, execute_many, execute_stream, bulk_insert, bulk_upsert, get_db_cursor, transaction
+)
 from backend.utils.logger import db_logger
 
 db_logger.warning("database.py is deprecated. All imports now use db_pool.py")
@@ -9,4 +11,7 @@ def get_db():
     db_logger.warning("get_db() is deprecated. Use context manager get_db_cursor() instead")
     return get_db_connection()
 
-__all__ = ['execute_query', 'execute_many', 'get_db_cursor', 'get_db']
+__all__ = [
+    'execute_query', 'execute_many', 'execute_stream', 'bulk_insert', 'bulk_upsert',
+    'get_db_cursor', 'transaction', 'get_db'
+]
@@ -0,0 +1,120 @@
+"""
+MySQL driver selection for the connection pool.
+
+DB_DRIVER=auto (the default) uses mysqlclient (MySQLdb, a C extension that
+decodes rows several times faster) when it is installed and falls back to
+pure-Python pymysql otherwise; DB_DRIVER=pymysql or DB_DRIVER=mysqlclient
+forces one. In gevent mode auto means pymysql, whose pure-Python sockets
+gevent can make cooperative. Both give dict rows, lastrowid, and
+Decimal/datetime values, so callers of execute_query() and get_db_cursor()
+see no difference.
+
+Error, OperationalError, InterfaceError and IntegrityError are tuples
+covering every importable driver, for use in except clauses.
+"""
+import os
+import pymysql
+import pymysql.cursors
+from backend.config.gevent_mode import GEVENT_MODE
+from backend.utils.logger import db_logger
+
+try:
+    import MySQLdb
+    import MySQLdb.cursors
+    from MySQLdb.constants import FIELD_TYPE
+    from MySQLdb.converters import conversions as _mysqldb_conversions
+except ImportError:
+    MySQLdb = None
+
+
+class PyMySQLDriver:
+    name = 'pymysql'
+    DictCursor = pymysql.cursors.DictCursor
+    SSDictCursor = pymysql.cursors.SSDictCursor
+
+    def connect(self, config):
+        return pymysql.connect(**config)
+
+    def ping(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except pymysql.Error:
+            return False
+
+    def row_literal(self, cursor, template, row):
+        return cursor.mogrify(template, row)
+
+    def set_read_timeout(self, connection, seconds):
+        # pymysql applies _read_timeout to the socket before every read
+        connection._read_timeout = seconds
+
+
+class MySQLClientDriver:
+    name = 'mysqlclient'
+
+    def __init__(self):
+        self.DictCursor = MySQLdb.cursors.DictCursor
+        self.SSDictCursor = MySQLdb.cursors.SSDictCursor
+        # Match pymysql, which returns JSON columns as str rather than bytes
+        self.conversions = dict(_mysqldb_conversions)
+        self.conversions[FIELD_TYPE.JSON] = lambda value: value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def connect(self, config):
+        config = dict(config)
+        if 'database' in config:
+            config['db'] = config.pop('database')
+        if 'password' in config:
+            config['passwd'] = config.pop('password') or ''
+        config.setdefault('conv', self.conversions)
+        return MySQLdb.connect(**config)
+
+    def ping(self, connection):
+        try:
+            connection.ping()
+            return True
+        except MySQLdb.Error:
+            return False
+
+    def set_read_timeout(self, connection, seconds):
+        # libmysqlclient fixes the read timeout at connect time; budgets rely
+        # on MAX_EXECUTION_TIME alone
+        pass
+
+    def row_literal(self, cursor, template, row):
+        if hasattr(cursor, 'mogrify'):
+            return cursor.mogrify(template, row)
+        # mysqlclient < 2.2 has no mogrify; escape each value as execute() would
+        connection = cursor.connection
+        literals = []
+        for value in row:
+            literal = connection.literal(value)
+            literals.append(literal.decode(connection.encoding) if isinstance(literal, bytes) else literal)
+        return template % tuple(literals)
+
+
+def _load_driver(choice):
+    choice = (choice or 'auto').lower()
+    if choice not in ('auto', 'pymysql', 'mysqlclient'):
+        db_logger.warning(f"Unknown DB_DRIVER '{choice}', using auto")
+        choice = 'auto'
+    if choice == 'pymysql':
+        return PyMySQLDriver()
+    if choice == 'auto' and GEVENT_MODE:
+        # mysqlclient's socket I/O happens in C where gevent cannot patch it,
+        # so every query would block the whole worker
+        return PyMySQLDriver()
+    if MySQLdb is not None:
+        return MySQLClientDriver()
+    if choice == 'mysqlclient':
+        db_logger.warning("DB_DRIVER=mysqlclient but MySQLdb is not installed; falling back to pymysql")
+    return PyMySQLDriver()
+
+
+driver = _load_driver(os.getenv('DB_DRIVER', 'auto'))
+
+_modules = (pymysql,) if MySQLdb is None else (pymysql, MySQLdb)
+Error = tuple(module.Error for module in _modules)
+OperationalError = tuple(module.OperationalError for module in _modules)
+InterfaceError = tuple(module.InterfaceError for module in _modules)
+IntegrityError = tuple(module.IntegrityError for module in _modules)
@@ -1,20 +1,110 @@
-import pymysql
 import os
+import re
+import sys
+import time
+import traceback
 from dotenv import load_dotenv
-from queue import Queue, Empty
-from threading import Lock
+from collections import deque
+from threading import Lock, Event, local, current_thread
 from contextlib import contextmanager
+from flask import g, has_request_context, request
+from backend.config.pool_metrics import PoolMetrics, current_request_labels
+from backend.config import db_driver
+from backend.config.db_driver import driver
+from backend.config.query_governor import (
+    current_query_class, statement_class, apply_budget, read_timeout_seconds, is_budget_violation,
+    record_statement, record_violation, BUDGETS_MS
+)
+from backend.config.gevent_mode import GEVENT_MODE, is_cooperative, spawn_background, pool_max_waiters
+from backend.utils.error_handler import PoolExhaustedError, QueryBudgetExceededError
 from backend.utils.logger import db_logger
+from backend.utils.query_profiler import record_query
 
 load_dotenv()
 
+class _Waiter:
+    """A thread queued for a connection; the returner fills one of the slots"""
+    
+    __slots__ = ('event', 'connection', 'may_create')
+    
+    def __init__(self):
+        self.event = Event()
+        self.connection = None
+        self.may_create = False
+
+
+class _Lease:
+    """Bookkeeping for one checked-out connection"""
+    
+    __slots__ = ('connection', 'leased_at', 'leased_wall', 'endpoint', 'blueprint',
+                 'thread', 'call_site', 'stack', 'warned')
+    
+    def __init__(self, connection, endpoint, blueprint, call_site, stack):
+        self.connection = connection
+        self.leased_at = time.perf_counter()
+        self.leased_wall = time.time()
+        self.endpoint = endpoint
+        self.blueprint = blueprint
+        self.thread = current_thread().name
+        self.call_site = call_site
+        self.stack = stack
+        self.warned = False
+    
+    def to_dict(self, now=None):
+        now = now if now is not None else time.perf_counter()
+        return {
+            'age_seconds': round(now - self.leased_at, 3),
+            'leased_at': self.leased_wall,
+            'endpoint': self.endpoint,
+            'blueprint': self.blueprint,
+            'thread': self.thread,
+            'call_site': self.call_site,
+            'connection_open': bool(self.connection.open),
+            'stack': self.stack
+        }
+
+
+def _call_site():
+    """First frame outside the pool plumbing, as 'file:line in function'"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename != __file__ and not filename.endswith('contextlib.py'):
+            try:
+                filename = os.path.relpath(filename)
+            except ValueError:
+                pass
+            return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
 class DatabaseConnectionPool:
-    def __init__(self, min_connections=5, max_connections=20):
+    def __init__(self, min_connections=5, max_connections=20, checkout_timeout=None, max_waiters=None,
+                 config_overrides=None, name='primary'):
+        self.name = name
         self.min_connections = min_connections
         self.max_connections = max_connections
-        self._pool = Queue(maxsize=max_connections)
+        self.checkout_timeout = checkout_timeout if checkout_timeout is not None else float(os.getenv('DB_POOL_TIMEOUT', 5))
+        self.max_waiters = max_waiters if max_waiters is not None else int(os.getenv('DB_POOL_MAX_WAITERS', pool_max_waiters(max_connections)))
+        self.retry_after = int(os.getenv('DB_POOL_RETRY_AFTER', 2))
+        self.min_idle = min(int(os.getenv('DB_POOL_MIN_IDLE', 2)), max_connections)
+        self.validate_after = float(os.getenv('DB_POOL_VALIDATE_AFTER', 30))
+        self.max_lifetime = float(os.getenv('DB_POOL_MAX_LIFETIME', 1800))
+        self.idle_timeout = float(os.getenv('DB_POOL_IDLE_TIMEOUT', 300))
+        self.reap_interval = float(os.getenv('DB_POOL_REAP_INTERVAL', 30))
+        self.leak_warn_after = float(os.getenv('DB_POOL_LEAK_WARN_AFTER', 60))
+        self.max_hold = float(os.getenv('DB_POOL_MAX_HOLD', 600))
+        self.reclaim_abandoned = os.getenv('DB_POOL_RECLAIM_ABANDONED', 'true').lower() in ('1', 'true', 'yes')
+        self.trace_leases = os.getenv('DB_POOL_LEAK_TRACE', 'false').lower() in ('1', 'true', 'yes')
+        self._idle = deque()
+        self._waiters = deque()
         self._lock = Lock()
         self._connection_count = 0
+        self._leases = {}
+        self._closed = Event()
+        self._reaper = None
+        self.metrics = PoolMetrics()
         
         self.config = {
             'host': os.getenv('DB_HOST'),
@@ -23,20 +113,27 @@ class DatabaseConnectionPool:
             'password': os.getenv('DB_PASSWORD'),
             'database': os.getenv('DB_NAME'),
             'charset': 'utf8mb4',
-            'cursorclass': pymysql.cursors.DictCursor,
+            'cursorclass': driver.DictCursor,
             'autocommit': False,
             'connect_timeout': 10,
             'read_timeout': 30,
             'write_timeout': 30
         }
+        self.config.update(config_overrides or {})
         
         self._initialize_pool()
-        db_logger.info(f"Database connection pool initialized with {self.min_connections} connections")
+        self._start_reaper()
+        db_logger.info(f"Database connection pool '{self.name}' initialized with {self.min_connections} connections")
     
     def _create_connection(self):
         try:
-            connection = pymysql.connect(**self.config)
-            connection.ping(reconnect=True)
+            connection = driver.connect(self.config)
+            # Lifecycle bookkeeping lives on the connection object itself
+            connection._pms_created_at = time.monotonic()
+            connection._pms_last_used = connection._pms_created_at
+            connection._pms_dirty = False
+            connection._pms_read_timeout = self.config.get('read_timeout')
+            self.metrics.record_created()
             db_logger.debug("Created new database connection")
             return connection
         except Exception as e:
@@ -47,77 +144,365 @@ class DatabaseConnectionPool:
         for _ in range(self.min_connections):
             try:
                 conn = self._create_connection()
-                self._pool.put(conn)
+                self._idle.append(conn)
                 self._connection_count += 1
             except Exception as e:
                 db_logger.error(f"Failed to initialize connection pool: {str(e)}")
                 raise
     
-    def get_connection(self, timeout=5):
-        try:
-            connection = self._pool.get(timeout=timeout)
-            
-            if not connection.open:
-                db_logger.warning("Retrieved dead connection, creating new one")
+    def get_connection(self, timeout=None):
+        """
+        Lease a connection. Idle connections are reused first, then the pool
+        grows up to max_connections; beyond that callers queue in FIFO order
+        until a connection is returned or their deadline passes.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.perf_counter()
+        connection = None
+        waiter = None
+        create = False
+        
+        if not self._idle and self._connection_count >= self.max_connections:
+            # Before queueing, recover slots held by leases that were closed or abandoned
+            self.reclaim_leases()
+        
+        with self._lock:
+            if self._idle and not self._waiters:
+                connection = self._idle.pop()
+            elif self._connection_count < self.max_connections:
+                self._connection_count += 1
+                create = True
+            elif len(self._waiters) < self.max_waiters:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+            else:
+                waiting = len(self._waiters)
+        
+        if waiter is None and connection is None and not create:
+            self.metrics.record_exhausted()
+            db_logger.error(f"Connection pool exhausted, {waiting} requests already waiting")
+            raise PoolExhaustedError(retry_after=self.retry_after)
+        
+        if waiter is not None:
+            if not waiter.event.wait(timeout):
+                with self._lock:
+                    if waiter.connection is None and not waiter.may_create:
+                        self._waiters.remove(waiter)
+                        waiting = len(self._waiters)
+                    else:
+                        waiting = None
+                if waiting is not None:
+                    self.metrics.record_exhausted()
+                    db_logger.error(
+                        f"Connection pool exhausted, waited {timeout}s "
+                        f"({waiting} requests still waiting)"
+                    )
+                    raise PoolExhaustedError(retry_after=self.retry_after)
+            connection = waiter.connection
+            create = connection is None
+        
+        if create:
+            try:
                 connection = self._create_connection()
+            except Exception:
+                self._release_slot()
+                raise
+            db_logger.info(f"Created additional connection. Pool size: {self._connection_count}")
+        elif not connection.open or self._expired(connection):
+            if connection.open:
+                db_logger.debug("Recycling connection past its maximum lifetime")
+                self.metrics.record_recycled()
+                self._close_quietly(connection)
             else:
-                connection.ping(reconnect=True)
-            
-            return connection
-        except Empty:
-            with self._lock:
-                if self._connection_count < self.max_connections:
+                db_logger.warning("Retrieved dead connection, creating new one")
+                self.metrics.record_dead_replaced()
+            try:
+                connection = self._create_connection()
+            except Exception:
+                self._release_slot()
+                raise
+        elif time.monotonic() - connection._pms_last_used > self.validate_after:
+            # Only connections that sat idle long enough to be dropped are pinged
+            self.metrics.record_validated()
+            if not driver.ping(connection):
+                db_logger.warning("Idle connection failed its ping, creating new one")
+                self.metrics.record_dead_replaced()
+                self._close_quietly(connection)
+                try:
                     connection = self._create_connection()
-                    self._connection_count += 1
-                    db_logger.info(f"Created additional connection. Pool size: {self._connection_count}")
-                    return connection
+                except Exception:
+                    self._release_slot()
+                    raise
+        
+        # Raw callers may run anything; cursor helpers clear this after commit
+        connection._pms_dirty = True
+        self._start_lease(connection, started)
+        return connection
+    
+    def _expired(self, connection, now=None):
+        if self.max_lifetime <= 0:
+            return False
+        now = now if now is not None else time.monotonic()
+        return now - getattr(connection, '_pms_created_at', now) > self.max_lifetime
+    
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+    
+    def _release_slot(self):
+        """Give up one connection slot, handing it to the oldest waiter if any"""
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.may_create = True
+                waiter.event.set()
+            else:
+                self._connection_count -= 1
+    
+    def _release_connection(self, connection):
+        """Hand a healthy connection to the oldest waiter, or park it as idle"""
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.connection = connection
+                waiter.event.set()
+            else:
+                self._idle.append(connection)
+    
+    def _start_lease(self, connection, started):
+        endpoint, blueprint = current_request_labels()
+        stack = ''.join(traceback.format_stack()[:-2]) if self.trace_leases else None
+        lease = _Lease(connection, endpoint, blueprint, _call_site(), stack)
+        self.metrics.record_checkout((lease.leased_at - started) * 1000)
+        with self._lock:
+            self._leases[id(connection)] = lease
+    
+    def _end_lease(self, connection):
+        """Close out the lease for connection; False if it had none (already reclaimed)"""
+        with self._lock:
+            lease = self._leases.pop(id(connection), None)
+        if lease is None or lease.connection is not connection:
+            return False
+        self.metrics.record_return((time.perf_counter() - lease.leased_at) * 1000, lease.endpoint, lease.blueprint)
+        return True
+    
+    def leases(self):
+        """Currently checked-out connections, oldest first"""
+        now = time.perf_counter()
+        with self._lock:
+            leases = sorted(self._leases.values(), key=lambda lease: lease.leased_at)
+        return [lease.to_dict(now) for lease in leases]
+    
+    def reclaim_leases(self):
+        """
+        Warn about leases held longer than leak_warn_after and take back the
+        slots of leases whose connection was closed by the borrower, or that
+        exceeded max_hold (the connection is closed first). Returns the number
+        of reclaimed leases.
+        """
+        now = time.perf_counter()
+        reclaimed = []
+        overdue = []
+        with self._lock:
+            for key, lease in list(self._leases.items()):
+                held = now - lease.leased_at
+                if not lease.connection.open:
+                    reason = 'closed'
+                elif self.reclaim_abandoned and self.max_hold > 0 and held > self.max_hold:
+                    reason = 'abandoned'
                 else:
-                    db_logger.error("Connection pool exhausted")
-                    raise Exception("Connection pool exhausted, no available connections")
+                    if self.leak_warn_after > 0 and held > self.leak_warn_after and not lease.warned:
+                        lease.warned = True
+                        overdue.append(lease)
+                    continue
+                del self._leases[key]
+                reclaimed.append((lease, reason))
+        
+        for lease in overdue:
+            self.metrics.record_leak_warning()
+            db_logger.warning(
+                f"Connection held for over {self.leak_warn_after:.0f}s by {lease.endpoint} "
+                f"({lease.call_site}, thread {lease.thread})"
+                + (f"\n{lease.stack}" if lease.stack else "")
+            )
+        
+        for lease, reason in reclaimed:
+            if reason == 'abandoned':
+                self._close_quietly(lease.connection)
+            db_logger.warning(
+                f"Reclaimed {reason} connection lease from {lease.endpoint} "
+                f"({lease.call_site}, held {now - lease.leased_at:.1f}s)"
+                + (f"\n{lease.stack}" if lease.stack else "")
+            )
+            self.metrics.record_lease_reclaimed()
+            self.metrics.record_closed()
+            self._release_slot()
+        
+        return len(reclaimed)
+    
+    def stats(self):
+        """Point-in-time view of pool occupancy plus the accumulated metrics"""
+        with self._lock:
+            stats = {
+                'name': self.name,
+                'driver': driver.name,
+                'size': self._connection_count,
+                'max_size': self.max_connections,
+                'min_size': self.min_connections,
+                'in_use': len(self._leases),
+                'idle': len(self._idle),
+                'waiting': len(self._waiters),
+                'max_waiters': self.max_waiters
+            }
+        stats.update(self.metrics.snapshot())
+        return stats
     
     def return_connection(self, connection):
+        if not connection:
+            return
+        if not self._end_lease(connection):
+            # The slot was already reclaimed (or this is a double return), so
+            # the connection must not re-enter the pool and skew the count
+            db_logger.warning(f"Returned connection has no active lease ({_call_site()}); closing it")
+            self._close_quietly(connection)
+            return
         try:
-            if connection and connection.open:
-                connection.rollback()
-                self._pool.put(connection)
+            if connection.open:
+                if getattr(connection, '_pms_dirty', True):
+                    connection.rollback()
+                else:
+                    self.metrics.record_rollback_skipped()
+                connection._pms_dirty = False
+                connection._pms_last_used = time.monotonic()
+                if not self._expired(connection):
+                    self._release_connection(connection)
+                    return
+                db_logger.debug("Closing returned connection past its maximum lifetime")
+                self.metrics.record_recycled()
+                self._close_quietly(connection)
             else:
                 db_logger.warning("Attempted to return dead connection")
-                with self._lock:
-                    self._connection_count -= 1
         except Exception as e:
             db_logger.error(f"Error returning connection to pool: {str(e)}")
+            self._close_quietly(connection)
+        self.metrics.record_closed()
+        self._release_slot()
+    
+    def discard_connection(self, connection):
+        """Close a leased connection instead of returning it, freeing its slot"""
+        if not self._end_lease(connection):
+            self._close_quietly(connection)
+            return
+        self._close_quietly(connection)
+        self.metrics.record_closed()
+        self._release_slot()
+    
+    def _start_reaper(self):
+        if self.reap_interval <= 0 or self._reaper is not None:
+            return
+        self._reaper = spawn_background(self._reap_loop, 'db-pool-reaper')
+    
+    def _reap_loop(self):
+        while not self._closed.wait(self.reap_interval):
+            try:
+                self.reap()
+            except Exception as e:
+                db_logger.error(f"Connection pool reaper failed: {str(e)}")
+    
+    def reap(self):
+        """
+        Close idle connections that are dead, past max_lifetime, or surplus
+        after a burst (idle longer than idle_timeout beyond min_idle), then
+        top the pool back up to min_idle idle / min_connections total.
+        """
+        self.reclaim_leases()
+        
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            keep = deque()
+            surplus = len(self._idle) - self.min_idle
+            # Left side of the deque holds the connections idle the longest
+            for connection in self._idle:
+                idle_for = now - connection._pms_last_used
+                if (not connection.open or self._expired(connection, now)
+                        or (surplus > 0 and idle_for > self.idle_timeout)):
+                    stale.append(connection)
+                    surplus -= 1
+                else:
+                    keep.append(connection)
+            self._idle = keep
+            self._connection_count -= len(stale)
+        
+        for connection in stale:
+            self._close_quietly(connection)
+            self.metrics.record_reaped()
+        
+        created = 0
+        while not self._closed.is_set():
+            with self._lock:
+                warm = (len(self._idle) >= self.min_idle
+                        and self._connection_count >= self.min_connections)
+                if warm or self._connection_count >= self.max_connections:
+                    break
+                self._connection_count += 1
+            try:
+                connection = self._create_connection()
+            except Exception:
+                self._release_slot()
+                break
+            self._release_connection(connection)
+            created += 1
+        
+        if stale or created:
+            db_logger.debug(f"Pool reaper closed {len(stale)} and opened {created} connections")
     
     def close_all(self):
-        while not self._pool.empty():
+        self._closed.set()
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._connection_count -= len(idle)
+        for conn in idle:
             try:
-                conn = self._pool.get_nowait()
                 conn.close()
-                self._connection_count -= 1
-            except Empty:
-                break
+            except Exception:
+                pass
+            self.metrics.record_closed()
         db_logger.info("All database connections closed")
     
     @contextmanager
     def get_cursor(self, commit=False):
-        connection = None
-        cursor = None
+        connection = self.get_connection()
         try:
-            connection = self.get_connection()
-            cursor = connection.cursor()
-            yield cursor
-            if commit:
-                connection.commit()
-                db_logger.debug("Transaction committed")
-        except Exception as e:
-            if connection:
-                connection.rollback()
-                db_logger.error(f"Transaction rolled back due to error: {str(e)}")
-            raise
+            with connection_cursor(connection, commit=commit) as cursor:
+                yield cursor
         finally:
-            if cursor:
-                cursor.close()
-            if connection:
-                self.return_connection(connection)
+            self.return_connection(connection)
+
+
+@contextmanager
+def connection_cursor(connection, commit=False):
+    """Cursor on an already leased connection; commits or rolls back but never returns it"""
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        yield cursor
+        if commit:
+            connection.commit()
+            connection._pms_dirty = False
+            db_logger.debug("Transaction committed")
+    except Exception as e:
+        connection.rollback()
+        connection._pms_dirty = False
+        db_logger.error(f"Transaction rolled back due to error: {str(e)}")
+        raise
+    finally:
+        if cursor:
+            cursor.close()
 
 # Lazy initialization - pool is created on first use, not at import time
 _db_pool = None
@@ -126,6 +511,11 @@ def _get_pool():
     """Get or create the database connection pool lazily"""
     global _db_pool
     if _db_pool is None:
+        if GEVENT_MODE and not is_cooperative():
+            db_logger.warning(
+                "GUNICORN_WORKER_CLASS=gevent but threading is not monkey-patched; "
+                "load the app through wsgi.py so patching happens before imports"
+            )
         try:
             _db_pool = DatabaseConnectionPool(
                 min_connections=int(os.getenv('DB_POOL_MIN', 5)),
@@ -145,7 +535,7 @@ def _get_pool():
 class LazyPoolWrapper:
     """Wrapper that proxies to the lazy-loaded connection pool"""
     
-    def get_connection(self, timeout=5):
+    def get_connection(self, timeout=None):
         pool = _get_pool()
         if pool is None:
             raise RuntimeError(
@@ -171,6 +561,14 @@ class LazyPoolWrapper:
         if pool is not None:
             pool.close_all()
     
+    def stats(self):
+        pool = _get_pool()
+        return pool.stats() if pool is not None else None
+    
+    def leases(self):
+        pool = _get_pool()
+        return pool.leases() if pool is not None else []
+    
     @property
     def _connection_count(self):
         pool = _get_pool()
@@ -201,8 +599,266 @@ def return_db_connection(connection):
         pool.return_connection(connection)
 
 
+# Request-scoped connections - opt-in via DB_REQUEST_SCOPED_CONNECTION.
+# The first query of a request leases a connection and parks it on flask.g;
+# every later query in the same request reuses it and the teardown hook
+# registered by init_request_scope() hands it back to the pool.
+_request_scope_enabled = False
+
+
+def init_request_scope(app):
+    """Enable request-scoped connections for app if configured"""
+    global _request_scope_enabled
+    enabled = app.config.get('DB_REQUEST_SCOPED_CONNECTION')
+    if enabled is None:
+        enabled = os.getenv('DB_REQUEST_SCOPED_CONNECTION', 'false').lower() in ('1', 'true', 'yes')
+    _request_scope_enabled = bool(enabled)
+    app.teardown_request(release_request_connection)
+    if _request_scope_enabled:
+        db_logger.info("Request-scoped database connections enabled")
+
+
+def _request_connection():
+    """Return the connection bound to the current request, leasing it on first use"""
+    if not has_request_context() or not (_request_scope_enabled or g.get('_db_connection_shared')):
+        return None
+    connection = g.get('_db_connection')
+    if connection is None or not connection.open:
+        pool = _get_pool()
+        if pool is None:
+            return None
+        if connection is not None:
+            pool.return_connection(connection)
+        connection = pool.get_connection()
+        g._db_connection = connection
+    return connection
+
+
+def release_request_connection(exc=None):
+    """teardown_request hook: return the request's connection to the pool"""
+    if g.get('_db_connection_shared'):
+        # A nested request inside shared_request_connection(); the outer
+        # request returns it
+        return
+    connection = g.pop('_db_connection', None)
+    if connection is not None:
+        return_db_connection(connection)
+
+
+@contextmanager
+def shared_request_connection():
+    """
+    Bind one connection to the current request for the block, whatever
+    DB_REQUEST_SCOPED_CONNECTION says, and keep it across request contexts
+    nested inside it (batch sub-requests share the app context, and so g).
+    The outer request's teardown returns it.
+    """
+    g._db_connection_shared = g.get('_db_connection_shared', 0) + 1
+    try:
+        yield
+    finally:
+        g._db_connection_shared -= 1
+
+
+# Unit-of-work transactions. The stack is thread-local so nested
+# transaction() blocks on the same thread share one connection and
+# map to savepoints, while other threads are unaffected.
+_transaction_state = local()
+
+
+def _transaction_stack():
+    stack = getattr(_transaction_state, 'stack', None)
+    if stack is None:
+        stack = _transaction_state.stack = []
+    return stack
+
+
+def in_transaction():
+    return bool(_transaction_stack())
+
+
+@contextmanager
+def transaction():
+    """
+    Run every execute_query/execute_many issued inside the block on a single
+    connection and commit once at the end. commit=True on individual calls is
+    deferred to the outer commit. Nested blocks become savepoints, so an inner
+    failure can be caught without discarding the outer work.
+    
+        with transaction():
+            order_id = execute_query(insert_sql, params, commit=True)
+            execute_query(update_sql, (order_id,), commit=True)
+    """
+    stack = _transaction_stack()
+    _note_write()
+    
+    if stack:
+        connection = stack[-1]
+        savepoint = f"pms_sp_{len(stack)}"
+        with connection_cursor(connection) as cursor:
+            cursor.execute(f"SAVEPOINT {savepoint}")
+        stack.append(connection)
+        try:
+            yield connection
+        except Exception:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            finally:
+                cursor.close()
+            db_logger.debug(f"Rolled back to savepoint {savepoint}")
+            raise
+        else:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+            finally:
+                cursor.close()
+        finally:
+            stack.pop()
+        return
+    
+    connection = _request_connection()
+    owned = connection is None
+    if owned:
+        connection = get_db_connection()
+    stack.append(connection)
+    try:
+        yield connection
+        connection.commit()
+        connection._pms_dirty = False
+        db_logger.debug("Transaction committed")
+    except Exception as e:
+        connection.rollback()
+        connection._pms_dirty = False
+        db_logger.error(f"Transaction rolled back due to error: {str(e)}")
+        raise
+    finally:
+        stack.pop()
+        if owned:
+            return_db_connection(connection)
+
+
+# Read replica - optional, enabled by DB_REPLICA_HOST (the other DB_REPLICA_*
+# settings fall back to the primary's). execute_query sends read-only
+# statements there when called with route='replica', or for GET requests
+# served by a blueprint listed in DB_REPLICA_BLUEPRINTS. Once a request has
+# written, or inside transaction(), reads stay on the primary so callers see
+# their own writes. If the replica is unreachable the read is retried on the
+# primary and the replica is skipped for DB_REPLICA_RETRY_SECONDS.
+_replica_pool = None
+_replica_lock = Lock()
+_replica_retry_at = 0.0
+REPLICA_BLUEPRINTS = frozenset(
+    name.strip() for name in os.getenv('DB_REPLICA_BLUEPRINTS', 'reports').split(',') if name.strip()
+)
+_READ_ONLY_KEYWORDS = ('select', 'with', 'show', 'explain', 'describe', 'desc')
+_LOCKING_READ_MARKERS = ('for update', 'lock in share mode', 'for share')
+
+
+def _get_replica_pool():
+    """Get or create the replica pool lazily; None when not configured or backing off"""
+    global _replica_pool
+    if not os.getenv('DB_REPLICA_HOST') or time.monotonic() < _replica_retry_at:
+        return None
+    if _replica_pool is None:
+        with _replica_lock:
+            if _replica_pool is None:
+                try:
+                    _replica_pool = DatabaseConnectionPool(
+                        min_connections=int(os.getenv('DB_REPLICA_POOL_MIN', 2)),
+                        max_connections=int(os.getenv('DB_REPLICA_POOL_MAX', os.getenv('DB_POOL_MAX', 20))),
+                        config_overrides={
+                            'host': os.getenv('DB_REPLICA_HOST'),
+                            'port': int(os.getenv('DB_REPLICA_PORT', os.getenv('DB_PORT', 3306))),
+                            'user': os.getenv('DB_REPLICA_USER', os.getenv('DB_USER')),
+                            'password': os.getenv('DB_REPLICA_PASSWORD', os.getenv('DB_PASSWORD')),
+                            'database': os.getenv('DB_REPLICA_NAME', os.getenv('DB_NAME'))
+                        },
+                        name='replica'
+                    )
+                except Exception as e:
+                    _mark_replica_down(e)
+    return _replica_pool
+
+
+def _mark_replica_down(error):
+    global _replica_retry_at
+    retry = float(os.getenv('DB_REPLICA_RETRY_SECONDS', 30))
+    _replica_retry_at = time.monotonic() + retry
+    db_logger.warning(f"Read replica unavailable ({error}); using primary for {retry:.0f}s")
+
+
+def get_replica_stats():
+    return _replica_pool.stats() if _replica_pool is not None else None
+
+
+def is_read_only(query):
+    """True for plain SELECT-style statements (locking reads excluded)"""
+    text = query.lstrip().lstrip('(').lstrip()
+    while text.startswith('/*'):
+        text = text[text.find('*/') + 2:].lstrip() if '*/' in text else ''
+    keyword = text[:8].split(None, 1)[0].lower() if text else ''
+    if keyword not in _READ_ONLY_KEYWORDS:
+        return False
+    lowered = text.lower()
+    return not any(marker in lowered for marker in _LOCKING_READ_MARKERS)
+
+
+def _note_write():
+    """Pin the rest of the current request to the primary (read-your-writes)"""
+    if has_request_context():
+        g._db_wrote = True
+
+
+def _wants_replica(query, commit, route):
+    if route == 'primary' or commit or in_transaction():
+        return False
+    if has_request_context():
+        if g.get('_db_wrote'):
+            return False
+        if route != 'replica' and (request.method != 'GET' or request.blueprint not in REPLICA_BLUEPRINTS):
+            return False
+    elif route != 'replica':
+        return False
+    return is_read_only(query)
+
+
+def _execute_on_replica(query, params, fetch_one):
+    """Run a read on the replica; returns None (and backs off) if it is unusable"""
+    pool = _get_replica_pool()
+    if pool is None:
+        return None
+    try:
+        with pool.get_cursor() as cursor:
+            started = time.perf_counter()
+            _governed_execute(cursor, query, params)
+            result = cursor.fetchone() if fetch_one else cursor.fetchall()
+            record_query(query, params, (time.perf_counter() - started) * 1000, cursor.rowcount)
+            return (result,)
+    except (db_driver.OperationalError + db_driver.InterfaceError + (PoolExhaustedError,)) as e:
+        _mark_replica_down(e)
+        return None
+
+
 @contextmanager
 def get_db_cursor(commit=False):
+    stack = _transaction_stack()
+    if stack:
+        # Inside transaction(): share its connection and leave commit/rollback to it
+        cursor = stack[-1].cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+        return
+    
+    connection = _request_connection()
+    if connection is not None:
+        with connection_cursor(connection, commit=commit) as cursor:
+            yield cursor
+        return
+    
     pool = _get_pool()
     if pool is None:
         raise RuntimeError(
@@ -212,28 +868,99 @@ def get_db_cursor(commit=False):
         yield cursor
 
 
-def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=False):
+def _governed_execute(cursor, query, params):
+    """
+    Run one statement under the time budget of its query class (see
+    query_governor): plain reads get a MAX_EXECUTION_TIME hint and a matching
+    client read timeout; writes and transaction() work fall under the longer
+    write class and are never hinted. A violation raises
+    QueryBudgetExceededError.
+    """
+    read_only = is_read_only(query) and not in_transaction()
+    name = statement_class(current_query_class(), read_only)
+    record_statement(name)
+    connection = cursor.connection
+    driver.set_read_timeout(connection, read_timeout_seconds(name))
+    started = time.perf_counter()
+    try:
+        cursor.execute(apply_budget(query, name) if read_only else query, params or ())
+    except db_driver.OperationalError as e:
+        if not is_budget_violation(e, time.perf_counter() - started, name):
+            raise
+        raise _budget_exceeded(name, query) from e
+    finally:
+        driver.set_read_timeout(connection, getattr(connection, '_pms_read_timeout', None))
+
+
+def _budget_exceeded(name, query):
+    record_violation(name)
+    db_logger.warning(
+        f"Statement exceeded the {name} budget of {BUDGETS_MS[name]}ms "
+        f"({current_request_labels()[0]}): {query.strip()[:200]}"
+    )
+    return QueryBudgetExceededError(name, BUDGETS_MS[name])
+
+
+def _explain_on(connection):
+    """
+    EXPLAIN callback for a slow statement, run on the connection that ran
+    it: leasing another one from inside the profiler could block on, or
+    exhaust, the pool it is measuring.
+    """
+    def explain(query, params):
+        cursor = connection.cursor()
+        try:
+            cursor.execute('EXPLAIN ' + query, params or ())
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    return explain
+
+
+def _profile(cursor, query, params, started, rows):
+    record_query(query, params, (time.perf_counter() - started) * 1000, rows,
+                 explain=_explain_on(cursor.connection))
+
+
+def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=False, route=None):
+    """
+    Run one statement. route='replica' sends a read-only fetch to the read
+    replica when one is configured, route='primary' forces the primary;
+    by default reads are routed per blueprint (see REPLICA_BLUEPRINTS).
+    """
+    if (fetch_one or fetch_all) and _wants_replica(query, commit, route):
+        result = _execute_on_replica(query, params, fetch_one)
+        if result is not None:
+            return result[0]
+    if commit or not is_read_only(query):
+        _note_write()
+    
     try:
         with get_db_cursor(commit=commit) as cursor:
-            cursor.execute(query, params or ())
+            started = time.perf_counter()
+            _governed_execute(cursor, query, params)
             
             if commit:
                 last_id = cursor.lastrowid
+                _profile(cursor, query, params, started, cursor.rowcount)
                 db_logger.debug(f"Query executed and committed. Last ID: {last_id}")
                 return last_id
             
             if fetch_one:
                 result = cursor.fetchone()
+                _profile(cursor, query, params, started, 1 if result else 0)
                 db_logger.debug("Query executed, fetched one row")
                 return result
             
             if fetch_all:
                 result = cursor.fetchall()
+                _profile(cursor, query, params, started, len(result))
                 db_logger.debug(f"Query executed, fetched {len(result)} rows")
                 return result
             
+            _profile(cursor, query, params, started, cursor.rowcount)
             return cursor
-    except pymysql.Error as e:
+    except db_driver.Error as e:
         db_logger.error(f"Database query error: {str(e)}, Query: {query[:100]}...")
         raise
     except Exception as e:
@@ -242,15 +969,202 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=F
 
 
 def execute_many(query, params_list, commit=True):
+    _note_write()
     try:
         with get_db_cursor(commit=commit) as cursor:
+            started = time.perf_counter()
             cursor.executemany(query, params_list)
             affected = cursor.rowcount
+            _profile(cursor, query, None, started, affected)
             db_logger.info(f"Batch query executed, {affected} rows affected")
             return affected
-    except pymysql.Error as e:
+    except db_driver.Error as e:
         db_logger.error(f"Database batch query error: {str(e)}")
         raise
     except Exception as e:
         db_logger.error(f"Unexpected error during batch query execution: {str(e)}")
         raise
+
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_max_statement_bytes = None
+
+
+def _quote_identifier(name):
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return f"`{name}`"
+
+
+def _statement_budget(cursor):
+    """Bytes a single statement may use: 90% of the server's max_allowed_packet"""
+    global _max_statement_bytes
+    if _max_statement_bytes is None:
+        try:
+            cursor.execute("SELECT @@max_allowed_packet AS max_allowed_packet")
+            packet = int(cursor.fetchone()['max_allowed_packet'])
+        except db_driver.Error + (TypeError, KeyError):
+            packet = 1024 * 1024
+        _max_statement_bytes = int(packet * 0.9)
+    return _max_statement_bytes
+
+
+def _bulk_write(table, columns, rows, chunk_size, prefix, suffix, track_ids):
+    if not rows:
+        return {'affected': 0, 'rows': 0, 'chunks': []}
+    
+    column_list = ', '.join(_quote_identifier(column) for column in columns)
+    head = f"{prefix} {_quote_identifier(table)} ({column_list}) VALUES "
+    row_template = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    chunks = []
+    _note_write()
+    
+    def flush(cursor, values):
+        started = time.perf_counter()
+        statement = head + ','.join(values) + suffix
+        cursor.execute(statement)
+        _profile(cursor, head + row_template + suffix, None, started, cursor.rowcount)
+        chunk = {'rows': len(values), 'affected': cursor.rowcount}
+        if track_ids:
+            # lastrowid is the ID generated for the statement's first row.
+            # The rest need not follow it one by one (auto_increment_increment,
+            # innodb_autoinc_lock_mode=2), so no range is derived from it
+            chunk['first_id'] = cursor.lastrowid
+        chunks.append(chunk)
+    
+    try:
+        for start in range(0, len(rows), chunk_size):
+            with get_db_cursor(commit=True) as cursor:
+                budget = _statement_budget(cursor) - len(head) - len(suffix)
+                values, size = [], 0
+                for row in rows[start:start + chunk_size]:
+                    literal = driver.row_literal(cursor, row_template, tuple(row))
+                    literal_bytes = len(literal.encode('utf-8')) + 1
+                    if values and size + literal_bytes > budget:
+                        flush(cursor, values)
+                        values, size = [], 0
+                    values.append(literal)
+                    size += literal_bytes
+                if values:
+                    flush(cursor, values)
+    except db_driver.Error as e:
+        db_logger.error(f"Bulk write to {table} failed after {len(chunks)} chunk(s): {str(e)}")
+        raise
+    
+    affected = sum(chunk['affected'] for chunk in chunks)
+    db_logger.info(f"Bulk write to {table}: {len(rows)} rows in {len(chunks)} statement(s), {affected} affected")
+    return {'affected': affected, 'rows': len(rows), 'chunks': chunks}
+
+
+def bulk_insert(table, columns, rows, chunk_size=1000, ignore=False):
+    """
+    Insert rows (sequences ordered like columns) with multi-row
+    INSERT ... VALUES (...),(...) statements of at most chunk_size rows,
+    split further so no statement exceeds max_allowed_packet. Each
+    statement commits on its own unless run inside transaction().
+    
+    Returns {'affected', 'rows', 'chunks'}, one chunk entry per statement
+    with its row count, affected count and first_id, the ID of its first
+    row. Later rows' IDs are not reported: MySQL does not promise they are
+    consecutive.
+    """
+    prefix = 'INSERT IGNORE INTO' if ignore else 'INSERT INTO'
+    return _bulk_write(table, columns, list(rows), chunk_size, prefix, '', track_ids=not ignore)
+
+
+def bulk_upsert(table, columns, rows, on_duplicate_update, chunk_size=1000):
+    """
+    Like bulk_insert, but rows colliding with a unique key update the
+    on_duplicate_update columns from the incoming values instead. MySQL
+    counts 1 affected row per insert and 2 per update, so chunk 'affected'
+    is not a row count; no ID ranges are reported.
+    """
+    if not on_duplicate_update:
+        raise ValueError("bulk_upsert needs at least one on_duplicate_update column")
+    updates = ', '.join(
+        f"{_quote_identifier(column)} = VALUES({_quote_identifier(column)})"
+        for column in on_duplicate_update
+    )
+    return _bulk_write(table, columns, list(rows), chunk_size, 'INSERT INTO',
+                       f" ON DUPLICATE KEY UPDATE {updates}", track_ids=False)
+
+
+def execute_stream(query, params=None, batch_size=1000, route=None):
+    """
+    Yield rows one by one from a server-side (unbuffered) SSDictCursor, so
+    large result sets are never materialized in worker memory. Rows are
+    pulled from the server batch_size at a time.
+    
+    The statement is profiled like execute_query(), counting database time
+    only. It gets its class's client read timeout but no MAX_EXECUTION_TIME
+    hint: on an unbuffered result MySQL's timer keeps running while the
+    server waits for the client to read, so the hint would cap the whole
+    transfer to a slow consumer rather than the query.
+    
+    The generator leases its own connection (never the request-scoped or
+    transaction connection, which would be blocked while streaming) and
+    returns it once the result is exhausted. If the generator is closed or
+    garbage collected early, the connection is discarded rather than
+    draining the remaining rows. Consume promptly: MySQL aborts an
+    unbuffered result whose client stops reading for net_write_timeout.
+    """
+    pool = _get_replica_pool() if _wants_replica(query, False, route) else None
+    if pool is None:
+        pool = _get_pool()
+    if pool is None:
+        raise RuntimeError(
+            "Database pool not available. Check database configuration."
+        )
+    
+    name = statement_class(current_query_class(), is_read_only(query) and not in_transaction())
+    record_statement(name)
+    connection = pool.get_connection()
+    cursor = None
+    streaming = False
+    finished = False
+    try:
+        cursor = connection.cursor(driver.SSDictCursor)
+        driver.set_read_timeout(connection, read_timeout_seconds(name))
+        started = time.perf_counter()
+        try:
+            cursor.execute(query, params or ())
+        except db_driver.OperationalError as e:
+            if is_budget_violation(e, time.perf_counter() - started, name):
+                raise _budget_exceeded(name, query) from e
+            raise
+        streaming = True
+        # Time spent in the database only, not waiting on the consumer
+        db_seconds = time.perf_counter() - started
+        row_count = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                rows = cursor.fetchmany(batch_size)
+            except db_driver.OperationalError as e:
+                # A server-side max_execution_time still surfaces here, mid-stream
+                if is_budget_violation(e, time.perf_counter() - started, name):
+                    raise _budget_exceeded(name, query) from e
+                raise
+            db_seconds += time.perf_counter() - started
+            if not rows:
+                break
+            row_count += len(rows)
+            for row in rows:
+                yield row
+        finished = True
+        # The result is fully read, so a slow-query EXPLAIN can use the connection
+        record_query(query, params, db_seconds * 1000, row_count, explain=_explain_on(connection))
+        db_logger.debug(f"Streamed {row_count} rows")
+    except db_driver.Error as e:
+        db_logger.error(f"Database stream error: {str(e)}, Query: {query[:100]}...")
+        raise
+    finally:
+        driver.set_read_timeout(connection, getattr(connection, '_pms_read_timeout', None))
+        if streaming and not finished:
+            # Unread rows are still on the wire; dropping the connection is
+            # cheaper than draining a potentially huge result set
+            pool.discard_connection(connection)
+        else:
+            if cursor:
+                cursor.close()
+            pool.return_connection(connection)
@@ -19,8 +19,48 @@ REQUIRED_ENV_VARS = {
 }
 
 OPTIONAL_ENV_VARS = {
+    'DB_DRIVER': ('MySQL driver: auto (mysqlclient if installed), mysqlclient or pymysql', 'auto'),
     'DB_POOL_MIN': ('Minimum database pool connections', '5'),
     'DB_POOL_MAX': ('Maximum database pool connections', '20'),
+    'DB_POOL_TIMEOUT': ('Seconds a request waits in the pool queue before a 503', '5'),
+    'DB_POOL_RETRY_AFTER': ('Retry-After seconds sent when the pool is exhausted', '2'),
+    'DB_POOL_MIN_IDLE': ('Idle connections the pool reaper keeps warm', '2'),
+    'DB_POOL_VALIDATE_AFTER': ('Seconds idle before a connection is pinged on checkout', '30'),
+    'DB_POOL_MAX_LIFETIME': ('Seconds before a connection is recycled (keep below the MySQL proxy timeout)', '1800'),
+    'DB_POOL_IDLE_TIMEOUT': ('Seconds a surplus idle connection is kept after a burst', '300'),
+    'DB_POOL_REAP_INTERVAL': ('Seconds between pool reaper runs (0 disables it)', '30'),
+    'DB_POOL_LEAK_WARN_AFTER': ('Seconds a connection may be held before a leak warning', '60'),
+    'DB_POOL_MAX_HOLD': ('Seconds after which a held connection is treated as abandoned', '600'),
+    'DB_POOL_RECLAIM_ABANDONED': ('Close and reclaim connections held past DB_POOL_MAX_HOLD', 'true'),
+    'DB_POOL_LEAK_TRACE': ('Capture a stack trace for every connection checkout', 'false'),
+    'DB_REPLICA_BLUEPRINTS': ('Blueprints whose GET reads go to the read replica (needs DB_REPLICA_HOST)', 'reports'),
+    'DB_REPLICA_RETRY_SECONDS': ('Seconds to use the primary after a replica failure', '30'),
+    'DB_REQUEST_SCOPED_CONNECTION': ('Reuse one pooled connection for all queries in a request', 'false'),
+    'DB_PROFILING': ('Record per-request SQL statistics and the slow query log', 'true'),
+    'DB_SLOW_QUERY_MS': ('Statements slower than this go to logs/slow_queries.log with their EXPLAIN plan', '500'),
+    'DB_NPLUS1_THRESHOLD': ('Repeats of one statement per request before it is reported as a possible N+1', '5'),
+    'DB_QUERY_CAPTURE': ('File that collects one sample per query fingerprint for scripts/index_advisor.py', ''),
+    'DB_PROFILE_HEADERS': ('Send X-DB-Query-Count / X-DB-Time headers outside debug mode', 'false'),
+    'DB_BUDGET_INTERACTIVE_MS': ('Statement time budget for ordinary API requests', '5000'),
+    'DB_BUDGET_ANALYTICS_MS': ('Statement time budget for report and analytics endpoints', '20000'),
+    'DB_BUDGET_BACKGROUND_MS': ('Statement time budget for scheduler jobs', '120000'),
+    'DB_BUDGET_WRITE_MS': ('Statement time budget for writes and transaction() work (client read timeout only)', '60000'),
+    'DB_ANALYTICS_BLUEPRINTS': ('Blueprints whose statements use the analytics budget', 'reports'),
+    'PERMISSION_CACHE_TTL_SECONDS': ('Seconds a worker caches role permissions between explicit invalidations', '300'),
+    'IDENTITY_CACHE_TTL_SECONDS': ('Seconds a worker caches a user\'s employee and managed department', '60'),
+    'REFERENCE_CACHE_TTL_SECONDS': ('Seconds a worker serves departments, machines, stages and display names before reloading', '600'),
+    'RESULT_CACHE_TTL_SECONDS': ('Seconds an analytics response stays in the shared Redis result cache', '300'),
+    'RESULT_CACHE_WAIT_MS': ('Poll interval while waiting for another worker to compute the same analytics response', '50'),
+    'COMPRESSION_ENABLED': ('Compress JSON responses with gzip or brotli (disable when a proxy compresses)', 'true'),
+    'COMPRESSION_MIN_BYTES': ('Smallest JSON body worth compressing', '1024'),
+    'COMPRESSION_GZIP_LEVEL': ('gzip level for responses, 1 (fast) to 9 (small)', '6'),
+    'COMPRESSION_BROTLI_QUALITY': ('brotli quality for responses, 0 (fast) to 11 (small)', '4'),
+    'BATCH_MAX_REQUESTS': ('Most GET sub-requests one POST /api/batch may carry', '10'),
+    'BATCH_MAX_RESPONSE_BYTES': ('Largest body a batch sub-request may return; bigger ones get a 413 result', '1048576'),
+    'CACHE_INVALIDATION_CHANNEL': ('Redis pub/sub channel that carries cache invalidations between workers', 'pms:cache-invalidate'),
+    'GUNICORN_WORKER_CLASS': ('Gunicorn worker class: sync, or gevent for cooperative I/O', 'sync'),
+    'GUNICORN_WORKERS': ('Gunicorn worker processes', '2'),
+    'GUNICORN_WORKER_CONNECTIONS': ('Concurrent greenlets per gevent worker', '1000'),
     'FLASK_ENV': ('Flask environment', 'production'),
     'FLASK_DEBUG': ('Flask debug mode', 'False'),
     'RATE_LIMIT_PER_MINUTE': ('API rate limit per minute', '60'),
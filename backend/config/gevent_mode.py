@@ -0,0 +1,60 @@
+"""
+Cooperative worker mode: gunicorn's gevent worker with a monkey-patched stdlib.
+
+Enabled with GUNICORN_WORKER_CLASS=gevent. Once socket, ssl, threading and
+time are patched, pymysql, redis, requests (Twilio, D365, WhatsApp) and
+smtplib all yield to other greenlets while waiting on the network, so one
+slow upstream call no longer stalls a whole worker.
+"""
+import os
+
+GEVENT_MODE = os.getenv('GUNICORN_WORKER_CLASS', 'sync').lower() == 'gevent'
+WORKER_CONNECTIONS = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+
+def apply_monkey_patch():
+    """
+    Patch the stdlib for gevent when gevent mode is enabled. Must run before
+    anything imports socket, ssl or threading (see wsgi.py); returns True if
+    the process is cooperative afterwards.
+    """
+    if not GEVENT_MODE:
+        return False
+    from gevent import monkey
+    if not monkey.is_module_patched('socket'):
+        monkey.patch_all()
+    return True
+
+
+def is_cooperative():
+    """True when threading has been patched, i.e. threads are greenlets"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+
+def spawn_background(target, name):
+    """Run target in the background: a greenlet in gevent mode, else a daemon thread"""
+    if is_cooperative():
+        import gevent
+        worker = gevent.spawn(target)
+        worker.name = name
+        return worker
+    from threading import Thread
+    worker = Thread(target=target, name=name, daemon=True)
+    worker.start()
+    return worker
+
+
+def pool_max_waiters(max_connections):
+    """
+    Default DB_POOL_MAX_WAITERS. A gevent worker can have WORKER_CONNECTIONS
+    greenlets in flight against a pool of max_connections, and parking a
+    greenlet is cheap, so every in-flight request may queue for a connection
+    rather than being rejected at max_connections * 4.
+    """
+    if GEVENT_MODE:
+        return max(WORKER_CONNECTIONS, max_connections * 4)
+    return max_connections * 4
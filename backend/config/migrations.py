@@ -1,7 +1,9 @@
 """Database migrations - run automatically on app startup"""
 import os
-from backend.config.db_pool import get_db_connection
+from backend.config.db_pool import get_db_connection, return_db_connection
 from backend.utils.logger import app_logger
+from backend.utils.auth import invalidate_permissions
+from backend.utils.reference_cache import invalidate_reference
 
 
 def run_migrations():
@@ -19,6 +21,7 @@ def run_migrations():
 
 def add_cost_impact_to_replacement_tickets():
     """Add cost_impact column to replacement_tickets if missing"""
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -45,15 +48,18 @@ def add_cost_impact_to_replacement_tickets():
             app_logger.debug("cost_impact column already exists")
         
         cursor.close()
-        conn.close()
         
     except Exception as e:
         app_logger.error(f"Failed to migrate replacement_tickets: {e}")
         raise
+    finally:
+        if conn is not None:
+            return_db_connection(conn)
 
 
 def ensure_admin_has_full_permissions():
     """Ensure admin user has System Admin role with all permissions"""
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -86,18 +92,23 @@ def ensure_admin_has_full_permissions():
         """, (system_admin_id, 'admin@barron'))
         
         conn.commit()
+        invalidate_permissions()
+        invalidate_reference('roles')
         app_logger.info("Ensured admin@barron has System Admin role")
         
         cursor.close()
-        conn.close()
         
     except Exception as e:
         app_logger.error(f"Failed to ensure admin permissions: {e}")
         raise
+    finally:
+        if conn is not None:
+            return_db_connection(conn)
 
 
 def update_role_permissions():
     """Update all role permissions to match navigation modules"""
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -157,12 +168,16 @@ def update_role_permissions():
                 app_logger.debug(f"Updated {role_name} permissions")
         
         conn.commit()
+        # Reaches workers that are still serving from the previous release
+        invalidate_permissions()
         if updated_count > 0:
             app_logger.info(f"Updated {updated_count} role permissions")
         
         cursor.close()
-        conn.close()
         
     except Exception as e:
         app_logger.error(f"Failed to update role permissions: {e}")
         raise
+    finally:
+        if conn is not None:
+            return_db_connection(conn)
@@ -0,0 +1,208 @@
+import time
+from threading import Lock
+
+# Upper bounds (in milliseconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class HoldStats:
+    """Running hold-time totals for one endpoint or blueprint"""
+
+    __slots__ = ('count', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, held_ms):
+        self.count += 1
+        self.total_ms += held_ms
+        if held_ms > self.max_ms:
+            self.max_ms = held_ms
+
+    def to_dict(self):
+        return {
+            'leases': self.count,
+            'total_ms': round(self.total_ms, 2),
+            'avg_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 2)
+        }
+
+
+class PoolMetrics:
+    """Thread-safe counters and histograms describing connection pool usage"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.started_at = time.time()
+        self.checkouts = 0
+        self.returns = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.dead_replaced = 0
+        self.exhausted = 0
+        self.recycled = 0
+        self.reaped = 0
+        self.validations = 0
+        self.rollbacks_skipped = 0
+        self.leak_warnings = 0
+        self.leases_reclaimed = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self._wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._by_endpoint = {}
+        self._by_blueprint = {}
+
+    def record_checkout(self, wait_ms):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            if wait_ms > self.wait_max_ms:
+                self.wait_max_ms = wait_ms
+            for index, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self._wait_buckets[index] += 1
+                    break
+            else:
+                self._wait_buckets[-1] += 1
+
+    def record_return(self, held_ms, endpoint, blueprint):
+        with self._lock:
+            self.returns += 1
+            self._by_endpoint.setdefault(endpoint, HoldStats()).record(held_ms)
+            self._by_blueprint.setdefault(blueprint, HoldStats()).record(held_ms)
+
+    def record_created(self):
+        with self._lock:
+            self.connections_created += 1
+
+    def record_closed(self):
+        with self._lock:
+            self.connections_closed += 1
+
+    def record_dead_replaced(self):
+        with self._lock:
+            self.dead_replaced += 1
+
+    def record_exhausted(self):
+        with self._lock:
+            self.exhausted += 1
+
+    def record_recycled(self):
+        with self._lock:
+            self.recycled += 1
+
+    def record_reaped(self):
+        with self._lock:
+            self.reaped += 1
+
+    def record_validated(self):
+        with self._lock:
+            self.validations += 1
+
+    def record_rollback_skipped(self):
+        with self._lock:
+            self.rollbacks_skipped += 1
+
+    def record_leak_warning(self):
+        with self._lock:
+            self.leak_warnings += 1
+
+    def record_lease_reclaimed(self):
+        with self._lock:
+            self.leases_reclaimed += 1
+
+    def wait_histogram(self):
+        """Cumulative histogram of checkout waits, Prometheus style"""
+        with self._lock:
+            buckets = list(self._wait_buckets)
+        histogram = []
+        running = 0
+        for bound, count in zip(WAIT_BUCKETS_MS, buckets):
+            running += count
+            histogram.append({'le_ms': bound, 'count': running})
+        running += buckets[-1]
+        histogram.append({'le_ms': '+Inf', 'count': running})
+        return histogram
+
+    def blueprint_ranking(self, limit=10):
+        """Blueprints ordered by total time spent holding connections"""
+        with self._lock:
+            items = [(name, stats.to_dict()) for name, stats in self._by_blueprint.items()]
+        items.sort(key=lambda item: item[1]['total_ms'], reverse=True)
+        return [dict(blueprint=name, **stats) for name, stats in items[:limit]]
+
+    def endpoint_hold_times(self):
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._by_endpoint.items()}
+
+    def snapshot(self):
+        with self._lock:
+            counters = {
+                'checkouts': self.checkouts,
+                'returns': self.returns,
+                'connections_created': self.connections_created,
+                'connections_closed': self.connections_closed,
+                'dead_replaced': self.dead_replaced,
+                'exhausted': self.exhausted,
+                'recycled': self.recycled,
+                'reaped': self.reaped,
+                'validations': self.validations,
+                'rollbacks_skipped': self.rollbacks_skipped,
+                'leak_warnings': self.leak_warnings,
+                'leases_reclaimed': self.leases_reclaimed,
+                'wait_avg_ms': round(self.wait_total_ms / self.checkouts, 2) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.wait_max_ms, 2),
+                'uptime_seconds': round(time.time() - self.started_at, 1)
+            }
+        counters['wait_histogram'] = self.wait_histogram()
+        counters['blueprint_ranking'] = self.blueprint_ranking()
+        counters['endpoint_hold_times'] = self.endpoint_hold_times()
+        return counters
+
+
+def current_request_labels():
+    """Return (endpoint, blueprint) for the active Flask request, if any"""
+    try:
+        from flask import has_request_context, request
+        if has_request_context():
+            return request.endpoint or request.path, request.blueprint or 'app'
+    except ImportError:
+        pass
+    return 'background', 'background'
+
+
+def render_prometheus(stats, prefix='pms_db_pool'):
+    """Render a pool stats dict in the Prometheus text exposition format"""
+    lines = []
+
+    def gauge(name, value, help_text, kind='gauge'):
+        lines.append(f'# HELP {prefix}_{name} {help_text}')
+        lines.append(f'# TYPE {prefix}_{name} {kind}')
+        lines.append(f'{prefix}_{name} {value}')
+
+    gauge('size', stats['size'], 'Open connections owned by the pool')
+    gauge('max_size', stats['max_size'], 'Configured maximum pool size')
+    gauge('in_use', stats['in_use'], 'Connections currently leased')
+    gauge('idle', stats['idle'], 'Connections idle in the pool')
+    gauge('checkouts_total', stats['checkouts'], 'Connections handed out', 'counter')
+    gauge('exhausted_total', stats['exhausted'], 'Checkouts that found the pool exhausted', 'counter')
+    gauge('dead_replaced_total', stats['dead_replaced'], 'Dead connections replaced on checkout', 'counter')
+    gauge('connections_created_total', stats['connections_created'], 'Connections opened', 'counter')
+    gauge('recycled_total', stats['recycled'], 'Connections closed for exceeding their maximum lifetime', 'counter')
+    gauge('reaped_total', stats['reaped'], 'Idle connections closed by the reaper', 'counter')
+    gauge('leases_reclaimed_total', stats['leases_reclaimed'], 'Leaked leases reclaimed by the pool', 'counter')
+
+    lines.append(f'# HELP {prefix}_wait_ms Checkout wait time in milliseconds')
+    lines.append(f'# TYPE {prefix}_wait_ms histogram')
+    for bucket in stats['wait_histogram']:
+        lines.append(f'{prefix}_wait_ms_bucket{{le="{bucket["le_ms"]}"}} {bucket["count"]}')
+    lines.append(f'{prefix}_wait_ms_count {stats["checkouts"]}')
+
+    lines.append(f'# HELP {prefix}_hold_ms_total Time connections were held, per blueprint')
+    lines.append(f'# TYPE {prefix}_hold_ms_total counter')
+    for entry in stats['blueprint_ranking']:
+        lines.append(f'{prefix}_hold_ms_total{{blueprint="{entry["blueprint"]}"}} {entry["total_ms"]}')
+
+    return '\n'.join(lines) + '\n'
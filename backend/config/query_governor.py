@@ -0,0 +1,135 @@
+"""
+Statement time budgets per endpoint class.
+
+Every statement run through execute_query() belongs to a class:
+- interactive: ordinary API requests (shop floor, planning screens)
+- analytics: reports and capacity views; use @query_class('analytics') or list
+  the blueprint in DB_ANALYTICS_BLUEPRINTS
+- background: scheduler jobs and anything outside a request
+- write: writes, locking reads and everything inside transaction(), whatever
+  the endpoint, unless the endpoint's own class allows longer
+
+Plain reads get a MAX_EXECUTION_TIME optimizer hint so MySQL aborts them at
+the class budget, plus a client read timeout slightly above it as a backstop
+for servers that ignore the hint. Writes are never hinted; they only get the
+longer read timeout of the write class, so a bulk import is not cut off
+mid-transaction by an interactive budget.
+"""
+import os
+import re
+from functools import wraps
+from threading import Lock
+from flask import g, has_request_context, request
+
+QUERY_CLASSES = ('interactive', 'analytics', 'background', 'write')
+
+BUDGETS_MS = {
+    'interactive': int(os.getenv('DB_BUDGET_INTERACTIVE_MS', 5000)),
+    'analytics': int(os.getenv('DB_BUDGET_ANALYTICS_MS', 20000)),
+    'background': int(os.getenv('DB_BUDGET_BACKGROUND_MS', 120000)),
+    'write': int(os.getenv('DB_BUDGET_WRITE_MS', 60000))
+}
+ANALYTICS_BLUEPRINTS = frozenset(
+    name.strip() for name in os.getenv('DB_ANALYTICS_BLUEPRINTS', 'reports').split(',') if name.strip()
+)
+READ_TIMEOUT_GRACE_SECONDS = 2
+
+# MySQL error codes for a statement killed by MAX_EXECUTION_TIME and for a
+# client-side read timeout (the connection is dropped)
+ER_QUERY_TIMEOUT = 3024
+CR_SERVER_LOST = 2013
+
+_LEADING_SELECT = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+
+_lock = Lock()
+_counters = {name: {'statements': 0, 'budget_exceeded': 0} for name in QUERY_CLASSES}
+
+
+def query_class(name):
+    """View decorator assigning the endpoint's statements to a budget class"""
+    if name not in QUERY_CLASSES:
+        raise ValueError(f"Unknown query class: {name}")
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            g._query_class = name
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+
+def current_query_class():
+    if not has_request_context():
+        return 'background'
+    explicit = g.get('_query_class')
+    if explicit:
+        return explicit
+    if request.blueprint in ANALYTICS_BLUEPRINTS:
+        return 'analytics'
+    return 'interactive'
+
+
+def statement_class(name, read_only):
+    """Budget class for one statement of a request in class name"""
+    if read_only or BUDGETS_MS[name] >= BUDGETS_MS['write']:
+        return name
+    return 'write'
+
+
+def budget_ms(name=None):
+    return BUDGETS_MS[name or current_query_class()]
+
+
+def apply_budget(query, name):
+    """Add a MAX_EXECUTION_TIME hint to a plain SELECT (the hint only applies to SELECT)"""
+    if 'MAX_EXECUTION_TIME' in query.upper():
+        return query
+    match = _LEADING_SELECT.match(query)
+    if not match:
+        return query
+    return f"{query[:match.end()]} /*+ MAX_EXECUTION_TIME({BUDGETS_MS[name]}) */{query[match.end():]}"
+
+
+def read_timeout_seconds(name):
+    return BUDGETS_MS[name] / 1000.0 + READ_TIMEOUT_GRACE_SECONDS
+
+
+def is_budget_violation(error, elapsed_seconds, name):
+    """Server-side abort, or a lost connection that coincides with our read timeout"""
+    code = error.args[0] if getattr(error, 'args', None) else None
+    if code == ER_QUERY_TIMEOUT:
+        return True
+    return code == CR_SERVER_LOST and elapsed_seconds >= read_timeout_seconds(name)
+
+
+def record_statement(name):
+    with _lock:
+        _counters[name]['statements'] += 1
+
+
+def record_violation(name):
+    with _lock:
+        _counters[name]['budget_exceeded'] += 1
+
+
+def governor_stats():
+    with _lock:
+        return {
+            name: dict(counters, budget_ms=BUDGETS_MS[name])
+            for name, counters in _counters.items()
+        }
+
+
+def render_prometheus(stats, prefix='pms_db_query'):
+    lines = [
+        f'# HELP {prefix}_budget_exceeded_total Statements aborted for exceeding their class time budget',
+        f'# TYPE {prefix}_budget_exceeded_total counter'
+    ]
+    for name, counters in stats.items():
+        lines.append(f'{prefix}_budget_exceeded_total{{class="{name}"}} {counters["budget_exceeded"]}')
+    lines.append(f'# HELP {prefix}_statements_total Statements run, per budget class')
+    lines.append(f'# TYPE {prefix}_statements_total counter')
+    for name, counters in stats.items():
+        lines.append(f'{prefix}_statements_total{{class="{name}"}} {counters["statements"]}')
+    return '\n'.join(lines) + '\n'
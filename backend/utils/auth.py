@@ -2,13 +2,29 @@ import jwt
 import bcrypt
 import os
 import json
+import time
 from datetime import datetime, timedelta
 from functools import wraps
+from threading import Lock
 from flask import request, jsonify
 from backend.config.database import execute_query
+from backend.config import cache_bus
 
 SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this')
 
+# Set only by backend.api.batch on the sub-requests it dispatches
+BATCH_USER_ENVIRON_KEY = 'pms.batch_user'
+
+# Per-worker cache: user_id -> role_id and role_id -> parsed permissions.
+# Role changes call invalidate_permissions(), which reaches every worker
+# through cache_bus; the TTL bounds staleness if a broadcast is lost.
+PERMISSION_CACHE_TTL = int(os.getenv('PERMISSION_CACHE_TTL_SECONDS', 300))
+
+_permission_lock = Lock()
+_user_roles = {}
+_role_permissions = {}
+_permission_generation = 0
+
 def hash_password(password):
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
@@ -36,6 +52,13 @@ def decode_token(token):
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
+        # Batch sub-requests carry the batch's already verified user in their
+        # WSGI environ, which only the in-process dispatcher can set
+        batch_user = request.environ.get(BATCH_USER_ENVIRON_KEY)
+        if batch_user is not None:
+            request.current_user = batch_user
+            return f(*args, **kwargs)
+        
         token = None
         
         if 'Authorization' in request.headers:
@@ -57,36 +80,84 @@ def token_required(f):
     
     return decorated
 
+def _parse_permissions(permissions):
+    # Parse permissions if it's a JSON string
+    if isinstance(permissions, str):
+        try:
+            permissions = json.loads(permissions)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            permissions = {}
+    
+    # Ensure permissions is a dict
+    if not isinstance(permissions, dict):
+        permissions = {}
+    return permissions
+
+def get_user_permissions(user_id):
+    """Parsed role permissions for user_id, or None if the user has no role"""
+    now = time.monotonic()
+    with _permission_lock:
+        role = _user_roles.get(user_id)
+        if role and role[1] > now:
+            permissions = _role_permissions.get(role[0])
+            if permissions and permissions[1] > now:
+                return permissions[0]
+        generation = _permission_generation
+    
+    query = """
+        SELECT u.role_id, r.permissions 
+        FROM roles r
+        JOIN users u ON u.role_id = r.id
+        WHERE u.id = %s
+    """
+    role = execute_query(query, (user_id,), fetch_one=True)
+    if not role:
+        return None
+    
+    permissions = _parse_permissions(role.get('permissions', '{}'))
+    with _permission_lock:
+        # Skip the store if an invalidation arrived while we were querying
+        if generation == _permission_generation:
+            expires_at = now + PERMISSION_CACHE_TTL
+            _user_roles[user_id] = (role['role_id'], expires_at)
+            _role_permissions[role['role_id']] = (permissions, expires_at)
+    return permissions
+
+def _drop_permissions(data):
+    global _permission_generation
+    role_id = (data or {}).get('role_id')
+    user_id = (data or {}).get('user_id')
+    with _permission_lock:
+        _permission_generation += 1
+        if role_id is None and user_id is None:
+            _user_roles.clear()
+            _role_permissions.clear()
+            return
+        if role_id is not None:
+            _role_permissions.pop(role_id, None)
+        if user_id is not None:
+            _user_roles.pop(user_id, None)
+
+cache_bus.subscribe('permissions', _drop_permissions)
+
+def invalidate_permissions(role_id=None, user_id=None):
+    """
+    Call after changing a role's permissions (role_id) or a user's role
+    (user_id); with neither, every cached entry is dropped. Applies to all
+    workers.
+    """
+    cache_bus.publish('permissions', {'role_id': role_id, 'user_id': user_id})
+
 def permission_required(module, action):
     def decorator(f):
         @wraps(f)
         def decorated(*args, **kwargs):
             user = request.current_user
             
-            query = """
-                SELECT r.permissions 
-                FROM roles r
-                JOIN users u ON u.role_id = r.id
-                WHERE u.id = %s
-            """
-            role = execute_query(query, (user['user_id'],), fetch_one=True)
-            
-            if not role:
+            permissions = get_user_permissions(user['user_id'])
+            if permissions is None:
                 return jsonify({'error': 'Unauthorized'}), 403
             
-            permissions = role.get('permissions', '{}')
-            
-            # Parse permissions if it's a JSON string
-            if isinstance(permissions, str):
-                try:
-                    permissions = json.loads(permissions)
-                except (json.JSONDecodeError, TypeError, ValueError):
-                    permissions = {}
-            
-            # Ensure permissions is a dict
-            if not isinstance(permissions, dict):
-                permissions = {}
-            
             if permissions.get('all'):
                 return f(*args, **kwargs)
             
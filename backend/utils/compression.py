@@ -0,0 +1,220 @@
+"""
+Negotiated gzip/brotli compression of JSON responses.
+
+Order lists, replacement tickets, the machine calendar and job assignments
+return megabytes of JSON to tablets on weak Wi-Fi; JSON compresses roughly
+tenfold. An after_request hook compresses JSON bodies of at least
+COMPRESSION_MIN_BYTES with the best encoding the client accepts: brotli when
+the optional `brotli` package is installed, else gzip. Streamed responses
+are compressed chunk by chunk as they are sent.
+
+Responses that already carry a Content-Encoding, ask for no-transform, or
+are not JSON pass through untouched. Compressing changes the representation,
+so a strong ETag is weakened; If-None-Match uses weak comparison and still
+matches. Bytes in and out per encoding are kept for /health/metrics.
+"""
+import os
+import zlib
+from threading import Lock
+from flask import request
+from backend.utils.logger import app_logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+
+# zlib wbits for a gzip header and trailer
+GZIP_WBITS = 31
+# Streamed input between flushes: each flush costs ratio but lets the
+# client parse what has arrived
+STREAM_FLUSH_BYTES = 16384
+
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+_lock = Lock()
+_counters = {
+    encoding: {'responses': 0, 'bytes_in': 0, 'bytes_out': 0}
+    for encoding in ENCODINGS
+}
+_skipped = {'small': 0, 'not_accepted': 0}
+
+
+def _record(encoding, bytes_in, bytes_out):
+    with _lock:
+        counters = _counters[encoding]
+        counters['responses'] += 1
+        counters['bytes_in'] += bytes_in
+        counters['bytes_out'] += bytes_out
+
+
+def _skip(reason):
+    with _lock:
+        _skipped[reason] += 1
+
+
+class _GzipCompressor:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        # Emit what is buffered so a streamed client can start parsing
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def _compressor(encoding):
+    return _BrotliCompressor() if encoding == 'br' else _GzipCompressor()
+
+
+def _negotiate():
+    """Best accepted encoding, preferring brotli on equal quality; None for identity"""
+    accepted = request.accept_encodings
+    best, best_quality = None, 0
+    for encoding in ENCODINGS:
+        quality = accepted[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _is_json(response):
+    mimetype = response.mimetype or ''
+    return mimetype == 'application/json' or mimetype.endswith('+json')
+
+
+def _eligible(response):
+    if request.method == 'HEAD' or response.status_code in (204, 206, 304) or response.status_code < 200:
+        return False
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    if 'no-transform' in (response.headers.get('Cache-Control') or ''):
+        return False
+    return _is_json(response)
+
+
+def _weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def _stream(chunks, compressor, encoding):
+    bytes_in = bytes_out = pending = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            bytes_in += len(chunk)
+            pending += len(chunk)
+            data = compressor.compress(chunk)
+            if pending >= STREAM_FLUSH_BYTES:
+                data += compressor.flush()
+                pending = 0
+            bytes_out += len(data)
+            if data:
+                yield data
+        data = compressor.finish()
+        bytes_out += len(data)
+        yield data
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    _record(encoding, bytes_in, bytes_out)
+
+
+def compress_response(response):
+    """after_request hook; returns the response compressed in place when worthwhile"""
+    if not _eligible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    encoding = _negotiate()
+    if encoding is None:
+        _skip('not_accepted')
+        return response
+
+    if response.is_streamed:
+        response.response = _stream(response.response, _compressor(encoding), encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < COMPRESSION_MIN_BYTES:
+            _skip('small')
+            return response
+        compressor = _compressor(encoding)
+        compressed = compressor.compress(body) + compressor.finish()
+        response.set_data(compressed)
+        _record(encoding, len(body), len(compressed))
+
+    response.headers['Content-Encoding'] = encoding
+    _weaken_etag(response)
+    return response
+
+
+def compression_stats():
+    with _lock:
+        stats = {encoding: dict(counters) for encoding, counters in _counters.items()}
+        skipped = dict(_skipped)
+    for counters in stats.values():
+        counters['ratio'] = round(counters['bytes_in'] / counters['bytes_out'], 2) if counters['bytes_out'] else None
+    return {
+        'enabled': COMPRESSION_ENABLED,
+        'min_bytes': COMPRESSION_MIN_BYTES,
+        'encodings': stats,
+        'skipped': skipped
+    }
+
+
+def render_prometheus(stats, prefix='pms_http_compression'):
+    lines = [
+        f'# HELP {prefix}_responses_total Responses compressed, per encoding',
+        f'# TYPE {prefix}_responses_total counter'
+    ]
+    for encoding, counters in stats['encodings'].items():
+        lines.append(f'{prefix}_responses_total{{encoding="{encoding}"}} {counters["responses"]}')
+    lines.append(f'# HELP {prefix}_bytes_in_total Uncompressed bytes of compressed responses')
+    lines.append(f'# TYPE {prefix}_bytes_in_total counter')
+    for encoding, counters in stats['encodings'].items():
+        lines.append(f'{prefix}_bytes_in_total{{encoding="{encoding}"}} {counters["bytes_in"]}')
+    lines.append(f'# HELP {prefix}_bytes_out_total Bytes sent after compression')
+    lines.append(f'# TYPE {prefix}_bytes_out_total counter')
+    for encoding, counters in stats['encodings'].items():
+        lines.append(f'{prefix}_bytes_out_total{{encoding="{encoding}"}} {counters["bytes_out"]}')
+    lines.append(f'# HELP {prefix}_skipped_total Eligible JSON responses sent uncompressed')
+    lines.append(f'# TYPE {prefix}_skipped_total counter')
+    for reason, count in stats['skipped'].items():
+        lines.append(f'{prefix}_skipped_total{{reason="{reason}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def init_compression(app):
+    """Compress JSON responses (no-op with COMPRESSION_ENABLED=false)"""
+    if not COMPRESSION_ENABLED:
+        return
+    app.after_request(compress_response)
+    app_logger.info(f"Response compression enabled: {', '.join(ENCODINGS)} above {COMPRESSION_MIN_BYTES} bytes")
@@ -3,7 +3,7 @@ from werkzeug.exceptions import HTTPException
 import traceback
 from backend.utils.logger import app_logger, security_logger
 from backend.utils.response import error_response
-import pymysql
+from backend.config import db_driver
 
 class PMSException(Exception):
     def __init__(self, message, status_code=400, payload=None):
@@ -46,6 +46,23 @@ class BusinessLogicError(PMSException):
     def __init__(self, message, payload=None):
         super().__init__(message, status_code=422, payload=payload)
 
+class ServiceUnavailableError(PMSException):
+    def __init__(self, message="Service temporarily unavailable", retry_after=None, payload=None):
+        super().__init__(message, status_code=503, payload=payload)
+        self.retry_after = retry_after
+
+class PoolExhaustedError(ServiceUnavailableError):
+    def __init__(self, message="Server is busy, please retry shortly", retry_after=None, payload=None):
+        super().__init__(message, retry_after=retry_after, payload=payload)
+
+class QueryBudgetExceededError(PMSException):
+    def __init__(self, query_class, budget_ms, payload=None):
+        message = "Query took too long and was stopped; narrow the filters or date range and retry"
+        payload = dict(payload or (), query_class=query_class, budget_ms=budget_ms)
+        super().__init__(message, status_code=503, payload=payload)
+        self.query_class = query_class
+        self.budget_ms = budget_ms
+
 def register_error_handlers(app):
     
     @app.errorhandler(PMSException)
@@ -57,6 +74,17 @@ def register_error_handlers(app):
         })
         return jsonify(error.to_dict()), error.status_code
     
+    @app.errorhandler(ServiceUnavailableError)
+    def handle_service_unavailable(error):
+        app_logger.warning(f"Service Unavailable: {error.message}", extra={
+            'path': request.path,
+            'method': request.method
+        })
+        response, status_code = error_response(error.message, error.status_code)
+        if error.retry_after:
+            response.headers['Retry-After'] = str(error.retry_after)
+        return response, status_code
+    
     @app.errorhandler(ValidationError)
     def handle_validation_error(error):
         app_logger.warning(f"Validation Error: {error.message}", extra={
@@ -106,7 +134,6 @@ def register_error_handlers(app):
         })
         return error_response("Rate limit exceeded. Please try again later.", 429)
     
-    @app.errorhandler(pymysql.Error)
     def handle_database_error(error):
         app_logger.error(f"Database Error: {str(error)}", extra={
             'path': request.path,
@@ -114,13 +141,16 @@ def register_error_handlers(app):
             'error_code': error.args[0] if error.args else None
         }, exc_info=True)
         
-        if isinstance(error, pymysql.IntegrityError):
+        if isinstance(error, db_driver.IntegrityError):
             return error_response("Data integrity violation. Please check your input.", 409)
-        elif isinstance(error, pymysql.OperationalError):
+        elif isinstance(error, db_driver.OperationalError):
             return error_response("Database connection error. Please try again.", 503)
         else:
             return error_response("Database operation failed", 500)
     
+    for error_class in db_driver.Error:
+        app.register_error_handler(error_class, handle_database_error)
+    
     @app.errorhandler(HTTPException)
     def handle_http_exception(error):
         app_logger.warning(f"HTTP Exception: {error.code} - {error.description}", extra={
@@ -0,0 +1,103 @@
+"""Sparse fieldsets (?fields=) for list endpoints"""
+from flask import request
+from backend.utils.error_handler import ValidationError
+from backend.utils.reference_cache import name_attacher
+
+
+class FieldSet:
+    """
+    The columns one list request selects. Without ?fields= it is the
+    endpoint's full listing; with it, only the whitelisted fields asked for
+    are selected, and joins no selected column uses are left out.
+
+    Fields the endpoint itself needs (id and sort key for keyset cursors, id
+    columns behind attached names) can be added with require(); prepare()
+    drops them again unless they were asked for.
+    """
+
+    def __init__(self, columns, star, joins, names, fields=None):
+        self.columns = columns
+        self.star = star
+        self.join_clauses = joins
+        self.fields = fields
+        if fields is None:
+            self.names = list(names)
+            self._selected = None
+        else:
+            self.names = [spec for spec in names if spec[2] in fields]
+            self._selected = [field for field in fields if field in columns]
+        self._hidden = []
+        # Names are attached from their id column, which must be selected
+        self.require(*(spec[1] for spec in self.names))
+
+    def require(self, *fields):
+        if self._selected is None:
+            return self
+        for field in fields:
+            if field not in self._selected:
+                self._selected.append(field)
+                self._hidden.append(field)
+        return self
+
+    def select(self):
+        """SELECT list"""
+        if self._selected is None:
+            return self.star
+        return ', '.join(f"{self.columns[field]} AS {field}" for field in self._selected)
+
+    def joins(self):
+        """JOIN clauses the SELECT list needs"""
+        if self._selected is None:
+            aliases = set(self.join_clauses)
+        else:
+            aliases = {
+                self.columns[field].split('.')[0]
+                for field in self._selected if '.' in self.columns[field]
+            }
+        return ' '.join(clause for alias, clause in self.join_clauses.items() if alias in aliases)
+
+    def prepare(self):
+        """Per-row function that attaches names and drops required-only fields"""
+        attach = name_attacher(self.names) if self.names else None
+        hidden = self._hidden
+
+        def prepare_row(row):
+            if attach:
+                attach(row)
+            for field in hidden:
+                row.pop(field, None)
+            return row
+        return prepare_row
+
+    def apply(self, rows):
+        prepare_row = self.prepare()
+        return [prepare_row(row) for row in rows]
+
+
+def get_fieldset(columns, star, joins=None, names=()):
+    """
+    Build a FieldSet from ?fields=a,b,c.
+
+    columns whitelists the public fields and maps each to its SQL expression
+    (e.g. {'order_number': 'o.order_number'}); a join alias in the
+    expression (e.g. 'o' for {'o': 'LEFT JOIN orders o ON ...'}) pulls that
+    join in. star is the SELECT list of the full listing. names are
+    attach_names() specs whose output fields may also be requested.
+    """
+    joins = joins or {}
+    raw = request.args.get('fields')
+    if not raw:
+        return FieldSet(columns, star, joins, names)
+
+    fields = []
+    allowed = set(columns) | {spec[2] for spec in names}
+    for field in raw.split(','):
+        field = field.strip()
+        if not field or field in fields:
+            continue
+        if field not in allowed:
+            raise ValidationError(f"fields may only include: {', '.join(sorted(allowed))}")
+        fields.append(field)
+    if not fields:
+        raise ValidationError('fields must name at least one field')
+    return FieldSet(columns, star, joins, names, fields)
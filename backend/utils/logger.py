@@ -117,3 +117,14 @@ api_logger = setup_logger('pms.api')
 auth_logger = setup_logger('pms.auth')
 security_logger = setup_logger('pms.security')
 audit_logger = setup_logger('pms.audit')
+
+slow_query_logger = setup_logger('pms.slow_query')
+if not any(getattr(h, 'baseFilename', '').endswith('slow_queries.log') for h in slow_query_logger.handlers):
+    slow_query_handler = RotatingFileHandler(
+        os.path.join(LOG_DIR, 'slow_queries.log'),
+        maxBytes=10 * 1024 * 1024,
+        backupCount=10
+    )
+    slow_query_handler.setLevel(logging.WARNING)
+    slow_query_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+    slow_query_logger.addHandler(slow_query_handler)
@@ -1,4 +1,4 @@
-from backend.config.database import execute_query
+from backend.config.database import execute_query, bulk_insert
 from datetime import datetime
 
 def create_notification(recipient_id, notification_type, title, message, 
@@ -18,6 +18,22 @@ def create_notification(recipient_id, notification_type, title, message,
         commit=True
     )
 
+def create_notifications(recipient_ids, notification_type, title, message,
+                         related_entity_type=None, related_entity_id=None,
+                         action_url=None, priority='normal'):
+    """Fan one notification out to many recipients with multi-row INSERTs"""
+    recipient_ids = list(dict.fromkeys(r for r in recipient_ids if r))
+    if not recipient_ids:
+        return None
+    
+    return bulk_insert(
+        'notifications',
+        ['recipient_id', 'notification_type', 'title', 'message', 'related_entity_type',
+         'related_entity_id', 'action_url', 'priority'],
+        [(recipient_id, notification_type, title, message, related_entity_type,
+          related_entity_id, action_url, priority) for recipient_id in recipient_ids]
+    )
+
 def get_user_notifications(user_id, unread_only=False, limit=50):
     query = """
         SELECT * FROM notifications 
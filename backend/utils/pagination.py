@@ -0,0 +1,165 @@
+"""Keyset (seek) pagination for list endpoints"""
+import base64
+import json
+from flask import request
+from backend.utils.error_handler import ValidationError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort, descending, values, row_id):
+    payload = json.dumps([sort, 'desc' if descending else 'asc', values, row_id], default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort, direction, values, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list):
+            values = [values]
+        return sort, direction == 'desc', values, int(row_id)
+    except (ValueError, TypeError):
+        raise ValidationError('Invalid pagination cursor')
+
+
+def _after(column, value, descending):
+    """Predicate for rows past value in column, or None if there are none"""
+    # MySQL sorts NULLs first ascending and last descending
+    if value is None:
+        return (None, ()) if descending else (f"{column} IS NOT NULL", ())
+    if descending:
+        return f"({column} < %s OR {column} IS NULL)", (value,)
+    return f"{column} > %s", (value,)
+
+
+def _equal(column, value):
+    if value is None:
+        return f"{column} IS NULL", ()
+    return f"{column} = %s", (value,)
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated listing. Rows are ordered by the sort
+    columns, then id, and the next page starts strictly after the last row
+    seen, so the database seeks straight to it through the index instead of
+    scanning and discarding OFFSET rows. Sort columns may hold NULLs; they
+    keep MySQL's usual place in the order.
+    """
+
+    def __init__(self, sort, columns, descending, limit, after=None):
+        self.sort = sort
+        self.columns = columns
+        self.descending = descending
+        self.limit = limit
+        self.after = after
+        self.next_cursor = None
+
+    @property
+    def keys(self):
+        """Row fields the next cursor is built from, besides id"""
+        return [column.split('.')[-1] for column in self.columns]
+
+    def _seek(self, id_column):
+        values, row_id = self.after
+        branches = []
+        params = []
+        # Lexicographic "after": equal on every earlier column, past on this one
+        for index, column in enumerate(self.columns):
+            past, past_params = _after(column, values[index], self.descending)
+            if past is None:
+                continue
+            terms = []
+            for earlier, value in zip(self.columns[:index], values):
+                term, term_params = _equal(earlier, value)
+                terms.append(term)
+                params.extend(term_params)
+            branches.append(' AND '.join(terms + [past]))
+            params.extend(past_params)
+        terms = []
+        for column, value in zip(self.columns, values):
+            term, term_params = _equal(column, value)
+            terms.append(term)
+            params.extend(term_params)
+        branches.append(' AND '.join(terms + [f"{id_column} {'<' if self.descending else '>'} %s"]))
+        params.append(row_id)
+        return ' OR '.join(f"({branch})" for branch in branches), params
+
+    def apply(self, query, params, id_column):
+        """Append the seek predicate, ORDER BY and LIMIT to a query ending in its WHERE clause"""
+        params = list(params or [])
+        direction = 'DESC' if self.descending else 'ASC'
+        if self.after is not None:
+            seek, seek_params = self._seek(id_column)
+            query += f" AND ({seek})"
+            params.extend(seek_params)
+        # One extra row tells us whether another page exists
+        order = ', '.join(f"{column} {direction}" for column in self.columns + (id_column,))
+        query += f" ORDER BY {order} LIMIT %s"
+        params.append(self.limit + 1)
+        return query, tuple(params)
+
+    def finish(self, rows, id_key='id'):
+        """Trim the look-ahead row and compute next_cursor from the last row kept"""
+        rows = list(rows)
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            self.next_cursor = encode_cursor(
+                self.sort, self.descending, [last[key] for key in self.keys], last[id_key]
+            )
+        return rows
+
+    def to_dict(self):
+        return {
+            'limit': self.limit,
+            'sort': self.sort,
+            'order': 'desc' if self.descending else 'asc',
+            'next_cursor': self.next_cursor,
+            'has_more': self.next_cursor is not None
+        }
+
+
+def get_keyset_page(sort_columns, default_sort='created_at'):
+    """
+    Build a KeysetPage from ?limit=, ?cursor=, ?sort= and ?order=.
+
+    sort_columns whitelists the public sort keys and maps each to its
+    qualified column (e.g. {'created_at': 'o.created_at'}), or to a tuple
+    of columns to sort by in turn (e.g. {'priority': ('mt.priority_order',
+    'mt.created_at')}); they should be indexed together. Returns None when
+    the request asks for neither a limit nor a cursor, so existing callers
+    keep the full listing.
+    """
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        return None
+
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValidationError('limit must be an integer')
+    if limit < 1:
+        raise ValidationError('limit must be positive')
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        # The cursor pins the sort it was issued for
+        sort, descending, values, row_id = decode_cursor(cursor)
+        after = (values, row_id)
+    else:
+        sort = request.args.get('sort', default_sort)
+        descending = request.args.get('order', 'desc').lower() != 'asc'
+        after = None
+
+    if sort not in sort_columns:
+        raise ValidationError(f"sort must be one of: {', '.join(sorted(sort_columns))}")
+
+    columns = sort_columns[sort]
+    if isinstance(columns, str):
+        columns = (columns,)
+    if after is not None and len(after[0]) != len(columns):
+        raise ValidationError('Invalid pagination cursor')
+    return KeysetPage(sort, tuple(columns), descending, limit, after)
@@ -0,0 +1,162 @@
+"""Per-request SQL profiling: statement fingerprints, N+1 detection and the slow query log"""
+import os
+import re
+import time
+import json
+from threading import Lock
+from functools import lru_cache
+from flask import g, request, has_request_context
+from backend.utils.logger import db_logger, slow_query_logger
+
+PROFILING_ENABLED = os.getenv('DB_PROFILING', 'true').lower() in ('1', 'true', 'yes')
+SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 500))
+NPLUS1_THRESHOLD = int(os.getenv('DB_NPLUS1_THRESHOLD', 5))
+EXPLAIN_COOLDOWN_SECONDS = 600
+# JSON-lines file receiving one sample (query + params) per fingerprint, for
+# scripts/index_advisor.py; unset disables capture
+CAPTURE_PATH = os.getenv('DB_QUERY_CAPTURE') or None
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_explained_at = {}
+_captured = set()
+_capture_lock = Lock()
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(query):
+    """Normalize a statement so calls that differ only in values compare equal"""
+    normalized = _STRING_LITERAL.sub('?', query)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip()
+    return _VALUE_LIST.sub('(?+)', normalized)
+
+
+class RequestProfile:
+    """Statements issued while serving one request, grouped by fingerprint"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements = {}
+        self.repeated = []
+
+    def record(self, fp, duration_ms, rows):
+        self.count += 1
+        self.total_ms += duration_ms
+        entry = self.statements.get(fp)
+        if entry is None:
+            entry = self.statements[fp] = {'count': 0, 'total_ms': 0.0, 'rows': 0}
+        entry['count'] += 1
+        entry['total_ms'] += duration_ms
+        entry['rows'] += rows or 0
+        return entry['count']
+
+    def summary(self):
+        return {
+            'query_count': self.count,
+            'total_ms': round(self.total_ms, 2),
+            'repeated': self.repeated,
+            'statements': [
+                dict(fingerprint=fp, **{k: round(v, 2) if isinstance(v, float) else v for k, v in entry.items()})
+                for fp, entry in sorted(self.statements.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+            ]
+        }
+
+
+def current_profile():
+    """The active request's profile, created on first use; None outside a request"""
+    if not PROFILING_ENABLED or not has_request_context():
+        return None
+    profile = g.get('_query_profile')
+    if profile is None:
+        profile = g._query_profile = RequestProfile()
+    return profile
+
+
+def record_query(query, params, duration_ms, rows, explain=None):
+    """
+    Account for one executed statement. Repeated fingerprints within a
+    request are reported as a likely N+1 once they reach NPLUS1_THRESHOLD;
+    statements slower than SLOW_QUERY_MS go to the slow query log, with the
+    EXPLAIN plan when an explain callback is supplied.
+    """
+    if not PROFILING_ENABLED:
+        return
+    fp = fingerprint(query)
+    profile = current_profile()
+    if profile is not None:
+        if profile.record(fp, duration_ms, rows) == NPLUS1_THRESHOLD:
+            profile.repeated.append(fp)
+            db_logger.warning(
+                f"Possible N+1: statement ran {NPLUS1_THRESHOLD}+ times in {request.endpoint}: {fp[:200]}"
+            )
+    if duration_ms >= SLOW_QUERY_MS:
+        _log_slow_query(query, params, fp, duration_ms, rows, explain)
+    if CAPTURE_PATH and fp not in _captured:
+        _capture(query, params, fp)
+
+
+def _capture(query, params, fp):
+    if not fp.lower().startswith(('select', 'update', 'delete')):
+        return
+    with _capture_lock:
+        if fp in _captured:
+            return
+        _captured.add(fp)
+        try:
+            with open(CAPTURE_PATH, 'a') as capture_file:
+                capture_file.write(json.dumps({
+                    'fingerprint': fp,
+                    'query': query.strip(),
+                    'params': list(params) if isinstance(params, (list, tuple)) else params,
+                    'endpoint': request.endpoint if has_request_context() else 'background'
+                }, default=str) + '\n')
+        except OSError as e:
+            db_logger.warning(f"Query capture to {CAPTURE_PATH} failed: {e}")
+
+
+def _log_slow_query(query, params, fp, duration_ms, rows, explain):
+    plan = None
+    now = time.monotonic()
+    if explain is not None and fp.lower().startswith(('select', 'with')):
+        # EXPLAIN each fingerprint at most once per cooldown window
+        if now - _explained_at.get(fp, -EXPLAIN_COOLDOWN_SECONDS) >= EXPLAIN_COOLDOWN_SECONDS:
+            _explained_at[fp] = now
+            try:
+                plan = explain(query, params)
+            except Exception as e:
+                plan = f"EXPLAIN failed: {e}"
+    slow_query_logger.warning(json.dumps({
+        'duration_ms': round(duration_ms, 2),
+        'rows': rows,
+        'endpoint': request.endpoint if has_request_context() else 'background',
+        'fingerprint': fp,
+        'query': query.strip()[:2000],
+        'explain': plan
+    }, default=str))
+
+
+def init_query_profiler(app):
+    """Log per-request totals and, in debug mode, expose them as response headers"""
+    force_headers = os.getenv('DB_PROFILE_HEADERS', 'false').lower() in ('1', 'true', 'yes')
+
+    @app.after_request
+    def add_query_profile_headers(response):
+        profile = g.get('_query_profile')
+        if profile is None:
+            return response
+        if app.debug or force_headers:
+            response.headers['X-DB-Query-Count'] = str(profile.count)
+            response.headers['X-DB-Time'] = f"{profile.total_ms:.2f}"
+            if profile.repeated:
+                response.headers['X-DB-Repeated-Statements'] = str(len(profile.repeated))
+        db_logger.debug(
+            f"{request.method} {request.path}: {profile.count} queries in {profile.total_ms:.2f}ms"
+        )
+        return response
@@ -0,0 +1,209 @@
+"""
+Per-worker read-through cache of reference data.
+
+Departments, production stages, machines, roles, and product, user and
+employee display names are small and change rarely, yet nearly every list
+query joins them in. Each table below is loaded whole on first use (or by
+warm_reference_cache() at worker start). It is then served from memory until
+an admin write calls invalidate_reference(table), which reaches every worker
+through cache_bus. REFERENCE_CACHE_TTL_SECONDS bounds staleness if a broadcast
+is lost.
+
+    from backend.utils.reference_cache import reference, attach_names
+
+    reference('departments').get(7)['name']
+    attach_names(rows, [
+        ('departments', 'department_id', 'department_name'),
+        ('users', 'created_by_id', 'created_by_name'),
+        ('products', 'product_id', 'product_code', 'product_code'),
+    ])
+"""
+import os
+import json
+import time
+import hashlib
+from threading import Lock
+from backend.config.database import execute_query
+from backend.config import cache_bus
+from backend.utils.result_cache import invalidate_table
+from backend.utils.logger import app_logger
+
+REFERENCE_CACHE_TTL = int(os.getenv('REFERENCE_CACHE_TTL_SECONDS', 600))
+
+# name -> (query, display column)
+REFERENCE_TABLES = {
+    'departments': (
+        """SELECT d.*, CONCAT(u.first_name, ' ', u.last_name) as manager_name
+           FROM departments d
+           LEFT JOIN users u ON d.manager_id = u.id""",
+        'name'
+    ),
+    'production_stages': ("SELECT * FROM production_stages", 'stage_name'),
+    'machines': ("SELECT * FROM machines", 'machine_name'),
+    'products': ("SELECT id, product_code, product_name, category FROM products", 'product_name'),
+    'roles': ("SELECT id, name, description FROM roles", 'name'),
+    'users': (
+        "SELECT id, username, CONCAT(first_name, ' ', last_name) as full_name FROM users",
+        'full_name'
+    ),
+    'employees': (
+        """SELECT id, user_id, department_id, employee_number, employee_type, is_active,
+                  CONCAT(first_name, ' ', last_name) as full_name
+           FROM employees""",
+        'full_name'
+    )
+}
+
+# Tables whose cached rows embed another table's data
+DEPENDENTS = {
+    'users': ('departments',)
+}
+
+
+class ReferenceTable:
+    def __init__(self, name, query, display):
+        self.name = name
+        self.query = query
+        self.display = display
+        self._lock = Lock()
+        self._load_lock = Lock()
+        self._state = None
+        self._expires_at = 0
+        self._generation = 0
+
+    def _fresh(self):
+        with self._lock:
+            if self._state is not None and self._expires_at > time.monotonic():
+                return self._state
+            return None
+
+    def _load(self):
+        state = self._fresh()
+        if state is not None:
+            return state
+        # One loader per worker; concurrent misses wait for its result
+        with self._load_lock:
+            state = self._fresh()
+            if state is not None:
+                return state
+            with self._lock:
+                generation = self._generation
+            rows = execute_query(self.query, fetch_all=True) or []
+            by_id = {row['id']: row for row in rows}
+            # Only the display names: responses show those, so edits to other
+            # columns (a machine's status, say) leave their ETags alone
+            version = hashlib.sha1(
+                json.dumps(sorted((id, row.get(self.display)) for id, row in by_id.items()),
+                           default=str).encode('utf-8')
+            ).hexdigest()
+            state = (by_id, version)
+            with self._lock:
+                if generation == self._generation:
+                    self._state = state
+                    self._expires_at = time.monotonic() + REFERENCE_CACHE_TTL
+        return state
+
+    def _rows_by_id(self):
+        return self._load()[0]
+
+    def version(self):
+        """Hash of the loaded display names; equal in every worker holding the same data"""
+        return self._load()[1]
+
+    def all(self):
+        """Copies of every row, in id order"""
+        return [dict(row) for _, row in sorted(self._rows_by_id().items())]
+
+    def get(self, id):
+        row = self._rows_by_id().get(_as_id(id))
+        return dict(row) if row is not None else None
+
+    def names(self, column=None):
+        """id -> display column (or column) for every row"""
+        column = column or self.display
+        return {id: row.get(column) for id, row in self._rows_by_id().items()}
+
+    def drop(self):
+        with self._lock:
+            self._generation += 1
+            self._state = None
+
+
+_tables = {name: ReferenceTable(name, query, display) for name, (query, display) in REFERENCE_TABLES.items()}
+
+
+def _as_id(value):
+    # Query-string ids arrive as str
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return value
+
+
+def reference(name):
+    return _tables[name]
+
+
+def reference_version(*names):
+    """Combined display-name version of reference tables, for ETags of responses showing their names"""
+    return ':'.join(reference(name).version()[:12] for name in names)
+
+
+def name_attacher(specs):
+    """
+    attach_names() for one row at a time, e.g. as a streamed_response()
+    transform; the name lookups are taken once, when it is created
+    """
+    lookups = [
+        (id_field, output, reference(table).names(column[0] if column else None))
+        for table, id_field, output, *column in specs
+    ]
+
+    def attach(row):
+        for id_field, output, names in lookups:
+            row[output] = names.get(row.get(id_field))
+        return row
+    return attach
+
+
+def attach_names(rows, specs):
+    """
+    Add display names to rows in place, replacing LEFT JOIN name lookups.
+    Each spec is (table, id field, output field[, source column]); unknown
+    or NULL ids give None, as the join did. Returns rows.
+    """
+    if not rows:
+        return rows
+    attach = name_attacher(specs)
+    for row in rows:
+        attach(row)
+    return rows
+
+
+def _drop_reference(data):
+    name = (data or {}).get('table')
+    names = [name] if name else list(_tables)
+    for table in list(names):
+        names.extend(DEPENDENTS.get(table, ()))
+    for table in names:
+        if table in _tables:
+            _tables[table].drop()
+
+
+cache_bus.subscribe('reference', _drop_reference)
+
+
+def invalidate_reference(table=None):
+    """Call after writing a reference table (None drops all); applies to every worker"""
+    cache_bus.publish('reference', {'table': table})
+    # Cached analytics responses embed reference names too
+    for name in [table] if table else list(_tables):
+        invalidate_table(name)
+
+
+def warm_reference_cache():
+    """Load every reference table; failures are logged and left to lazy loading"""
+    for name, table in _tables.items():
+        try:
+            table._rows_by_id()
+        except Exception as e:
+            app_logger.warning(f"Reference cache warm-up for {name} failed: {e}")
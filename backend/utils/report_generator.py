@@ -1,4 +1,4 @@
-from backend.config.database import execute_query
+from backend.config.database import execute_query, execute_stream
 from backend.utils.email_sender import send_email
 from datetime import datetime, timedelta
 import json
@@ -21,9 +21,26 @@ def generate_defects_report(config, recipients):
         ORDER BY rt.created_at DESC
     """
     
-    defects = execute_query(query, (start_date, end_date), fetch_all=True)
+    # Rows are streamed and rendered one at a time; only the HTML is kept
+    defect_count = 0
+    total_quantity = 0
+    table_rows = []
     
-    total_quantity = sum(d['quantity_rejected'] for d in defects)
+    for defect in execute_stream(query, (start_date, end_date)):
+        defect_count += 1
+        total_quantity += defect['quantity_rejected']
+        table_rows.append(f"""
+            <tr>
+                <td>{defect['ticket_number']}</td>
+                <td>{defect['order_number']}</td>
+                <td>{defect['customer_name']}</td>
+                <td>{defect['product_name'] or 'N/A'}</td>
+                <td>{defect['department_name']}</td>
+                <td>{defect['quantity_rejected']}</td>
+                <td>{defect['rejection_reason'][:50]}...</td>
+                <td>{defect['created_at'].strftime('%Y-%m-%d') if defect['created_at'] else 'N/A'}</td>
+            </tr>
+        """)
     
     html_body = f"""
     <html>
@@ -39,7 +56,7 @@ def generate_defects_report(config, recipients):
     <body>
         <h2>Defects Report - {start_date} to {end_date}</h2>
         <div class="summary">
-            <p><strong>Total Defects:</strong> {len(defects)}</p>
+            <p><strong>Total Defects:</strong> {defect_count}</p>
             <p><strong>Total Quantity Rejected:</strong> {total_quantity}</p>
         </div>
         <table>
@@ -55,19 +72,7 @@ def generate_defects_report(config, recipients):
             </tr>
     """
     
-    for defect in defects:
-        html_body += f"""
-            <tr>
-                <td>{defect['ticket_number']}</td>
-                <td>{defect['order_number']}</td>
-                <td>{defect['customer_name']}</td>
-                <td>{defect['product_name'] or 'N/A'}</td>
-                <td>{defect['department_name']}</td>
-                <td>{defect['quantity_rejected']}</td>
-                <td>{defect['rejection_reason'][:50]}...</td>
-                <td>{defect['created_at'].strftime('%Y-%m-%d') if defect['created_at'] else 'N/A'}</td>
-            </tr>
-        """
+    html_body += ''.join(table_rows)
     
     html_body += """
         </table>
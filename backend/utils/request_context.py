@@ -0,0 +1,155 @@
+"""
+Identity of the authenticated user for the current request.
+
+    from backend.utils.request_context import current_context
+
+    employee = current_context.employee              # None if not an active employee
+    department = current_context.managed_department  # None if not a manager
+
+The first attribute access in a request resolves user, role, employee,
+employee department and managed department together and keeps them on g. The
+result is also cached per user_id for IDENTITY_CACHE_TTL_SECONDS across
+requests, so most requests run no identity query at all. Writes that change
+who manages a department, or which employee a user is, call
+invalidate_identity().
+"""
+import os
+import time
+from threading import Lock
+from flask import g, request
+from backend.config.database import execute_query
+from backend.config import cache_bus
+
+IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL_SECONDS', 60))
+
+_lock = Lock()
+_identities = {}
+_generation = 0
+
+IDENTITY_QUERY = """
+    SELECT u.id AS user_id, u.username, u.email, u.first_name, u.last_name,
+           u.role_id, r.name AS role_name,
+           e.id AS employee_id, e.department_id AS employee_department_id,
+           e.employee_type, e.first_name AS employee_first_name,
+           e.last_name AS employee_last_name, d.name AS employee_department_name,
+           md.id AS managed_department_id, md.name AS managed_department_name,
+           md.is_active AS managed_department_active
+    FROM users u
+    LEFT JOIN roles r ON u.role_id = r.id
+    LEFT JOIN employees e ON e.user_id = u.id AND e.is_active = TRUE
+    LEFT JOIN departments d ON e.department_id = d.id
+    LEFT JOIN departments md ON md.manager_id = u.id
+    WHERE u.id = %s
+    ORDER BY md.is_active DESC, md.id
+    LIMIT 1
+"""
+
+
+def _build_identity(row):
+    identity = {
+        'user': {
+            'id': row['user_id'],
+            'username': row['username'],
+            'email': row['email'],
+            'first_name': row['first_name'],
+            'last_name': row['last_name']
+        },
+        'role': {'id': row['role_id'], 'name': row['role_name']} if row['role_id'] else None,
+        'employee': None,
+        'department': None,
+        'managed_department': None
+    }
+    if row['employee_id']:
+        identity['employee'] = {
+            'id': row['employee_id'],
+            'department_id': row['employee_department_id'],
+            'employee_type': row['employee_type'],
+            'first_name': row['employee_first_name'],
+            'last_name': row['employee_last_name']
+        }
+    if row['employee_department_id']:
+        identity['department'] = {
+            'id': row['employee_department_id'],
+            'name': row['employee_department_name']
+        }
+    if row['managed_department_id']:
+        identity['managed_department'] = {
+            'id': row['managed_department_id'],
+            'name': row['managed_department_name'],
+            'is_active': bool(row['managed_department_active'])
+        }
+    return identity
+
+
+def load_identity(user_id):
+    """Identity dict for user_id, from the cache or one query; None for an unknown user"""
+    now = time.monotonic()
+    with _lock:
+        cached = _identities.get(user_id)
+        if cached and cached[1] > now:
+            return cached[0]
+        generation = _generation
+
+    row = execute_query(IDENTITY_QUERY, (user_id,), fetch_one=True)
+    if not row:
+        return None
+    identity = _build_identity(row)
+    with _lock:
+        if generation == _generation:
+            _identities[user_id] = (identity, now + IDENTITY_CACHE_TTL)
+    return identity
+
+
+def _drop_identity(data):
+    global _generation
+    user_id = (data or {}).get('user_id')
+    with _lock:
+        _generation += 1
+        if user_id is None:
+            _identities.clear()
+        else:
+            _identities.pop(user_id, None)
+
+
+cache_bus.subscribe('identity', _drop_identity)
+
+
+def invalidate_identity(user_id=None):
+    """Drop one user's cached identity, or everyone's, in all workers"""
+    cache_bus.publish('identity', {'user_id': user_id})
+
+
+class CurrentContext:
+    """Lazily resolved identity of request.current_user (set by token_required)"""
+
+    def _identity(self):
+        if '_identity' not in g:
+            g._identity = load_identity(request.current_user['user_id'])
+        return g._identity or {}
+
+    @property
+    def user_id(self):
+        return request.current_user['user_id']
+
+    @property
+    def user(self):
+        return self._identity().get('user')
+
+    @property
+    def role(self):
+        return self._identity().get('role')
+
+    @property
+    def employee(self):
+        return self._identity().get('employee')
+
+    @property
+    def department(self):
+        return self._identity().get('department')
+
+    @property
+    def managed_department(self):
+        return self._identity().get('managed_department')
+
+
+current_context = CurrentContext()
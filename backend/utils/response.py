@@ -1,4 +1,10 @@
-from flask import jsonify
+import hashlib
+from flask import jsonify, request, Response, current_app, stream_with_context
+from backend.utils.logger import app_logger
+
+# Encoded rows are sent in chunks of about this size
+STREAM_CHUNK_BYTES = 65536
+_END = object()
 
 def success_response(data=None, message=None, status_code=200):
     response = {'success': True}
@@ -16,3 +22,123 @@ def error_response(message, status_code=400, errors=None):
     if errors:
         response['errors'] = errors
     return jsonify(response), status_code
+
+def paginated_response(data, page, message=None, status_code=200):
+    response = {'success': True}
+    if message:
+        response['message'] = message
+    response['data'] = data
+    response['pagination'] = page.to_dict()
+    return jsonify(response), status_code
+
+def _digest(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def _version_etag(version):
+    # A version token only describes the rows behind this URL for this caller
+    user = getattr(request, 'current_user', None) or {}
+    return _digest(request.path, request.query_string, user.get('user_id'), version)
+
+def _cache_headers(response, etag, max_age):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'private, max-age={max_age}' if max_age else 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
+
+def _client_has(etag):
+    # Weak comparison, as If-None-Match requires; compression may weaken our tags
+    return request.if_none_match.contains_weak(etag)
+
+def not_modified(version, max_age=0):
+    """
+    Early 304 for a cheap version token (e.g. MAX(updated_at) and COUNT(*)
+    of the rows behind the response), before the payload is built. Returns
+    None when the client's copy is stale; pass the same version to
+    cacheable_response() then.
+    """
+    etag = _version_etag(version)
+    if not _client_has(etag):
+        return None
+    return _cache_headers(Response(status=304), etag, max_age)
+
+def cacheable_response(data=None, message=None, version=None, max_age=0):
+    """
+    success_response() with a strong ETag and Cache-Control for polled GETs;
+    answers 304 when If-None-Match already holds the ETag. Without a version
+    the ETag is a hash of the serialized body.
+    """
+    response, _ = success_response(data, message)
+    if version is not None:
+        etag = _version_etag(version)
+    else:
+        etag = _digest(response.get_data())
+    if _client_has(etag):
+        return _cache_headers(Response(status=304), etag, max_age)
+    return _cache_headers(response, etag, max_age)
+
+def _encode(value):
+    provider = current_app.json
+    if hasattr(provider, 'encode'):
+        return provider.encode(value)
+    return provider.dumps(value).encode('utf-8')
+
+def streamed_response(rows, transform=None, envelope=True):
+    """
+    JSON array response written while rows arrive, e.g. from execute_stream(),
+    so worker memory stays flat whatever the result size. With envelope the
+    document is {"data": [...], "success": true}, the same keys as
+    success_response(); otherwise a bare array. transform(row) is applied to
+    each row before encoding.
+
+    The first row is fetched before returning, so a failing query still gets
+    an ordinary error response. A failure mid-stream ends the document with
+    "success": false (or, for a bare array, leaves it unterminated) so the
+    client never mistakes a truncated list for a complete one.
+    """
+    rows = iter(rows)
+    first = next(rows, _END)
+
+    def generate():
+        buffer = [b'{"data":[' if envelope else b'[']
+        size = 0
+        row = first
+        count = 0
+        try:
+            while row is not _END:
+                if transform:
+                    row = transform(row)
+                # Encode before the separator goes in, so a failing row
+                # leaves no dangling comma ahead of the error tail
+                data = _encode(row)
+                if count:
+                    data = b',' + data
+                buffer.append(data)
+                size += len(data)
+                count += 1
+                # The first row goes out at once; later ones in chunks
+                if count == 1 or size >= STREAM_CHUNK_BYTES:
+                    yield b''.join(buffer)
+                    buffer = []
+                    size = 0
+                row = next(rows, _END)
+        except Exception as e:
+            app_logger.error(f"Streamed response for {request.path} failed after {count} rows: {e}", exc_info=True)
+            if envelope:
+                buffer.append(b'],"error":"Response interrupted","success":false}')
+            yield b''.join(buffer)
+            return
+        finally:
+            if hasattr(rows, 'close'):
+                rows.close()
+        buffer.append(b'],"success":true}' if envelope else b']')
+        yield b''.join(buffer)
+
+    response = Response(stream_with_context(generate()), mimetype='application/json')
+    if hasattr(rows, 'close'):
+        # Releases the cursor's connection even if the body is never sent
+        response.call_on_close(rows.close)
+    return response
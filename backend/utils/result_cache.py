@@ -0,0 +1,215 @@
+"""
+Shared Redis cache for analytics endpoint responses.
+
+    @reports_bp.route('/production/summary', methods=['GET'])
+    @token_required
+    @query_class('analytics')
+    @cached_result(('job_schedules', 'department_id'), 'departments')
+    def production_summary():
+
+Entries are keyed by endpoint and the normalized query string, and are stored
+for RESULT_CACHE_TTL_SECONDS. Instead of deleting entries, writes bump version
+counters ("tags") that are folded into the key, so a stale entry is simply
+never read again and expires on its own.
+
+Each tag argument names a table, optionally scoped by a request argument that
+holds a department id. A scoped entry depends on `<table>:dept:<id>` and
+`<table>:global`; an unscoped entry depends on `<table>`. Writers call
+invalidate_table('job_schedules', department_id) which bumps `<table>` plus
+the department's tag, or `<table>:global` when the department is unknown.
+
+Concurrent misses for one key are collapsed: the first request takes a short
+Redis lock and computes, the others poll for its result. Without Redis, or if
+Redis fails, the view runs uncached.
+"""
+import os
+import json
+import time
+import uuid
+import hashlib
+from functools import wraps
+from threading import Lock
+from flask import request, make_response, Response
+from backend.config.redis_config import get_redis
+from backend.config.query_governor import budget_ms
+from backend.utils.logger import app_logger
+
+RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL_SECONDS', 300))
+RESULT_CACHE_WAIT_MS = int(os.getenv('RESULT_CACHE_WAIT_MS', 50))
+
+KEY_PREFIX = 'pms:rc:'
+TAG_PREFIX = KEY_PREFIX + 'tag:'
+# Seconds beyond the statement budget before a computing lock is abandoned
+LOCK_GRACE_SECONDS = 5
+
+# Delete the lock only if this request still owns it
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_lock = Lock()
+_counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'stores': 0, 'bypassed': 0}
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+def _client():
+    if not os.getenv('REDIS_URL'):
+        return None
+    return get_redis()
+
+
+def table_tags(table, department_id=None):
+    """Tags an entry reading table (for one department, if given) depends on"""
+    if department_id:
+        return [f"{table}:dept:{department_id}", f"{table}:global"]
+    return [table]
+
+
+def invalidate_table(table, department_id=None):
+    """Call after writing rows of table; department_id narrows it to one department"""
+    client = _client()
+    if client is None:
+        return
+    tags = [table, f"{table}:dept:{department_id}" if department_id else f"{table}:global"]
+    try:
+        pipe = client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(TAG_PREFIX + tag)
+        pipe.execute()
+    except Exception as e:
+        app_logger.warning(f"Result cache invalidation for {table} failed: {e}")
+
+
+def _request_tags(specs):
+    tags = []
+    for spec in specs:
+        if isinstance(spec, str):
+            tags.extend(table_tags(spec))
+        else:
+            table, arg = spec
+            tags.extend(table_tags(table, request.args.get(arg)))
+    return tags
+
+
+def _cache_key(client, endpoint, tags, view_kwargs):
+    versions = client.mget([TAG_PREFIX + tag for tag in tags]) if tags else []
+    args = sorted(
+        (name, value) for name, values in request.args.lists()
+        for value in values if value != ''
+    )
+    material = json.dumps({
+        'args': args,
+        'view': sorted(view_kwargs.items()),
+        'tags': [[tag, version or '0'] for tag, version in zip(tags, versions)]
+    }, default=str)
+    return f"{KEY_PREFIX}{endpoint}:{hashlib.sha1(material.encode('utf-8')).hexdigest()}"
+
+
+def _cached_response(body, state):
+    response = Response(body, mimetype='application/json')
+    response.headers['X-Cache'] = state
+    return response
+
+
+def _wait_for(client, key, lock_key, timeout):
+    """Poll for another request's result; None if it gave up or timed out"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(RESULT_CACHE_WAIT_MS / 1000.0)
+        body = client.get(key)
+        if body is not None:
+            return body
+        if not client.exists(lock_key):
+            return client.get(key)
+    return None
+
+
+def _compute(f, args, kwargs, client, key, ttl):
+    response = make_response(f(*args, **kwargs))
+    if response.status_code == 200 and not response.is_streamed:
+        try:
+            client.set(key, response.get_data(as_text=True), ex=ttl)
+            _count('stores')
+        except Exception as e:
+            app_logger.warning(f"Result cache store failed: {e}")
+    response.headers['X-Cache'] = 'MISS'
+    return response
+
+
+def cached_result(*specs, ttl=None):
+    """
+    View decorator caching the JSON response in Redis. Each spec is a table
+    name or (table, request argument holding a department id). Apply it
+    below token_required and permission_required so auth still runs.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            client = _client()
+            if client is None:
+                return f(*args, **kwargs)
+            try:
+                key = _cache_key(client, request.endpoint, _request_tags(specs), kwargs)
+                body = client.get(key)
+            except Exception as e:
+                app_logger.warning(f"Result cache unavailable, computing {request.endpoint}: {e}")
+                _count('bypassed')
+                return f(*args, **kwargs)
+            if body is not None:
+                _count('hits')
+                return _cached_response(body, 'HIT')
+
+            _count('misses')
+            lock_key = key + ':lock'
+            lock_seconds = budget_ms() / 1000.0 + LOCK_GRACE_SECONDS
+            token = uuid.uuid4().hex
+            try:
+                owner = client.set(lock_key, token, nx=True, px=int(lock_seconds * 1000))
+                if not owner:
+                    body = _wait_for(client, key, lock_key, lock_seconds)
+                    if body is not None:
+                        _count('coalesced')
+                        return _cached_response(body, 'HIT')
+            except Exception as e:
+                app_logger.warning(f"Result cache lock failed for {request.endpoint}: {e}")
+                owner = False
+
+            if not owner:
+                # The computing request failed or is too slow; compute ourselves
+                return _compute(f, args, kwargs, client, key, ttl or RESULT_CACHE_TTL)
+            try:
+                return _compute(f, args, kwargs, client, key, ttl or RESULT_CACHE_TTL)
+            finally:
+                try:
+                    client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+                except Exception:
+                    pass
+        return decorated
+    return decorator
+
+
+def result_cache_stats():
+    with _lock:
+        stats = dict(_counters)
+    stats['ttl_seconds'] = RESULT_CACHE_TTL
+    return stats
+
+
+def render_prometheus(stats, prefix='pms_result_cache'):
+    lines = [
+        f'# HELP {prefix}_requests_total Cached endpoint requests by outcome',
+        f'# TYPE {prefix}_requests_total counter'
+    ]
+    for outcome in ('hits', 'misses', 'coalesced', 'bypassed'):
+        lines.append(f'{prefix}_requests_total{{outcome="{outcome}"}} {stats[outcome]}')
+    lines.append(f'# HELP {prefix}_stores_total Responses written to the cache')
+    lines.append(f'# TYPE {prefix}_stores_total counter')
+    lines.append(f'{prefix}_stores_total {stats["stores"]}')
+    return '\n'.join(lines) + '\n'
@@ -1,8 +1,9 @@
-from threading import Thread
 from time import sleep
 from datetime import datetime, timedelta
 from backend.config.database import execute_query
-from backend.utils.notifications import create_notification
+from backend.config.gevent_mode import spawn_background
+from backend.utils.notifications import create_notification, create_notifications
+from backend.utils.result_cache import invalidate_table
 import json
 import os
 
@@ -29,8 +30,8 @@ class BackgroundScheduler:
     def start(self):
         if not self.running:
             self.running = True
-            self.thread = Thread(target=self._run, daemon=True)
-            self.thread.start()
+            # A greenlet under the gevent worker, a daemon thread otherwise
+            self.thread = spawn_background(self._run, 'background-scheduler')
             print("Background scheduler started")
     
     def stop(self):
@@ -146,16 +147,15 @@ class BackgroundScheduler:
         if recipient_id:
             recipients.append(recipient_id)
         
-        for recipient in recipients:
-            create_notification(
-                recipient_id=recipient,
-                notification_type='sla_alert',
-                title=f"SLA Alert: {sla['sla_name']}",
-                message=f"SLA {notification_type.replace('_', ' ')} for {sla['entity_type']} #{sla['entity_id']}",
-                related_entity_type=sla['entity_type'],
-                related_entity_id=sla['entity_id'],
-                priority='high'
-            )
+        create_notifications(
+            recipients,
+            notification_type='sla_alert',
+            title=f"SLA Alert: {sla['sla_name']}",
+            message=f"SLA {notification_type.replace('_', ' ')} for {sla['entity_type']} #{sla['entity_id']}",
+            related_entity_type=sla['entity_type'],
+            related_entity_id=sla['entity_id'],
+            priority='high'
+        )
     
     def process_escalations(self):
         open_sop_tickets = execute_query(
@@ -176,6 +176,7 @@ class BackgroundScheduler:
                     (ticket['id'],),
                     commit=True
                 )
+                invalidate_table('sop_failure_tickets', ticket['charged_department_id'])
                 
                 hod_users = execute_query(
                     """SELECT id, email, first_name, last_name 
@@ -185,17 +186,17 @@ class BackgroundScheduler:
                     fetch_all=True
                 )
                 
+                create_notifications(
+                    [hod['id'] for hod in hod_users],
+                    notification_type='sop_escalation',
+                    title=f"SOP Ticket Escalated: {ticket['ticket_number']}",
+                    message=f"SOP failure ticket has been open for {ticket['hours_open']} hours without resolution. Requires HOD review and decision.",
+                    related_entity_type='sop_ticket',
+                    related_entity_id=ticket['id'],
+                    priority='urgent'
+                )
+                
                 for hod in hod_users:
-                    create_notification(
-                        recipient_id=hod['id'],
-                        notification_type='sop_escalation',
-                        title=f"SOP Ticket Escalated: {ticket['ticket_number']}",
-                        message=f"SOP failure ticket has been open for {ticket['hours_open']} hours without resolution. Requires HOD review and decision.",
-                        related_entity_type='sop_ticket',
-                        related_entity_id=ticket['id'],
-                        priority='urgent'
-                    )
-                    
                     try:
                         from backend.utils.email_sender import send_email
                         email_body = f"""
@@ -227,54 +228,46 @@ class BackgroundScheduler:
     def check_preventive_maintenance(self):
         now = datetime.now()
         
+        # Technician user and department manager are joined in rather than
+        # looked up per schedule
         due_schedules = execute_query(
             """SELECT pms.*, m.machine_name, m.department_id,
-                      CONCAT(e.first_name, ' ', e.last_name) as technician_name
+                      CONCAT(e.first_name, ' ', e.last_name) as technician_name,
+                      e.user_id as technician_user_id,
+                      d.manager_id as department_manager_id
                FROM preventive_maintenance_schedules pms
                LEFT JOIN machines m ON pms.machine_id = m.id
                LEFT JOIN employees e ON pms.assigned_technician_id = e.id
+               LEFT JOIN departments d ON m.department_id = d.id
                WHERE pms.next_due_at <= %s
                AND pms.is_active = TRUE""",
             (now + timedelta(days=3),),
-            fetch_all=True
+            fetch_all=True,
+            route='replica'
         )
         
         for schedule in due_schedules:
-            if schedule['assigned_technician_id']:
-                employee_user = execute_query(
-                    "SELECT user_id FROM employees WHERE id = %s",
-                    (schedule['assigned_technician_id'],),
-                    fetch_one=True
+            if schedule['technician_user_id']:
+                create_notification(
+                    recipient_id=schedule['technician_user_id'],
+                    notification_type='maintenance_due',
+                    title=f"Preventive Maintenance Due: {schedule['schedule_name']}",
+                    message=f"Maintenance for {schedule['machine_name']} is due on {schedule['next_due_at']}",
+                    related_entity_type='preventive_maintenance_schedule',
+                    related_entity_id=schedule['id'],
+                    priority='high' if schedule['priority'] == 'critical' else 'normal'
                 )
-                
-                if employee_user and employee_user['user_id']:
-                    create_notification(
-                        recipient_id=employee_user['user_id'],
-                        notification_type='maintenance_due',
-                        title=f"Preventive Maintenance Due: {schedule['schedule_name']}",
-                        message=f"Maintenance for {schedule['machine_name']} is due on {schedule['next_due_at']}",
-                        related_entity_type='preventive_maintenance_schedule',
-                        related_entity_id=schedule['id'],
-                        priority='high' if schedule['priority'] == 'critical' else 'normal'
-                    )
             
-            if schedule['department_id']:
-                department = execute_query(
-                    "SELECT manager_id FROM departments WHERE id = %s",
-                    (schedule['department_id'],),
-                    fetch_one=True
+            if schedule['department_manager_id']:
+                create_notification(
+                    recipient_id=schedule['department_manager_id'],
+                    notification_type='maintenance_due',
+                    title=f"Preventive Maintenance Due: {schedule['schedule_name']}",
+                    message=f"Maintenance for {schedule['machine_name']} is due on {schedule['next_due_at']}",
+                    related_entity_type='preventive_maintenance_schedule',
+                    related_entity_id=schedule['id'],
+                    priority='normal'
                 )
-                
-                if department and department['manager_id']:
-                    create_notification(
-                        recipient_id=department['manager_id'],
-                        notification_type='maintenance_due',
-                        title=f"Preventive Maintenance Due: {schedule['schedule_name']}",
-                        message=f"Maintenance for {schedule['machine_name']} is due on {schedule['next_due_at']}",
-                        related_entity_type='preventive_maintenance_schedule',
-                        related_entity_id=schedule['id'],
-                        priority='normal'
-                    )
     
     def process_d365_sync(self):
         if not D365_AVAILABLE:
@@ -309,9 +302,9 @@ class BackgroundScheduler:
                         entity = entity.strip()
                         print(f"  Exporting {entity} to D365...")
                         pms_records = fetch_from_pms(entity)
-                        if pms_records:
-                            export_to_d365(config['endpoint_url'], entity, pms_records, headers, field_mapping)
-                            print(f"  Exported {len(pms_records)} {entity} records")
+                        exported = export_to_d365(config['endpoint_url'], entity, pms_records, headers, field_mapping)
+                        if exported:
+                            print(f"  Exported {exported} {entity} records")
                 
                 execute_query(
                     """UPDATE d365_integration_config
@@ -9,7 +9,7 @@ from dotenv import load_dotenv
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 from backend.utils.logger import app_logger
-from backend.config.db_pool import get_db_connection
+from backend.config.db_pool import get_db_connection, get_db_cursor, return_db_connection
 
 load_dotenv()
 
@@ -179,9 +179,6 @@ class TwilioService:
             Results summary
         """
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
             sql = """
                 SELECT DISTINCT u.id, e.phone
                 FROM users u
@@ -198,8 +195,10 @@ class TwilioService:
                 sql += f' AND u.id NOT IN ({placeholders})'
                 params.extend(exclude_user_ids)
 
-            cursor.execute(sql, params)
-            employees = cursor.fetchall()
+            # Released before sending; send_bulk_sms logs on its own connection
+            with get_db_cursor() as cursor:
+                cursor.execute(sql, params)
+                employees = cursor.fetchall()
 
             recipients = [
                 {
@@ -209,9 +208,6 @@ class TwilioService:
                 for emp in employees
             ]
 
-            cursor.close()
-            conn.close()
-
             return self.send_bulk_sms(recipients, message)
 
         except Exception as e:
@@ -416,6 +412,7 @@ class TwilioService:
         error: Optional[str] = None
     ) -> None:
         """Log communication in database"""
+        conn = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
@@ -438,10 +435,12 @@ class TwilioService:
 
             conn.commit()
             cursor.close()
-            conn.close()
 
         except Exception as e:
             app_logger.error(f'Failed to log communication: {e}')
+        finally:
+            if conn is not None:
+                return_db_connection(conn)
 
 
 # Singleton instance
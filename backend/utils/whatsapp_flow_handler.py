@@ -2,7 +2,8 @@ from typing import Dict, Any, Optional
 from backend.utils.whatsapp_service import whatsapp_service
 from backend.utils.twilio_service import twilio_service
 from backend.utils.logger import app_logger
-from backend.config.db_pool import get_db_connection
+from backend.config.db_pool import get_db_cursor
+from backend.utils.result_cache import invalidate_table
 import json
 
 class WhatsAppFlowHandler:
@@ -490,20 +491,15 @@ class WhatsAppFlowHandler:
     
     def _create_reject_ticket(self, session: Dict, context: Dict) -> int:
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO replacement_tickets 
-                (order_id, product_id, employee_id, defect_description, quantity, status, reported_by_id)
-                VALUES (NULL, NULL, %s, %s, %s, 'pending', %s)
-            """, (session.get('employee_id'), context.get('defect_description'), 
-                  context.get('quantity'), session.get('employee_id')))
-            
-            ticket_id = cursor.lastrowid
-            conn.commit()
-            cursor.close()
-            conn.close()
+            with get_db_cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO replacement_tickets 
+                    (order_id, product_id, employee_id, defect_description, quantity, status, reported_by_id)
+                    VALUES (NULL, NULL, %s, %s, %s, 'pending', %s)
+                """, (session.get('employee_id'), context.get('defect_description'), 
+                      context.get('quantity'), session.get('employee_id')))
+                ticket_id = cursor.lastrowid
+            invalidate_table('replacement_tickets')
             
             return ticket_id
         except Exception as e:
@@ -512,20 +508,14 @@ class WhatsAppFlowHandler:
     
     def _create_customer_return(self, session: Dict, context: Dict) -> int:
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO customer_returns 
-                (order_id, customer_name, return_reason, quantity, status, reported_by_id)
-                VALUES (NULL, %s, %s, %s, 'pending', %s)
-            """, (context.get('customer_name'), context.get('return_reason'),
-                  context.get('quantity'), session.get('employee_id')))
-            
-            return_id = cursor.lastrowid
-            conn.commit()
-            cursor.close()
-            conn.close()
+            with get_db_cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO customer_returns 
+                    (order_id, customer_name, return_reason, quantity, status, reported_by_id)
+                    VALUES (NULL, %s, %s, %s, 'pending', %s)
+                """, (context.get('customer_name'), context.get('return_reason'),
+                      context.get('quantity'), session.get('employee_id')))
+                return_id = cursor.lastrowid
             
             return return_id
         except Exception as e:
@@ -534,21 +524,15 @@ class WhatsAppFlowHandler:
     
     def _create_sop_failure_ticket(self, session: Dict, context: Dict) -> int:
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO sop_tickets 
-                (machine_id, employee_id, issue_description, severity, status, reported_by_id)
-                VALUES (NULL, %s, %s, 'medium', 'open', %s)
-            """, (session.get('employee_id'), 
-                  f"{context.get('machine_process')}: {context.get('failure_description')}", 
-                  session.get('employee_id')))
-            
-            ticket_id = cursor.lastrowid
-            conn.commit()
-            cursor.close()
-            conn.close()
+            with get_db_cursor(commit=True) as cursor:
+                cursor.execute("""
+                    INSERT INTO sop_tickets 
+                    (machine_id, employee_id, issue_description, severity, status, reported_by_id)
+                    VALUES (NULL, %s, %s, 'medium', 'open', %s)
+                """, (session.get('employee_id'), 
+                      f"{context.get('machine_process')}: {context.get('failure_description')}", 
+                      session.get('employee_id')))
+                ticket_id = cursor.lastrowid
             
             return ticket_id
         except Exception as e:
@@ -557,24 +541,19 @@ class WhatsAppFlowHandler:
     
     def _get_tracking_info(self, identifier: str) -> Optional[str]:
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor(dictionary=True)
-            
-            cursor.execute("""
-                SELECT 'Order' as type, id, order_number, status, created_at
-                FROM orders WHERE order_number = %s
-                UNION
-                SELECT 'Reject' as type, id, NULL as order_number, status, created_at
-                FROM replacement_tickets WHERE id = %s
-                UNION
-                SELECT 'Return' as type, id, NULL as order_number, status, created_at
-                FROM customer_returns WHERE id = %s
-                LIMIT 1
-            """, (identifier, identifier, identifier))
-            
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
+            with get_db_cursor() as cursor:
+                cursor.execute("""
+                    SELECT 'Order' as type, id, order_number, status, created_at
+                    FROM orders WHERE order_number = %s
+                    UNION
+                    SELECT 'Reject' as type, id, NULL as order_number, status, created_at
+                    FROM replacement_tickets WHERE id = %s
+                    UNION
+                    SELECT 'Return' as type, id, NULL as order_number, status, created_at
+                    FROM customer_returns WHERE id = %s
+                    LIMIT 1
+                """, (identifier, identifier, identifier))
+                result = cursor.fetchone()
             
             if result:
                 return (f"Type: {result['type']}\n"
@@ -589,72 +568,67 @@ class WhatsAppFlowHandler:
     
     def _generate_report(self, report_type: str, employee_id: Optional[int]) -> str:
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor(dictionary=True)
-            
-            if report_type == 'rejects_summary':
-                cursor.execute("""
-                    SELECT COUNT(*) as total, SUM(quantity) as qty, status
-                    FROM replacement_tickets
-                    WHERE created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-                    GROUP BY status
-                """)
-                results = cursor.fetchall()
-                
-                report = "📦 *Rejects Summary (Last 7 Days)*\n\n"
-                for row in results:
-                    report += f"• {row['status'].title()}: {row['total']} tickets ({row['qty']} items)\n"
-                
-            elif report_type == 'returns_cost':
-                cursor.execute("""
-                    SELECT COUNT(*) as total, SUM(quantity) as qty
-                    FROM customer_returns
-                    WHERE created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                """)
-                result = cursor.fetchone()
+            with get_db_cursor() as cursor:
+                if report_type == 'rejects_summary':
+                    cursor.execute("""
+                        SELECT COUNT(*) as total, SUM(quantity) as qty, status
+                        FROM replacement_tickets
+                        WHERE created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+                        GROUP BY status
+                    """)
+                    results = cursor.fetchall()
                 
-                report = "💰 *Returns Cost (Last 30 Days)*\n\n"
-                report += f"• Total Returns: {result['total']}\n"
-                report += f"• Total Items: {result['qty']}\n"
+                    report = "📦 *Rejects Summary (Last 7 Days)*\n\n"
+                    for row in results:
+                        report += f"• {row['status'].title()}: {row['total']} tickets ({row['qty']} items)\n"
                 
-            elif report_type == 'sop_failures':
-                cursor.execute("""
-                    SELECT COUNT(*) as total, severity, status
-                    FROM sop_tickets
-                    WHERE created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-                    GROUP BY severity, status
-                """)
-                results = cursor.fetchall()
+                elif report_type == 'returns_cost':
+                    cursor.execute("""
+                        SELECT COUNT(*) as total, SUM(quantity) as qty
+                        FROM customer_returns
+                        WHERE created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
+                    """)
+                    result = cursor.fetchone()
                 
-                report = "⚠️ *SOP Failures (Last 7 Days)*\n\n"
-                for row in results:
-                    report += f"• {row['severity'].title()} - {row['status'].title()}: {row['total']}\n"
+                    report = "💰 *Returns Cost (Last 30 Days)*\n\n"
+                    report += f"• Total Returns: {result['total']}\n"
+                    report += f"• Total Items: {result['qty']}\n"
                 
-            elif report_type == 'my_tickets':
-                if not employee_id:
-                    report = "❌ No employee linked to this phone number."
-                else:
+                elif report_type == 'sop_failures':
                     cursor.execute("""
-                        SELECT 'Reject' as type, id, status, created_at
-                        FROM replacement_tickets WHERE employee_id = %s
-                        UNION ALL
-                        SELECT 'Return' as type, id, status, created_at
-                        FROM customer_returns WHERE reported_by_id = %s
-                        UNION ALL
-                        SELECT 'SOP' as type, id, status, created_at
-                        FROM sop_tickets WHERE employee_id = %s
-                        ORDER BY created_at DESC LIMIT 5
-                    """, (employee_id, employee_id, employee_id))
+                        SELECT COUNT(*) as total, severity, status
+                        FROM sop_tickets
+                        WHERE created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+                        GROUP BY severity, status
+                    """)
                     results = cursor.fetchall()
-                    
-                    report = "🎫 *My Recent Tickets*\n\n"
+                
+                    report = "⚠️ *SOP Failures (Last 7 Days)*\n\n"
                     for row in results:
-                        report += f"• {row['type']} #{row['id']} - {row['status']} ({row['created_at'].strftime('%Y-%m-%d')})\n"
-            else:
-                report = "❌ Invalid report type."
-            
-            cursor.close()
-            conn.close()
+                        report += f"• {row['severity'].title()} - {row['status'].title()}: {row['total']}\n"
+                
+                elif report_type == 'my_tickets':
+                    if not employee_id:
+                        report = "❌ No employee linked to this phone number."
+                    else:
+                        cursor.execute("""
+                            SELECT 'Reject' as type, id, status, created_at
+                            FROM replacement_tickets WHERE employee_id = %s
+                            UNION ALL
+                            SELECT 'Return' as type, id, status, created_at
+                            FROM customer_returns WHERE reported_by_id = %s
+                            UNION ALL
+                            SELECT 'SOP' as type, id, status, created_at
+                            FROM sop_tickets WHERE employee_id = %s
+                            ORDER BY created_at DESC LIMIT 5
+                        """, (employee_id, employee_id, employee_id))
+                        results = cursor.fetchall()
+                    
+                        report = "🎫 *My Recent Tickets*\n\n"
+                        for row in results:
+                            report += f"• {row['type']} #{row['id']} - {row['status']} ({row['created_at'].strftime('%Y-%m-%d')})\n"
+                else:
+                    report = "❌ Invalid report type."
             
             return report if report else "📊 No data available."
             
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from threading import Thread
 from backend.utils.logger import app_logger
-from backend.config.db_pool import get_db_connection
+from backend.config.db_pool import get_db_connection, return_db_connection
 
 class WhatsAppService:
     def __init__(self):
@@ -184,12 +184,13 @@ class WhatsAppService:
     
     def _log_message(self, phone: str, direction: str, msg_type: str, content: str, payload: Dict, status: str = 'sent'):
         """Log message to database (non-blocking for outbound)"""
+        conn = None
         try:
+            session_id = self._get_or_create_session(phone)
+            
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            session_id = self._get_or_create_session(phone)
-            
             message_id = payload.get('messages', [{}])[0].get('id') if direction == 'outbound' else payload.get('id')
             
             cursor.execute("""
@@ -200,46 +201,51 @@ class WhatsAppService:
             
             conn.commit()
             cursor.close()
-            conn.close()
         except Exception as e:
             app_logger.error(f"Failed to log message: {type(e).__name__}: {str(e)}", exc_info=True)
+        finally:
+            if conn is not None:
+                return_db_connection(conn)
     
     def _get_or_create_session(self, phone: str) -> int:
         conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id FROM whatsapp_sessions 
-            WHERE phone_number = %s AND (expires_at IS NULL OR expires_at > NOW())
-            ORDER BY created_at DESC LIMIT 1
-        """, (phone,))
-        
-        result = cursor.fetchone()
+        try:
+            cursor = conn.cursor()
         
-        if result:
-            # Result is a dict from DictCursor
-            session_id = result['id'] if isinstance(result, dict) else result[0]
             cursor.execute("""
-                UPDATE whatsapp_sessions 
-                SET last_message_at = NOW(), expires_at = DATE_ADD(NOW(), INTERVAL 24 HOUR)
-                WHERE id = %s
-            """, (session_id,))
-        else:
-            employee_id = self._get_employee_by_phone(phone)
-            cursor.execute("""
-                INSERT INTO whatsapp_sessions 
-                (phone_number, employee_id, session_state, expires_at)
-                VALUES (%s, %s, 'idle', DATE_ADD(NOW(), INTERVAL 24 HOUR))
-            """, (phone, employee_id))
-            session_id = cursor.lastrowid
+                SELECT id FROM whatsapp_sessions 
+                WHERE phone_number = %s AND (expires_at IS NULL OR expires_at > NOW())
+                ORDER BY created_at DESC LIMIT 1
+            """, (phone,))
+        
+            result = cursor.fetchone()
         
-        conn.commit()
-        cursor.close()
-        conn.close()
+            if result:
+                # Result is a dict from DictCursor
+                session_id = result['id'] if isinstance(result, dict) else result[0]
+                cursor.execute("""
+                    UPDATE whatsapp_sessions 
+                    SET last_message_at = NOW(), expires_at = DATE_ADD(NOW(), INTERVAL 24 HOUR)
+                    WHERE id = %s
+                """, (session_id,))
+            else:
+                employee_id = self._get_employee_by_phone(phone)
+                cursor.execute("""
+                    INSERT INTO whatsapp_sessions 
+                    (phone_number, employee_id, session_state, expires_at)
+                    VALUES (%s, %s, 'idle', DATE_ADD(NOW(), INTERVAL 24 HOUR))
+                """, (phone, employee_id))
+                session_id = cursor.lastrowid
+            
+            conn.commit()
+            cursor.close()
+        finally:
+            return_db_connection(conn)
         
         return session_id
     
     def _get_employee_by_phone(self, phone: str) -> Optional[int]:
+        conn = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
@@ -255,14 +261,17 @@ class WhatsAppService:
             
             result = cursor.fetchone()
             cursor.close()
-            conn.close()
             
             return result[0] if result else None
         except Exception as e:
             app_logger.error(f"Failed to get employee by phone: {str(e)}")
             return None
+        finally:
+            if conn is not None:
+                return_db_connection(conn)
     
     def get_session(self, phone: str) -> Optional[Dict[str, Any]]:
+        conn = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
@@ -276,7 +285,6 @@ class WhatsAppService:
             
             result = cursor.fetchone()
             cursor.close()
-            conn.close()
             
             if (
                 result
@@ -290,8 +298,12 @@ class WhatsAppService:
         except Exception as e:
             app_logger.error(f"Failed to get session: {str(e)}")
             return None
+        finally:
+            if conn is not None:
+                return_db_connection(conn)
     
     def update_session(self, session_id: int, state: str = None, flow: str = None, context: Dict = None):
+        conn = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
@@ -318,13 +330,16 @@ class WhatsAppService:
                 conn.commit()
             
             cursor.close()
-            conn.close()
         except Exception as e:
             app_logger.error(f"Failed to update session: {str(e)}")
+        finally:
+            if conn is not None:
+                return_db_connection(conn)
     
     def log_interaction(self, session_id: int, employee_id: Optional[int], interaction_type: str, 
                        action: str, reference_id: int = None, reference_type: str = None,
                        request_data: Dict = None, response_data: Dict = None, status: str = 'initiated') -> int:
+        conn = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
@@ -343,14 +358,17 @@ class WhatsAppService:
             interaction_id = cursor.lastrowid
             conn.commit()
             cursor.close()
-            conn.close()
             
             return interaction_id
         except Exception as e:
             app_logger.error(f"Failed to log interaction: {str(e)}")
             return 0
+        finally:
+            if conn is not None:
+                return_db_connection(conn)
     
     def update_interaction(self, interaction_id: int, status: str, response_data: Dict = None):
+        conn = None
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
@@ -363,8 +381,10 @@ class WhatsAppService:
             
             conn.commit()
             cursor.close()
-            conn.close()
         except Exception as e:
             app_logger.error(f"Failed to update interaction: {str(e)}")
+        finally:
+            if conn is not None:
+                return_db_connection(conn)
 
 whatsapp_service = WhatsAppService()
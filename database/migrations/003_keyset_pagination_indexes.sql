@@ -0,0 +1,30 @@
+-- Migration: 003 - Keyset Pagination Indexes
+-- Date: 2026-10-16
+-- Description: Indexes the sort columns used by keyset-paginated list endpoints.
+-- InnoDB secondary indexes carry the primary key, so an index on the sort
+-- column serves the (sort column, id) seek predicate and ORDER BY directly.
+
+USE railway;
+
+-- 1. orders: GET /api/orders (optionally filtered by status)
+ALTER TABLE orders
+ADD INDEX idx_created (created_at),
+ADD INDEX idx_status_created (status, created_at);
+
+-- 2. replacement_tickets: GET /api/defects/replacement-tickets filtered by status
+ALTER TABLE replacement_tickets
+ADD INDEX idx_status_created (status, created_at);
+
+-- 3. maintenance_tickets: GET /api/maintenance/tickets, by priority (default) or date
+ALTER TABLE maintenance_tickets
+ADD INDEX idx_priority_created (priority_order, created_at),
+ADD INDEX idx_created (created_at);
+
+-- 4. workflow_instance_tracking: GET /api/workflows/instances
+ALTER TABLE workflow_instance_tracking
+ADD INDEX idx_started (started_at);
+
+-- 5. whatsapp_sessions: GET /api/whatsapp/sessions
+ALTER TABLE whatsapp_sessions
+ADD INDEX idx_last_message (last_message_at),
+ADD INDEX idx_created (created_at);
@@ -0,0 +1,29 @@
+-- Migration: 004 - Composite Hot Path Indexes
+-- Date: 2026-10-16
+-- Description: Composite indexes for the predicates the scheduler and the
+-- dashboards run most often. Each column index on its own leaves MySQL to
+-- pick one and filter the rest row by row; these put the equality columns
+-- first and the range/sort column last, so a single index range scan
+-- answers the query. Proposed with scripts/index_advisor.py.
+
+USE railway;
+
+-- 1. job_schedules: department board for a day, filtered by status
+--    WHERE department_id = ? AND scheduled_date = ? AND status = ?
+ALTER TABLE job_schedules
+ADD INDEX idx_dept_date_status (department_id, scheduled_date, status);
+
+-- 2. notifications: unread list and badge count, newest first
+--    WHERE recipient_id = ? AND is_read = FALSE ORDER BY created_at DESC
+ALTER TABLE notifications
+ADD INDEX idx_recipient_read_created (recipient_id, is_read, created_at);
+
+-- 3. sla_tracking: scheduler breach checks
+--    WHERE status IN (...) AND response_due_at < ?
+ALTER TABLE sla_tracking
+ADD INDEX idx_status_response_due (status, response_due_at);
+
+-- 4. preventive_maintenance_schedules: per-machine schedule, next due first
+--    WHERE machine_id = ? AND is_active = TRUE ORDER BY next_due_at
+ALTER TABLE preventive_maintenance_schedules
+ADD INDEX idx_machine_active_next_due (machine_id, is_active, next_due_at);
@@ -152,7 +152,9 @@ CREATE TABLE IF NOT EXISTS orders (
     INDEX idx_sales_order (sales_order_number),
     INDEX idx_customer (customer_name),
     INDEX idx_status (status),
-    INDEX idx_dates (start_date, end_date)
+    INDEX idx_dates (start_date, end_date),
+    INDEX idx_created (created_at),
+    INDEX idx_status_created (status, created_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS job_schedules (
@@ -181,7 +183,8 @@ CREATE TABLE IF NOT EXISTS job_schedules (
     INDEX idx_date (scheduled_date),
     INDEX idx_status (status),
     INDEX idx_machine (machine_id),
-    INDEX idx_employee (assigned_employee_id)
+    INDEX idx_employee (assigned_employee_id),
+    INDEX idx_dept_date_status (department_id, scheduled_date, status)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS replacement_tickets (
@@ -213,7 +216,8 @@ CREATE TABLE IF NOT EXISTS replacement_tickets (
     INDEX idx_order (order_id),
     INDEX idx_department (department_id),
     INDEX idx_status (status),
-    INDEX idx_created (created_at)
+    INDEX idx_created (created_at),
+    INDEX idx_status_created (status, created_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS customer_returns (
@@ -331,7 +335,9 @@ CREATE TABLE IF NOT EXISTS maintenance_tickets (
     INDEX idx_department (department_id),
     INDEX idx_status (status),
     INDEX idx_severity (severity),
-    INDEX idx_assigned (assigned_to_id)
+    INDEX idx_assigned (assigned_to_id),
+    INDEX idx_priority_created (priority_order, created_at),
+    INDEX idx_created (created_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS bom (
@@ -432,7 +438,8 @@ CREATE TABLE IF NOT EXISTS notifications (
     INDEX idx_recipient (recipient_id),
     INDEX idx_type (notification_type),
     INDEX idx_read (is_read),
-    INDEX idx_created (created_at)
+    INDEX idx_created (created_at),
+    INDEX idx_recipient_read_created (recipient_id, is_read, created_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS email_reports (
@@ -555,7 +562,8 @@ CREATE TABLE IF NOT EXISTS sla_tracking (
     INDEX idx_entity (entity_type, entity_id),
     INDEX idx_status (status),
     INDEX idx_response_due (response_due_at),
-    INDEX idx_resolution_due (resolution_due_at)
+    INDEX idx_resolution_due (resolution_due_at),
+    INDEX idx_status_response_due (status, response_due_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS field_permissions (
@@ -599,7 +607,8 @@ CREATE TABLE IF NOT EXISTS preventive_maintenance_schedules (
     FOREIGN KEY (created_by_id) REFERENCES users(id) ON DELETE CASCADE,
     INDEX idx_machine (machine_id),
     INDEX idx_next_due (next_due_at),
-    INDEX idx_active (is_active)
+    INDEX idx_active (is_active),
+    INDEX idx_machine_active_next_due (machine_id, is_active, next_due_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS preventive_maintenance_logs (
@@ -777,7 +786,8 @@ CREATE TABLE IF NOT EXISTS workflow_instance_tracking (
     INDEX idx_workflow (workflow_id),
     INDEX idx_entity (entity_type, entity_id),
     INDEX idx_status (status),
-    INDEX idx_assigned (assigned_to_id)
+    INDEX idx_assigned (assigned_to_id),
+    INDEX idx_started (started_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS order_production_paths (
@@ -817,7 +827,9 @@ CREATE TABLE IF NOT EXISTS whatsapp_sessions (
     INDEX idx_phone (phone_number),
     INDEX idx_employee (employee_id),
     INDEX idx_state (session_state),
-    INDEX idx_expires (expires_at)
+    INDEX idx_expires (expires_at),
+    INDEX idx_last_message (last_message_at),
+    INDEX idx_created (created_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS whatsapp_messages (
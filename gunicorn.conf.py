@@ -0,0 +1,23 @@
+"""
+Gunicorn settings, driven by environment variables.
+
+GUNICORN_WORKER_CLASS=gevent switches to cooperative workers: each worker
+serves up to GUNICORN_WORKER_CONNECTIONS concurrent requests as greenlets,
+sharing one DB pool of DB_POOL_MAX connections (requests beyond that queue
+for a connection, see DB_POOL_TIMEOUT). Keep
+GUNICORN_WORKERS * DB_POOL_MAX below the MySQL max_connections.
+"""
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8080')
+workers = int(os.getenv('GUNICORN_WORKERS', 2))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync').lower()
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+keepalive = 5
+accesslog = '-'
+
+if worker_class == 'gevent':
+    # The app must be imported inside the (already patched) worker, never
+    # in the unpatched master
+    preload_app = False
@@ -0,0 +1,96 @@
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from backend.config.db_pool import execute_query, execute_many, bulk_insert, db_pool
+
+TABLE = 'bench_bulk_insert'
+COLUMNS = ['recipient_id', 'notification_type', 'title', 'message', 'priority']
+
+
+def make_rows(count):
+    return [
+        (i % 500 + 1, 'benchmark', f'Benchmark notification {i}',
+         'Bulk insert benchmark row ' + 'x' * 120, 'normal')
+        for i in range(count)
+    ]
+
+
+def reset_table():
+    execute_query(f"DROP TABLE IF EXISTS {TABLE}", commit=True)
+    execute_query(f"""
+        CREATE TABLE {TABLE} (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            recipient_id INT NOT NULL,
+            notification_type VARCHAR(100) NOT NULL,
+            title VARCHAR(300) NOT NULL,
+            message TEXT NOT NULL,
+            priority VARCHAR(20),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_recipient (recipient_id)
+        ) ENGINE=InnoDB
+    """, commit=True)
+
+
+def per_row(rows):
+    query = f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s, %s)"
+    for row in rows:
+        execute_query(query, row, commit=True)
+    return len(rows)
+
+
+def executemany(rows):
+    query = f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s, %s)"
+    return execute_many(query, rows)
+
+
+def bulk(rows, chunk_size):
+    result = bulk_insert(TABLE, COLUMNS, rows, chunk_size=chunk_size)
+    return result['rows']
+
+
+def run(name, fn, rows, *args):
+    reset_table()
+    started = time.perf_counter()
+    written = fn(rows, *args)
+    elapsed = time.perf_counter() - started
+    count = execute_query(f"SELECT COUNT(*) as count FROM {TABLE}", fetch_one=True)['count']
+    print(f"{name:28s} | {written:7d} rows | {elapsed:8.3f}s | {written / elapsed:10.0f} rows/s | {count} in table")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-row INSERTs with bulk_insert()')
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--skip-per-row', action='store_true', help='skip the slow one-INSERT-per-row run')
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+
+    print("=" * 80)
+    print(f"Bulk insert benchmark: {args.rows} rows into {TABLE} on {os.getenv('DB_HOST')}")
+    print("=" * 80)
+
+    try:
+        baseline = None
+        if not args.skip_per_row:
+            baseline = run('per-row execute_query', per_row, rows)
+        run('execute_many', executemany, rows)
+        elapsed = run(f'bulk_insert (chunk={args.chunk_size})', bulk, rows, args.chunk_size)
+        if baseline:
+            print(f"\nbulk_insert speedup over per-row: {baseline / elapsed:.1f}x")
+    finally:
+        execute_query(f"DROP TABLE IF EXISTS {TABLE}", commit=True)
+        db_pool.close_all()
+
+
+if __name__ == '__main__':
+    main()
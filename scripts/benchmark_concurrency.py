@@ -0,0 +1,83 @@
+"""
+Load generator for comparing sync and gevent gunicorn workers on I/O-bound
+endpoints. Start the app once per mode and point this script at it:
+
+    GUNICORN_WORKER_CLASS=sync   gunicorn -c gunicorn.conf.py wsgi:app
+    GUNICORN_WORKER_CLASS=gevent gunicorn -c gunicorn.conf.py wsgi:app
+
+    python scripts/benchmark_concurrency.py --concurrency 50 --requests 500
+
+By default it posts Twilio-style WhatsApp messages to the webhook, which
+spends its time on database and Twilio round trips.
+"""
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent load test for PMS endpoints')
+    parser.add_argument('--base-url', default='http://localhost:8080')
+    parser.add_argument('--path', default='/api/whatsapp/webhook')
+    parser.add_argument('--method', default='POST', choices=['GET', 'POST'])
+    parser.add_argument('--token', help='Bearer token for authenticated endpoints')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    url = args.base_url.rstrip('/') + args.path
+    headers = {'Authorization': f'Bearer {args.token}'} if args.token else {}
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=args.concurrency, pool_maxsize=args.concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    def one(i):
+        started = time.perf_counter()
+        try:
+            if args.method == 'POST':
+                response = session.post(url, headers=headers, timeout=120, data={
+                    'From': f'whatsapp:+1555000{i % 1000:04d}',
+                    'Body': 'status',
+                    'MessageSid': f'SMbenchmark{i}'
+                })
+            else:
+                response = session.get(url, headers=headers, timeout=120)
+            status = response.status_code
+        except requests.RequestException:
+            status = 'error'
+        return status, (time.perf_counter() - started) * 1000
+
+    print("=" * 70)
+    print(f"{args.method} {url}")
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [ms for _, ms in results]
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    print(f"Throughput : {args.requests / elapsed:8.1f} req/s ({elapsed:.2f}s total)")
+    print(f"Latency ms : p50 {percentile(latencies, 50):.0f}  p95 {percentile(latencies, 95):.0f}  "
+          f"p99 {percentile(latencies, 99):.0f}  max {max(latencies):.0f}")
+    print(f"Statuses   : {statuses}")
+
+
+if __name__ == '__main__':
+    main()
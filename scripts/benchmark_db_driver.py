@@ -0,0 +1,107 @@
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from backend.config.db_driver import PyMySQLDriver, MySQLClientDriver, MySQLdb
+
+SCAN_QUERY = "SELECT * FROM job_schedules ORDER BY id LIMIT %s"
+
+# job_schedules rows repeated to the requested size, for databases without
+# 100k real schedules
+SYNTHETIC_QUERY = """
+    SELECT js.*
+    FROM job_schedules js
+    CROSS JOIN (
+        SELECT a.n + b.n * 10 + c.n * 100 AS n
+        FROM (SELECT 0 n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+              UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) a,
+             (SELECT 0 n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+              UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) b,
+             (SELECT 0 n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+              UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) c
+    ) copies
+    LIMIT %s
+"""
+
+
+def connection_config(driver):
+    return {
+        'host': os.getenv('DB_HOST'),
+        'port': int(os.getenv('DB_PORT', 3306)),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD'),
+        'database': os.getenv('DB_NAME'),
+        'charset': 'utf8mb4',
+        'cursorclass': driver.DictCursor,
+        'autocommit': False,
+        'connect_timeout': 10,
+        'read_timeout': 300
+    }
+
+
+def scan(driver, query, rows, repeat):
+    connection = driver.connect(connection_config(driver))
+    timings = []
+    sample = None
+    try:
+        for _ in range(repeat):
+            cursor = connection.cursor()
+            started = time.perf_counter()
+            cursor.execute(query, (rows,))
+            result = cursor.fetchall()
+            timings.append(time.perf_counter() - started)
+            sample = result[0] if result else None
+            count = len(result)
+            cursor.close()
+    finally:
+        connection.close()
+    return count, min(timings), sample
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare row decode throughput of the MySQL drivers')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3, help='runs per driver; the fastest is reported')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='repeat existing job_schedules rows up to --rows')
+    args = parser.parse_args()
+
+    query = SYNTHETIC_QUERY if args.synthetic else SCAN_QUERY
+    drivers = [PyMySQLDriver()]
+    if MySQLdb is not None:
+        drivers.append(MySQLClientDriver())
+    else:
+        print("mysqlclient is not installed (pip install mysqlclient); benchmarking pymysql only\n")
+
+    print("=" * 70)
+    print(f"job_schedules scan, {args.rows} rows, best of {args.repeat}")
+    print("=" * 70)
+
+    samples = {}
+    baseline = None
+    for driver in drivers:
+        count, elapsed, sample = scan(driver, query, args.rows, args.repeat)
+        samples[driver.name] = sample
+        speedup = f"{baseline / elapsed:5.1f}x" if baseline else '  1.0x'
+        baseline = baseline or elapsed
+        print(f"{driver.name:12s} | {count:7d} rows | {elapsed:7.3f}s | {count / elapsed:10.0f} rows/s | {speedup}")
+
+    if len(samples) == 2 and all(samples.values()):
+        first, second = samples.values()
+        mismatched = sorted(
+            column for column in first
+            if type(first[column]) is not type(second.get(column))
+        )
+        print("\nColumn types identical across drivers" if not mismatched
+              else f"\nColumn type differences: {', '.join(mismatched)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from backend.utils import json_provider
+from backend.utils.json_provider import PMSJSONProvider
+
+STATUSES = ('scheduled', 'in_progress', 'completed', 'on_hold')
+
+
+def order_row(i):
+    """An orders row as get_orders returns it, product name attached"""
+    created = datetime(2024, 1, 1, 8, 0) + timedelta(minutes=37 * i)
+    return {
+        'id': i,
+        'order_number': f"SO-{100000 + i}",
+        'sales_order_number': f"D365-{500000 + i}",
+        'customer_name': f"Customer {i % 250} (Pty) Ltd",
+        'product_id': i % 400,
+        'product_name': f"Embroidered polo shirt, size {('S', 'M', 'L', 'XL')[i % 4]}",
+        'quantity': 50 + i % 950,
+        'order_value': Decimal(f"{(i * 137) % 90000}.{i % 100:02d}"),
+        'start_date': created.date(),
+        'end_date': created.date() + timedelta(days=14),
+        'priority': ('low', 'normal', 'high', 'urgent')[i % 4],
+        'status': STATUSES[i % 4],
+        'hold_reason': None,
+        'notes': 'Rush order, confirm thread colours with customer' if i % 7 == 0 else None,
+        'config': '{"logo_position": "left_chest", "colours": 3}' if i % 3 == 0 else None,
+        'created_at': created,
+        'updated_at': created + timedelta(hours=5)
+    }
+
+
+def job_schedule_row(i):
+    """A job_schedules row including the cost columns from migration 002"""
+    scheduled = date(2024, 1, 1) + timedelta(days=i % 365)
+    started = datetime.combine(scheduled, datetime.min.time()) + timedelta(hours=7, minutes=i % 60)
+    return {
+        'id': i,
+        'order_id': i // 3,
+        'department_id': i % 12,
+        'stage_id': i % 6,
+        'scheduled_date': scheduled,
+        'scheduled_quantity': 100 + i % 400,
+        'actual_quantity': 95 + i % 410,
+        'machine_id': i % 80,
+        'assigned_employee_id': i % 300,
+        'status': STATUSES[i % 4],
+        'started_at': started,
+        'completed_at': started + timedelta(hours=6),
+        'notes': None,
+        'material_cost': Decimal(f"{(i * 31) % 5000}.25"),
+        'labor_cost': Decimal(f"{(i * 17) % 3000}.50"),
+        'overhead_cost': Decimal(f"{(i * 7) % 800}.10"),
+        'total_cost': Decimal(f"{(i * 55) % 8800}.85"),
+        'standard_cost': Decimal(f"{(i * 53) % 8800}.00"),
+        'cost_variance': Decimal(f"{(i * 2) % 400}.85"),
+        'actual_hours': Decimal(f"{6 + i % 3}.50"),
+        'standard_hours': Decimal('6.00'),
+        'created_at': started - timedelta(days=3),
+        'updated_at': started + timedelta(hours=6)
+    }
+
+
+def load_rows(table, count):
+    """Real rows, for a database with enough of them"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    from backend.config.database import execute_query
+    return execute_query(f"SELECT * FROM {table} ORDER BY id LIMIT %s", (count,), fetch_all=True)
+
+
+def best_of(encode, payload, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = encode(payload)
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JSON response encoding of DictCursor rows')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per encoder; the fastest is reported')
+    parser.add_argument('--db', action='store_true', help='use real orders and job_schedules rows')
+    args = parser.parse_args()
+
+    if args.db:
+        payloads = {
+            'orders': load_rows('orders', args.rows),
+            'job_schedules': load_rows('job_schedules', args.rows)
+        }
+    else:
+        payloads = {
+            'orders': [order_row(i) for i in range(args.rows)],
+            'job_schedules': [job_schedule_row(i) for i in range(args.rows)]
+        }
+
+    app = Flask(__name__)
+    flask_default = DefaultJSONProvider(app)
+    provider = PMSJSONProvider(app)
+    orjson = json_provider.orjson
+
+    encoders = [('flask default', lambda rows: flask_default.response({'success': True, 'data': rows}).get_data())]
+    if orjson is not None:
+        encoders.append(('orjson', lambda rows: provider.response({'success': True, 'data': rows}).get_data()))
+    else:
+        print("orjson is not installed (pip install orjson); benchmarking the stdlib fallback only\n")
+
+    def stdlib_fallback(rows):
+        json_provider.orjson = None
+        try:
+            return provider.response({'success': True, 'data': rows}).get_data()
+        finally:
+            json_provider.orjson = orjson
+    encoders.append(('stdlib fallback', stdlib_fallback))
+
+    for name, rows in payloads.items():
+        print("=" * 70)
+        print(f"{name}: {len(rows)} rows, best of {args.repeat}")
+        print("=" * 70)
+        baseline = None
+        for label, encode in encoders:
+            try:
+                elapsed, size = best_of(encode, rows, args.repeat)
+            except TypeError as e:
+                print(f"{label:16s} | failed: {e}")
+                continue
+            speedup = f"{baseline / elapsed:5.1f}x" if baseline else '  1.0x'
+            baseline = baseline or elapsed
+            print(f"{label:16s} | {elapsed * 1000:8.1f}ms | {size / 1024:8.0f} KiB | {speedup}")
+
+        if orjson is not None:
+            # TIME columns arrive as timedelta, which Flask's default cannot encode
+            sample = rows[:200] + [{'shift_start': timedelta(hours=6), 'overtime': timedelta(minutes=-90)}]
+            fast = json.loads(encoders[1][1](sample))
+            fallback = json.loads(stdlib_fallback(sample))
+            print("\nBackends agree" if fast == fallback else "\nBackends DISAGREE on this payload")
+        print()
+
+
+if __name__ == '__main__':
+    main()
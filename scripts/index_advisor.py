@@ -0,0 +1,391 @@
+"""
+Workload-driven index advisor.
+
+Replays captured query fingerprints against a seeded database, reads their
+EXPLAIN plans and proposes composite (and, where the select list allows,
+covering) indexes. With --trial each proposal is built on the scratch
+database, the plan is EXPLAINed again and compared, and the index is
+dropped again. The proposals that improve a plan are written to the next
+numbered file under database/migrations/.
+
+Capture a workload by running the app with DB_QUERY_CAPTURE=logs/query_capture.jsonl,
+then point this script at a seeded copy of the database. The target is
+never taken from the app's DB_* settings: name it with --host/--database
+(or ADVISOR_DB_HOST, ADVISOR_DB_PORT, ADVISOR_DB_USER, ADVISOR_DB_PASSWORD,
+ADVISOR_DB_NAME), and pass --trial to let the script build and drop indexes
+on it:
+
+    python scripts/index_advisor.py --host 127.0.0.1 --database pms_scratch \
+        --workload logs/query_capture.jsonl --trial
+
+Without --trial proposals are only listed. Without --workload the built-in
+hot-path workload below is replayed.
+"""
+import sys
+import os
+import re
+import json
+import argparse
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pymysql
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MIGRATIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database', 'migrations'))
+
+# Hot statements from the scheduler and list endpoints, with representative parameters
+HOT_WORKLOAD = [
+    {
+        'query': """SELECT js.*, o.order_number FROM job_schedules js
+                    LEFT JOIN orders o ON js.order_id = o.id
+                    WHERE js.department_id = %s AND js.scheduled_date = %s AND js.status = %s""",
+        'params': [1, date.today().isoformat(), 'scheduled']
+    },
+    {
+        'query': """SELECT * FROM notifications
+                    WHERE recipient_id = %s AND is_read = FALSE
+                    ORDER BY created_at DESC LIMIT %s""",
+        'params': [1, 50]
+    },
+    {
+        'query': """SELECT st.*, sc.sla_name FROM sla_tracking st
+                    LEFT JOIN sla_configurations sc ON st.sla_config_id = sc.id
+                    WHERE st.status = 'on_track' AND st.response_due_at BETWEEN %s AND %s
+                    AND st.responded_at IS NULL""",
+        'params': [date.today().isoformat(), date.today().isoformat() + ' 23:59:59']
+    },
+    {
+        'query': """SELECT * FROM preventive_maintenance_schedules
+                    WHERE machine_id = %s AND is_active = TRUE
+                    ORDER BY next_due_at""",
+        'params': [1]
+    }
+]
+
+SQL_KEYWORDS = {
+    'where', 'on', 'left', 'right', 'inner', 'outer', 'cross', 'join', 'group', 'order',
+    'limit', 'set', 'using', 'as', 'having', 'union', 'straight_join'
+}
+
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(\w+)`?)?', re.IGNORECASE)
+COLUMN_JOIN = re.compile(r'\b(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)')
+PREDICATE = re.compile(
+    r'(?<![\w.])(?:(\w+)\.)?(\w+)\s*(=|<=>|IN\s*\(|IS\s+(?:NOT\s+)?NULL|<=|>=|<|>|BETWEEN)',
+    re.IGNORECASE
+)
+
+
+def advisor_target(args):
+    """Connection settings for the scratch database; exits unless one was named explicitly"""
+    target = {
+        'host': args.host or os.getenv('ADVISOR_DB_HOST'),
+        'port': int(args.port or os.getenv('ADVISOR_DB_PORT', 3306)),
+        'user': args.user or os.getenv('ADVISOR_DB_USER'),
+        'password': os.getenv('ADVISOR_DB_PASSWORD'),
+        'database': args.database or os.getenv('ADVISOR_DB_NAME')
+    }
+    if not target['host'] or not target['database']:
+        sys.exit("Name the scratch database with --host and --database (or ADVISOR_DB_HOST and "
+                 "ADVISOR_DB_NAME); the app's DB_* settings are never used")
+    app_target = (os.getenv('DB_HOST'), int(os.getenv('DB_PORT', 3306)), os.getenv('DB_NAME'))
+    if (target['host'], target['port'], target['database']) == app_target:
+        sys.exit(f"{target['database']} on {target['host']} is the app's own database; "
+                 "point the advisor at a seeded copy")
+    return target
+
+
+def get_connection(target):
+    return pymysql.connect(
+        host=target['host'],
+        port=target['port'],
+        user=target['user'],
+        password=target['password'],
+        database=target['database'],
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.DictCursor
+    )
+
+
+def load_workload(paths):
+    if not paths:
+        return HOT_WORKLOAD
+    workload = []
+    seen = set()
+    for path in paths:
+        with open(path) as workload_file:
+            for line in workload_file:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                key = entry.get('fingerprint') or entry['query']
+                if key not in seen:
+                    seen.add(key)
+                    workload.append(entry)
+    return workload
+
+
+def explain(cursor, query, params):
+    cursor.execute('EXPLAIN ' + query, params or None)
+    return [
+        {
+            'table': row.get('table'),
+            'type': row.get('type'),
+            'key': row.get('key'),
+            'rows': int(row.get('rows') or 0),
+            'filtered': float(row.get('filtered') or 100),
+            'extra': row.get('Extra') or ''
+        }
+        for row in cursor.fetchall()
+    ]
+
+
+def plan_cost(plan):
+    """Rows examined across the plan, with a penalty for filesorts and temp tables"""
+    cost = sum(step['rows'] for step in plan)
+    for step in plan:
+        if 'filesort' in step['extra'] or 'temporary' in step['extra']:
+            cost *= 1.5
+    return cost
+
+
+def describe(plan):
+    return '; '.join(
+        f"{step['table']}: type={step['type']} key={step['key'] or '-'} rows={step['rows']}"
+        + (f" [{step['extra']}]" if step['extra'] else '')
+        for step in plan
+    )
+
+
+def existing_indexes(cursor, table, cache):
+    if table not in cache:
+        cursor.execute(f"SHOW INDEX FROM `{table}`")
+        indexes = {}
+        for row in cursor.fetchall():
+            indexes.setdefault(row['Key_name'], []).append((row['Seq_in_index'], row['Column_name']))
+        cache[table] = [[column for _, column in sorted(columns)] for columns in indexes.values()]
+    return cache[table]
+
+
+def table_aliases(query):
+    aliases = {}
+    for table, alias in TABLE_REF.findall(query):
+        if table.lower() in SQL_KEYWORDS:
+            continue
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def clause(query, start, stops):
+    match = re.search(start, query, re.IGNORECASE)
+    if not match:
+        return ''
+    rest = query[match.end():]
+    end = len(rest)
+    for stop in stops:
+        stop_match = re.search(stop, rest, re.IGNORECASE)
+        if stop_match:
+            end = min(end, stop_match.start())
+    return rest[:end]
+
+
+def propose(query, aliases):
+    """Per table: WHERE equality columns, then one range column or the ORDER BY columns"""
+    tables = set(aliases.values())
+    single = next(iter(tables)) if len(tables) == 1 else None
+
+    def owner(alias):
+        if alias:
+            return aliases.get(alias)
+        return single
+
+    equality, ranges, order, joins = {}, {}, {}, {}
+    for left_alias, left_col, right_alias, right_col in COLUMN_JOIN.findall(query):
+        for alias, column in ((left_alias, left_col), (right_alias, right_col)):
+            table = owner(alias)
+            if table and column != 'id':
+                joins.setdefault(table, [])
+                if column not in joins[table]:
+                    joins[table].append(column)
+
+    where_clause = clause(query, r'\bWHERE\b', [r'\bGROUP\s+BY\b', r'\bORDER\s+BY\b', r'\bLIMIT\b', r'\bHAVING\b'])
+    for alias, column, operator in PREDICATE.findall(COLUMN_JOIN.sub('', where_clause)):
+        table = owner(alias)
+        if not table or column.lower() in SQL_KEYWORDS or column == 'id':
+            continue
+        operator = operator.upper()
+        if operator.startswith(('=', '<=>', 'IN', 'IS')):
+            equality.setdefault(table, [])
+            if column not in equality[table]:
+                equality[table].append(column)
+        else:
+            ranges.setdefault(table, column)
+
+    order_clause = clause(query, r'\bORDER\s+BY\b', [r'\bLIMIT\b', r'\bFOR\s+UPDATE\b'])
+    for alias, column in re.findall(r'(?:(\w+)\.)?(\w+)(?:\s+(?:ASC|DESC))?\s*(?:,|$)', order_clause.strip()):
+        table = owner(alias)
+        if table:
+            order.setdefault(table, []).append(column)
+
+    select_list = clause(query, r'^\s*SELECT\b', [r'\bFROM\b'])
+    proposals = {}
+    for table in tables:
+        columns = list(equality.get(table, []))
+        range_column = ranges.get(table)
+        if range_column and range_column in columns:
+            range_column = None
+        if range_column:
+            columns.append(range_column)
+        elif order.get(table) and len(order) == 1:
+            columns.extend(column for column in order[table] if column not in columns)
+        if not columns:
+            # Inner side of a join: an index on the join column turns a scan into a lookup
+            columns = list(joins.get(table, []))
+        if not columns:
+            continue
+
+        # Covering: only when the select list names this table's columns explicitly
+        table_aliases_ = [alias for alias, name in aliases.items() if name == table]
+        if select_list and '*' not in select_list:
+            selected = [
+                column for alias, column in re.findall(r'(?:(\w+)\.)?(\w+)\s*(?:,|$)', select_list)
+                if owner(alias) == table and (not alias or alias in table_aliases_)
+            ]
+            # InnoDB secondary indexes already carry the primary key
+            extra = [column for column in selected if column not in columns and column != 'id']
+            if extra and len(columns) + len(extra) <= 6:
+                columns.extend(extra)
+        proposals[table] = columns
+    return proposals
+
+
+def already_covered(columns, indexes):
+    for index_columns in indexes:
+        if index_columns[:len(columns)] == columns:
+            return True
+    return False
+
+
+def index_name(columns):
+    return ('idx_' + '_'.join(columns))[:64]
+
+
+def next_migration_path(label):
+    numbers = [
+        int(name.split('_', 1)[0]) for name in os.listdir(MIGRATIONS_DIR)
+        if name.endswith('.sql') and name.split('_', 1)[0].isdigit()
+    ]
+    number = max(numbers, default=0) + 1
+    return number, os.path.join(MIGRATIONS_DIR, f"{number:03d}_{label}.sql")
+
+
+def write_migration(accepted):
+    number, path = next_migration_path('index_advisor')
+    lines = [
+        f"-- Migration: {number:03d} - Index Advisor",
+        f"-- Date: {date.today().isoformat()}",
+        "-- Description: Composite indexes proposed by scripts/index_advisor.py from a captured workload",
+        "",
+        f"USE {os.getenv('DB_NAME', 'railway')};",
+        ""
+    ]
+    for i, proposal in enumerate(accepted, 1):
+        lines.append(f"-- {i}. {proposal['table']} ({', '.join(proposal['columns'])})")
+        lines.append(f"--    before: {proposal['before']}")
+        lines.append(f"--    after:  {proposal['after']}")
+        lines.append(f"ALTER TABLE {proposal['table']}")
+        lines.append(f"ADD INDEX {proposal['name']} ({', '.join(proposal['columns'])});")
+        lines.append("")
+    with open(path, 'w') as migration:
+        migration.write('\n'.join(lines))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Propose composite indexes from a captured query workload')
+    parser.add_argument('--workload', nargs='*', help='JSON-lines capture files (DB_QUERY_CAPTURE)')
+    parser.add_argument('--host', help='scratch database host (default ADVISOR_DB_HOST)')
+    parser.add_argument('--port', type=int, help='scratch database port (default ADVISOR_DB_PORT or 3306)')
+    parser.add_argument('--user', help='scratch database user (default ADVISOR_DB_USER)')
+    parser.add_argument('--database', help='scratch database name (default ADVISOR_DB_NAME)')
+    parser.add_argument('--trial', action='store_true',
+                        help='build each proposed index on the scratch database to measure the new plans')
+    parser.add_argument('--no-migration', action='store_true', help='do not write a migration file')
+    args = parser.parse_args()
+
+    target = advisor_target(args)
+    workload = load_workload(args.workload)
+    connection = get_connection(target)
+    cursor = connection.cursor()
+    index_cache = {}
+    candidates = {}
+
+    print("=" * 70)
+    print(f"Index advisor: {len(workload)} statements against {target['database']} on {target['host']}")
+    print("=" * 70)
+
+    for entry in workload:
+        query, params = entry['query'], entry.get('params')
+        try:
+            before = explain(cursor, query, params)
+        except pymysql.Error as e:
+            print(f"\nSkipping (EXPLAIN failed: {e}): {query[:100]}")
+            continue
+        for table, columns in propose(query, table_aliases(query)).items():
+            if already_covered(columns, existing_indexes(cursor, table, index_cache)):
+                continue
+            key = (table, tuple(columns))
+            candidates.setdefault(key, []).append((query, params, before))
+
+    accepted = []
+    for (table, columns), statements in candidates.items():
+        columns = list(columns)
+        name = index_name(columns)
+        print(f"\n{table} ({', '.join(columns)}) - {len(statements)} statement(s)")
+        for query, _, before in statements:
+            print(f"  query : {' '.join(query.split())[:110]}")
+            print(f"  before: {describe(before)}")
+        if not args.trial:
+            continue
+
+        cursor.execute(f"ALTER TABLE `{table}` ADD INDEX `{name}` ({', '.join(f'`{c}`' for c in columns)})")
+        try:
+            improved = False
+            for query, params, before in statements:
+                after = explain(cursor, query, params)
+                print(f"  after : {describe(after)}")
+                if plan_cost(after) < plan_cost(before):
+                    improved = True
+            if improved:
+                accepted.append({
+                    'table': table, 'columns': columns, 'name': name,
+                    'before': describe(statements[0][2]),
+                    'after': describe(explain(cursor, statements[0][0], statements[0][1]))
+                })
+                print("  => improves the plan")
+            else:
+                print("  => no improvement, not proposed")
+        finally:
+            cursor.execute(f"ALTER TABLE `{table}` DROP INDEX `{name}`")
+
+    cursor.close()
+    connection.close()
+
+    if not args.trial:
+        print("\nRe-run with --trial to measure the proposals")
+    elif not accepted:
+        print("\nNo index improved the workload's plans")
+    elif args.no_migration:
+        print(f"\n{len(accepted)} index(es) improved the plans; no migration written")
+    else:
+        print(f"\nWrote {write_migration(accepted)} with {len(accepted)} index(es)")
+
+
+if __name__ == '__main__':
+    main()
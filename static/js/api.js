@@ -318,5 +318,16 @@ const API = {
         create: (data) => apiRequest('/api/field-permissions', 'POST', data),
         update: (id, data) => apiRequest(`/api/field-permissions/${id}`, 'PUT', data),
         delete: (id) => apiRequest(`/api/field-permissions/${id}`, 'DELETE')
+    },
+    
+    // Several GETs in one round trip: API.batch({departments: '/api/departments', ...})
+    // resolves to {departments: {status, body}, ...}
+    batch: async (paths) => {
+        const requests = Object.entries(paths).map(([id, path]) => ({ id, path }));
+        const result = await apiRequest('/api/batch', 'POST', { requests });
+        if (!result || !result.success) {
+            return result;
+        }
+        return Object.fromEntries(result.data.map(({ id, status, body }) => [id, { status, body }]));
     }
 };
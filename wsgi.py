@@ -1,11 +1,16 @@
 #!/usr/bin/env python
 """
 WSGI entry point for gunicorn
-Used by: gunicorn wsgi:app
+Used by: gunicorn -c gunicorn.conf.py wsgi:app
 """
 import os
 import sys
 
+# Gevent mode must patch socket/ssl/threading before anything below (dotenv,
+# the app, pymysql, redis, requests) imports them
+from backend.config.gevent_mode import apply_monkey_patch
+apply_monkey_patch()
+
 # For local development, load .env file
 try:
     from pathlib import Path